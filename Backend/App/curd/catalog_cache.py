@@ -0,0 +1,86 @@
+"""
+In-process cache of the categories and suppliers tables.
+
+Both are small reference tables that the list routes return whole and
+every product write checks ids against. Each worker keeps:
+
+- snapshots of the table keyed by its catalog version, so a list is only
+  re-read after some worker changed the table, and never served under a
+  different version than the ETag announces
+- the set of ids known to exist, updated write-through by this worker's
+  creates and deletes and refilled from the database on a miss
+
+Ids deleted by another worker can look present for up to
+CATALOG_CACHE_TTL_SECONDS. The foreign keys still reject a product that
+points at one (create_db_engine turns them on for SQLite), and the product
+writes then re-check the id here to report it as missing.
+"""
+import os
+from typing import List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from App.database import Base
+from App.models import Category, Supplier
+from App.schemas import CategoryResponse, SupplierResponse
+from App.curd.catalog_version import get_table_version, CATEGORIES, SUPPLIERS
+from App.utils.cache import TTLCache
+
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+# Ids remembered per table for existence checks
+CATALOG_CACHE_MAX_IDS = int(os.getenv("CATALOG_CACHE_MAX_IDS", "10000"))
+
+
+class CatalogTableCache:
+    def __init__(self, table: str, model: Type[Base], schema: Type[BaseModel], order_by):
+        self.table = table
+        self.model = model
+        self.schema = schema
+        self.order_by = order_by
+        self._snapshots = TTLCache(maxsize=4, ttl=CATALOG_CACHE_TTL_SECONDS)
+        self._known_ids = TTLCache(maxsize=CATALOG_CACHE_MAX_IDS, ttl=CATALOG_CACHE_TTL_SECONDS)
+
+    def _snapshot(self, db: Session) -> Tuple[BaseModel, ...]:
+        version = get_table_version(db, self.table)
+        rows = self._snapshots.get(version)
+        if rows is None:
+            rows = tuple(
+                self.schema.model_validate(obj)
+                for obj in db.scalars(select(self.model).order_by(*self.order_by))
+            )
+            # Only keep it if nothing committed between the two version reads,
+            # i.e. the rows really are that version
+            if get_table_version(db, self.table) == version:
+                self._snapshots.set(version, rows)
+            for row in rows[:CATALOG_CACHE_MAX_IDS]:
+                self._known_ids.set(row.id, True)
+        return rows
+
+    def list(self, db: Session, skip: int = 0, limit: int = 100) -> List[BaseModel]:
+        return list(self._snapshot(db)[skip:skip + limit])
+
+    def exists(self, db: Session, row_id: int) -> bool:
+        if self._known_ids.get(row_id):
+            return True
+        found = db.scalar(select(self.model.id).where(self.model.id == row_id)) is not None
+        if found:
+            self._known_ids.set(row_id, True)
+        return found
+
+    # Write-through from the CRUD functions, after their commit
+
+    def added(self, row_id: int) -> None:
+        self._known_ids.set(row_id, True)
+
+    def removed(self, row_id: int) -> None:
+        self._known_ids.delete(row_id)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+        self._known_ids.clear()
+
+
+category_cache = CatalogTableCache(CATEGORIES, Category, CategoryResponse, (Category.name,))
+supplier_cache = CatalogTableCache(SUPPLIERS, Supplier, SupplierResponse, (Supplier.id,))
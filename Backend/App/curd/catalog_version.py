@@ -0,0 +1,64 @@
+"""
+Per-table change counters for the catalogue (categories, suppliers, products).
+
+Every create/update/delete bumps its table's counter inside the same
+transaction, so the version a reader sees always matches the rows it reads
+next. The GET routes turn the versions into ETags (App.utils.http_cache).
+"""
+import os
+import threading
+from typing import Dict, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from App.models.catalog_version import CatalogVersion, CATALOG_VERSION_SHARDS
+from App.curd.counters import increment_counters
+
+CATEGORIES = "categories"
+SUPPLIERS = "suppliers"
+PRODUCTS = "products"
+
+
+def _shard() -> int:
+    return hash((os.getpid(), threading.get_ident())) % CATALOG_VERSION_SHARDS
+
+
+def bump_catalog_version(db: Session, *tables: str) -> None:
+    """Mark `tables` as changed. Does not commit - call inside the write's transaction."""
+    shard = _shard()
+    increment_counters(db, CatalogVersion, ("table_name", "shard"), [
+        {"table_name": table, "shard": shard, "version": 1} for table in tables
+    ])
+
+
+def _versions_query(tables: Iterable[str]):
+    return (
+        select(CatalogVersion.table_name, func.sum(CatalogVersion.version))
+        .where(CatalogVersion.table_name.in_(tables))
+        .group_by(CatalogVersion.table_name)
+    )
+
+
+def _format(tables: Iterable[str], versions: Dict[str, int]) -> str:
+    return "-".join(f"{table[0]}{int(versions.get(table) or 0)}" for table in tables)
+
+
+def get_catalog_version(db: Session, tables: Iterable[str]) -> str:
+    """Combined version of `tables`, e.g. 'p120-s4-c7'; changes whenever any of them does"""
+    tables = tuple(tables)
+    return _format(tables, dict(db.execute(_versions_query(tables)).all()))
+
+
+def get_table_version(db: Session, table: str) -> int:
+    """Current version of one table as a number"""
+    return int(db.scalar(
+        select(func.coalesce(func.sum(CatalogVersion.version), 0)).where(CatalogVersion.table_name == table)
+    ))
+
+
+async def get_catalog_version_async(db: AsyncSession, tables: Iterable[str]) -> str:
+    tables = tuple(tables)
+    result = await db.execute(_versions_query(tables))
+    return _format(tables, dict(result.all()))
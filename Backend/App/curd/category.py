@@ -1,15 +1,22 @@
 from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from App.models import Category
-from App.schemas import CategoryCreate
+from App.models import Category, Product
+from App.curd.product_search import refresh_search_text
+from App.curd.catalog_version import bump_catalog_version, CATEGORIES
+from App.curd.catalog_cache import category_cache
+from App.schemas import CategoryCreate, CategoryResponse
 
 def create_category(db: Session, cat_in: CategoryCreate) -> Category:
     cat = Category(name=cat_in.name, description=cat_in.description)
     try:
         db.add(cat)
+        bump_catalog_version(db, CATEGORIES)
         db.commit()
         db.refresh(cat)
+        category_cache.added(cat.id)
         return cat
     except IntegrityError as e:
         db.rollback()
@@ -18,8 +25,9 @@ def create_category(db: Session, cat_in: CategoryCreate) -> Category:
 def get_category(db: Session, category_id: int) -> Optional[Category]:
     return db.query(Category).filter(Category.id == category_id).first()
 
-def get_categories(db: Session, skip: int = 0, limit: int = 100) -> List[Category]:
-    return db.query(Category).order_by(Category.name).offset(skip).limit(limit).all()
+def get_categories(db: Session, skip: int = 0, limit: int = 100) -> List[CategoryResponse]:
+    """Served from the in-process cache, reloaded only after the table changed"""
+    return category_cache.list(db, skip=skip, limit=limit)
 
 def update_category(db: Session, category_id: int, updates: dict) -> Category:
     cat = get_category(db, category_id)
@@ -28,6 +36,11 @@ def update_category(db: Session, category_id: int, updates: dict) -> Category:
     for k, v in updates.items():
         setattr(cat, k, v)
     db.add(cat)
+    if "name" in updates:
+        # Category names are part of the product search index
+        db.flush()
+        refresh_search_text(db, Product.category_id == category_id)
+    bump_catalog_version(db, CATEGORIES)
     db.commit()
     db.refresh(cat)
     return cat
@@ -37,5 +50,21 @@ def delete_category(db: Session, category_id: int) -> None:
     if not cat:
         raise ValueError("Category not found")
     # Optionally check related products before delete
+    product_ids = list(db.scalars(select(Product.id).where(Product.category_id == category_id)))
     db.delete(cat)
-    db.commit()
\ No newline at end of file
+    if product_ids:
+        db.flush()
+        refresh_search_text(db, Product.id.in_(product_ids))
+    bump_catalog_version(db, CATEGORIES)
+    db.commit()
+    category_cache.removed(category_id)
+
+
+# Async reads - used by the categories router when it runs on get_async_db
+async def get_category_async(db: AsyncSession, category_id: int) -> Optional[Category]:
+    result = await db.execute(select(Category).where(Category.id == category_id))
+    return result.scalars().first()
+
+async def get_categories_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Category]:
+    result = await db.execute(select(Category).order_by(Category.name).offset(skip).limit(limit))
+    return result.scalars().all()
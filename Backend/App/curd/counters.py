@@ -0,0 +1,43 @@
+"""
+Counter upserts shared by the daily sales rollups and the catalogue versions.
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def increment_counters(db: Session, model, key_columns: Tuple[str, ...], rows: List[Dict]) -> None:
+    """
+    Add each row's counters to the matching row of `model`, creating it on
+    first use. One upsert statement where the dialect has one, so concurrent
+    writers can't race each other into a duplicate key.
+    """
+    if not rows:
+        return
+    rows = sorted(rows, key=lambda r: tuple(r[k] for k in key_columns))  # stable lock order
+    counters = [c for c in rows[0] if c not in key_columns]
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = insert_fn(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={c: getattr(model, c) + stmt.excluded[c] for c in counters},
+        )
+        db.execute(stmt)
+    elif dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({c: getattr(model, c) + stmt.inserted[c] for c in counters})
+        db.execute(stmt)
+    else:
+        for row in rows:
+            matched = db.execute(
+                update(model)
+                .where(*(getattr(model, k) == row[k] for k in key_columns))
+                .values({c: getattr(model, c) + row[c] for c in counters})
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not matched:
+                db.execute(insert(model).values(row))
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from App.models import Product, Category, Supplier, Sale, InventoryTransaction
+
+
+def get_dashboard_summary(db: Session) -> Dict:
+    """
+    Compute the dashboard headline numbers with SQL aggregates.
+    Everything is folded into one SELECT of scalar subqueries, so the cost is
+    one round trip no matter how many rows the tables hold.
+    """
+    row = db.execute(
+        select(
+            select(func.count(Product.id)).scalar_subquery().label("total_products"),
+            select(func.count(Product.id)).where(Product.is_low_stock == True).scalar_subquery().label("low_stock_count"),
+            select(func.coalesce(func.sum(Product.quantity * Product.price), 0.0))
+            .scalar_subquery().label("total_inventory_value"),
+            select(func.count(Category.id)).scalar_subquery().label("total_categories"),
+            select(func.count(Supplier.id)).scalar_subquery().label("total_suppliers"),
+            select(func.count(Sale.id)).scalar_subquery().label("total_sales"),
+            select(func.coalesce(func.sum(Sale.total_amount), 0.0)).scalar_subquery().label("total_revenue"),
+            select(func.count(InventoryTransaction.id)).scalar_subquery().label("total_transactions"),
+        )
+    ).one()
+
+    return {
+        "total_products": row.total_products,
+        "low_stock_count": row.low_stock_count,
+        "total_categories": row.total_categories,
+        "total_suppliers": row.total_suppliers,
+        "total_sales": row.total_sales,
+        "total_revenue": float(row.total_revenue),
+        "total_inventory_value": float(row.total_inventory_value),
+        "total_transactions": row.total_transactions,
+        "generated_at": datetime.utcnow(),
+    }
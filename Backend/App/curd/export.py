@@ -0,0 +1,102 @@
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from App.models import Product, Sale, SaleItem, InventoryTransaction
+
+
+# Rows fetched per round trip; the driver streams them with a server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+SALE_EXPORT_FIELDS = (
+    "id", "invoice_number", "created_at", "customer_name", "customer_email",
+    "customer_phone", "payment_method", "total_amount", "user_id",
+)
+SALE_ITEM_EXPORT_FIELDS = (
+    "id", "sale_id", "invoice_number", "sale_created_at", "product_id",
+    "product_sku", "product_name", "quantity", "unit_price", "total_price",
+)
+INVENTORY_EXPORT_FIELDS = (
+    "id", "created_at", "product_id", "product_sku", "transaction_type", "quantity",
+    "unit_price", "total_price", "reference_number", "notes", "created_by",
+)
+
+
+def _plain(value):
+    """Export values as CSV/JSON friendly primitives"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _in_range(stmt, column, start: Optional[datetime], end: Optional[datetime]):
+    """Half-open [start, end) filter on a timestamp column"""
+    if start is not None:
+        stmt = stmt.where(column >= start)
+    if end is not None:
+        stmt = stmt.where(column < end)
+    return stmt
+
+
+def _stream(db: Session, stmt, batch_size: int) -> Iterator[Dict]:
+    """Yield rows as dicts, holding at most one batch in memory"""
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for row in result.mappings():
+            yield {key: _plain(value) for key, value in row.items()}
+    finally:
+        result.close()
+
+
+def iter_sales_export(
+    db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """Sales created in [start, end), oldest first"""
+    stmt = select(*(getattr(Sale, field) for field in SALE_EXPORT_FIELDS))
+    stmt = _in_range(stmt, Sale.created_at, start, end).order_by(Sale.created_at, Sale.id)
+    return _stream(db, stmt, batch_size)
+
+
+def iter_sale_items_export(
+    db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """Line items of the sales created in [start, end), with invoice and product columns joined in"""
+    stmt = (
+        select(
+            SaleItem.id, SaleItem.sale_id, Sale.invoice_number,
+            Sale.created_at.label("sale_created_at"), SaleItem.product_id,
+            Product.sku.label("product_sku"), Product.name.label("product_name"),
+            SaleItem.quantity, SaleItem.unit_price, SaleItem.total_price,
+        )
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .outerjoin(Product, SaleItem.product_id == Product.id)
+    )
+    stmt = _in_range(stmt, Sale.created_at, start, end).order_by(Sale.created_at, Sale.id, SaleItem.id)
+    return _stream(db, stmt, batch_size)
+
+
+def iter_inventory_transactions_export(
+    db: Session, start: Optional[datetime] = None, end: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[Dict]:
+    """Inventory ledger entries created in [start, end), oldest first"""
+    stmt = (
+        select(
+            InventoryTransaction.id, InventoryTransaction.created_at, InventoryTransaction.product_id,
+            Product.sku.label("product_sku"), InventoryTransaction.transaction_type,
+            InventoryTransaction.quantity, InventoryTransaction.unit_price,
+            InventoryTransaction.total_price, InventoryTransaction.reference_number,
+            InventoryTransaction.notes, InventoryTransaction.created_by,
+        )
+        .outerjoin(Product, InventoryTransaction.product_id == Product.id)
+    )
+    stmt = _in_range(stmt, InventoryTransaction.created_at, start, end).order_by(
+        InventoryTransaction.created_at, InventoryTransaction.id
+    )
+    return _stream(db, stmt, batch_size)
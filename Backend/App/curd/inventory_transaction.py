@@ -55,47 +55,65 @@
 # def get_inventory_transactions(db: Session, skip: int = 0, limit: int = 100):
 #         return db.query(InventoryTransaction).offset(skip).limit(limit).all()
 
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict
 from App.models import InventoryTransaction, Product
 from App.schemas import InventoryTransactionCreate, InventoryTransactionResponse
+from App.utils.pagination import keyset_page
+from App.curd.product import adjust_stock
+from App.curd.catalog_version import bump_catalog_version, PRODUCTS
 from datetime import datetime
 
-def create_inventory_transaction(db: Session, tx_in: InventoryTransactionCreate) -> InventoryTransaction:
-    product = db.query(Product).filter(Product.id == tx_in.product_id).first()
-    if not product:
-        raise ValueError(f"product_id={tx_in.product_id} does not exist")
+def _apply_quantity(db: Session, tx_in: InventoryTransactionCreate) -> None:
+    """
+    Apply a movement to the product's stock with one atomic UPDATE in the
+    current transaction; raises ValueError if a stock-out would go short.
+    """
+    if tx_in.transaction_type == "stock_out":
+        if not adjust_stock(db, tx_in.product_id, -tx_in.quantity):
+            raise ValueError("Not enough stock for this transaction")
+    else:
+        # stock_in adds; adjustment and return adjust by signed quantity
+        adjust_stock(db, tx_in.product_id, tx_in.quantity, allow_negative=True)
+
 
+def _build_transaction(product: Product, tx_in: InventoryTransactionCreate) -> InventoryTransaction:
     unit_price = tx_in.unit_price if tx_in.unit_price is not None else getattr(product, "price", None)
     if unit_price is None:
         raise ValueError("unit_price must be provided or product must have a price")
 
     total_price = tx_in.total_price if tx_in.total_price is not None else unit_price * tx_in.quantity
 
-    if tx_in.transaction_type == 'stock_in':
-        product.quantity = (product.quantity or 0) + tx_in.quantity
-    elif tx_in.transaction_type == "stock_out":
-        if (product.quantity or 0) < tx_in.quantity:
-            raise ValueError("Not enough stock for this transaction")
-        product.quantity = product.quantity - tx_in.quantity
-    else:
-        # adjustment and return: adjust by signed quantity
-        product.quantity = (product.quantity or 0) + tx_in.quantity
+    return InventoryTransaction(
+        product_id=tx_in.product_id,
+        transaction_type=tx_in.transaction_type,
+        quantity=tx_in.quantity,
+        unit_price=unit_price,
+        total_price=total_price,
+        reference_number=tx_in.reference_number,
+        notes=tx_in.notes,
+        created_at=datetime.utcnow()
+    )
+
+
+def create_inventory_transaction(db: Session, tx_in: InventoryTransactionCreate) -> InventoryTransaction:
+    product = db.query(Product).filter(Product.id == tx_in.product_id).first()
+    if not product:
+        raise ValueError(f"product_id={tx_in.product_id} does not exist")
+
+    db_tx = _build_transaction(product, tx_in)
+    try:
+        _apply_quantity(db, tx_in)
+    except ValueError:
+        db.rollback()
+        raise
 
     try:
-        db_tx = InventoryTransaction(
-            product_id=tx_in.product_id,
-            transaction_type=tx_in.transaction_type,
-            quantity=tx_in.quantity,
-            unit_price=unit_price,
-            total_price=total_price,
-            reference_number=tx_in.reference_number,
-            notes=tx_in.notes,
-            created_at=datetime.utcnow()
-        )
         db.add(db_tx)
-        db.add(product)
+        bump_catalog_version(db, PRODUCTS)
         db.commit()
         db.refresh(db_tx)
         return db_tx
@@ -104,6 +122,64 @@ def create_inventory_transaction(db: Session, tx_in: InventoryTransactionCreate)
         raise ValueError("Database error while creating transaction: " + str(e))
 
 
+def create_inventory_transactions_batch(
+    db: Session, items: List[InventoryTransactionCreate], best_effort: bool = False
+) -> Tuple[List[InventoryTransaction], List[Dict]]:
+    """
+    Post many movements in one transaction.
+    - All affected products are loaded (and row-locked where supported) by one query
+    - Quantity deltas are applied in item order as atomic conditional UPDATEs,
+      so later items see earlier ones and stock-outs can't oversell
+    - Ledger rows are inserted and committed together
+    With best_effort=False any bad item rejects the batch (ValueError); with
+    best_effort=True bad items are skipped and reported.
+    Returns (created_transactions, errors) where errors are {"index", "product_id", "error"} dicts.
+    """
+    product_ids = sorted({item.product_id for item in items})
+    products = {
+        p.id: p
+        for p in db.query(Product)
+        .filter(Product.id.in_(product_ids))
+        .order_by(Product.id)  # consistent lock order across concurrent batches
+        .with_for_update()
+        .all()
+    }
+
+    created = []
+    errors = []
+    for index, tx_in in enumerate(items):
+        product = products.get(tx_in.product_id)
+        try:
+            if product is None:
+                raise ValueError(f"product_id={tx_in.product_id} does not exist")
+            db_tx = _build_transaction(product, tx_in)
+            _apply_quantity(db, tx_in)
+        except ValueError as e:
+            errors.append({"index": index, "product_id": tx_in.product_id, "error": str(e)})
+            continue
+        created.append(db_tx)
+
+    if errors and not best_effort:
+        db.rollback()
+        raise ValueError("; ".join(f"item {e['index']}: {e['error']}" for e in errors))
+
+    try:
+        db.add_all(created)
+        db.flush()
+        created_ids = [db_tx.id for db_tx in created]
+        if created:
+            # Once, after every stock UPDATE - see adjust_stock
+            bump_catalog_version(db, PRODUCTS)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise ValueError("Database error while creating transactions: " + str(e))
+    # Reload the committed rows with one IN-query rather than a refresh per row
+    if created_ids:
+        db.query(InventoryTransaction).filter(InventoryTransaction.id.in_(created_ids)).all()
+    return created, errors
+
+
 def get_inventory_transaction(db: Session, tx_id: int) -> Optional[InventoryTransaction]:
     return db.query(InventoryTransaction).filter(InventoryTransaction.id == tx_id).first()
 
@@ -116,12 +192,38 @@ def get_inventory_transactions(db: Session, skip: int = 0, limit: int = 100) ->
     return (
         db.query(InventoryTransaction)
         .filter(InventoryTransaction.product_id != None)
+        .order_by(InventoryTransaction.created_at.desc(), InventoryTransaction.id.desc())
         .offset(skip)
         .limit(limit)
         .all()
     )
 
 
+def get_inventory_transactions_page(
+    db: Session, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[InventoryTransaction], Optional[str]]:
+    """Newest-first keyset page of transactions; returns (transactions, next_cursor)"""
+    query = db.query(InventoryTransaction).filter(InventoryTransaction.product_id != None)
+    return keyset_page(query, InventoryTransaction, cursor, limit)
+
+
+# Async reads - used by the inventory router when it runs on get_async_db
+async def get_inventory_transaction_async(db: AsyncSession, tx_id: int) -> Optional[InventoryTransaction]:
+    result = await db.execute(select(InventoryTransaction).where(InventoryTransaction.id == tx_id))
+    return result.scalars().first()
+
+
+async def get_inventory_transactions_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[InventoryTransaction]:
+    result = await db.execute(
+        select(InventoryTransaction)
+        .where(InventoryTransaction.product_id != None)
+        .order_by(InventoryTransaction.created_at.desc(), InventoryTransaction.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 # Helper: find invalid rows (product_id IS NULL)
 def get_invalid_inventory_transactions(db: Session, skip: int = 0, limit: int = 100) -> List[InventoryTransaction]:
     return (
@@ -1,7 +1,56 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, func, case, or_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from App.models import Product, Supplier, Category
+from App.models.product import DEFAULT_REORDER_LEVEL
 from App.schemas.product import ProductCreate
+from App.utils.pagination import encode_cursor, decode_cursor
+from App.curd.product_search import refresh_search_text
+from App.curd.catalog_version import bump_catalog_version, PRODUCTS
+from App.curd.catalog_cache import supplier_cache, category_cache
+
+# Changing any of these means the product's search_text has to be rebuilt
+SEARCHABLE_FIELDS = {"name", "sku", "supplier_id", "category_id"}
+
+# The low-stock changes feed holds back changes younger than this.
+# low_stock_changed_at is stamped when the UPDATE runs, not when its
+# transaction commits, so a poller reading right up to "now" could move its
+# cursor past a flip that becomes visible a moment later and never see it.
+# Must exceed the longest stock-writing transaction (and any clock skew
+# between app servers).
+LOW_STOCK_FEED_SETTLE_SECONDS = float(os.getenv("LOW_STOCK_FEED_SETTLE_SECONDS", "10"))
+
+
+def _product_query(db: Session):
+    """
+    Base query for product reads.
+    Supplier and category are joined into the same SELECT, so a page of
+    products costs one round trip regardless of page size.
+    """
+    return db.query(Product).options(*_product_load_options())
+
+
+def _product_load_options():
+    return (joinedload(Product.supplier), joinedload(Product.category))
+
+
+def _missing_reference(db: Session, supplier_id: Optional[int], category_id: Optional[int]) -> Optional[str]:
+    """
+    After an IntegrityError: forget supplier/category ids the cache vouched
+    for and look them up again, so a row deleted by another worker is
+    reported as missing instead of as a generic database error.
+    """
+    for cache, label, row_id in ((supplier_cache, "Supplier", supplier_id), (category_cache, "Category", category_id)):
+        if row_id:
+            cache.removed(row_id)
+            if not cache.exists(db, row_id):
+                return f"{label} with id={row_id} does not exist"
+    return None
 
 
 def create_product(db: Session, product_in: ProductCreate) -> Product:
@@ -13,14 +62,12 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
     """
     # Validate supplier exists
     if product_in.supplier_id:
-        supplier = db.query(Supplier).filter(Supplier.id == product_in.supplier_id).first()
-        if not supplier:
+        if not supplier_cache.exists(db, product_in.supplier_id):
             raise ValueError(f"Supplier with id={product_in.supplier_id} does not exist")
     
     # Validate category exists (if provided)
     if product_in.category_id:
-        category = db.query(Category).filter(Category.id == product_in.category_id).first()
-        if not category:
+        if not category_cache.exists(db, product_in.category_id):
             raise ValueError(f"Category with id={product_in.category_id} does not exist")
     
     # Check duplicate SKU
@@ -41,47 +88,151 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
 
     try:
         db.add(db_product)
+        db.flush()
+        refresh_search_text(db, Product.id == db_product.id)
+        bump_catalog_version(db, PRODUCTS)
         db.commit()
+        # refresh() honours the joined loaders on Product, so supplier and
+        # category come back in the same SELECT
         db.refresh(db_product)
-        
-        # Load relationships
-        if db_product.supplier_id:
-            db_product.supplier = db.query(Supplier).filter(Supplier.id == db_product.supplier_id).first()
-        if db_product.category_id:
-            db_product.category = db.query(Category).filter(Category.id == db_product.category_id).first()
-        
         return db_product
     except IntegrityError as e:
         db.rollback()
-        raise ValueError("Database error while creating product") from e
+        missing = _missing_reference(db, product_in.supplier_id, product_in.category_id)
+        raise ValueError(missing or "Database error while creating product") from e
+
+
+def adjust_stock(db: Session, product_id: int, delta: int, allow_negative: bool = False) -> bool:
+    """
+    Atomically add delta (may be negative) to a product's quantity inside the
+    caller's transaction, without reading it first.
+    Decrements are conditional (quantity = quantity - n WHERE quantity >= n),
+    so concurrent sales can't oversell even where row locks aren't available.
+    Returns False if the product doesn't exist or doesn't have enough stock.
+    Does not bump the products catalogue version: callers do that once, after
+    their last stock UPDATE, so a multi-product transaction locks every
+    product row before the version shard (bumping per row would interleave
+    the two and can deadlock against another writer on the same shard).
+    """
+    new_quantity = func.coalesce(Product.quantity, 0) + delta
+    now_low = new_quantity <= func.coalesce(Product.reorder_level, DEFAULT_REORDER_LEVEL)
+    stmt = (
+        update(Product)
+        .where(Product.id == product_id)
+        # The low-stock flag rides along in the same statement. MySQL evaluates
+        # SET left to right against already-updated columns, so the columns
+        # that read the old values are assigned first.
+        .ordered_values(
+            (Product.low_stock_changed_at,
+             case((Product.is_low_stock != now_low, datetime.utcnow()), else_=Product.low_stock_changed_at)),
+            (Product.is_low_stock, now_low),
+            (Product.quantity, new_quantity),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if delta < 0 and not allow_negative:
+        stmt = stmt.where(Product.quantity >= -delta)
+    return db.execute(stmt).rowcount == 1
+
+
+def _sync_low_stock(product: Product) -> None:
+    """Recompute the low-stock flag of a loaded product after quantity or reorder_level changed"""
+    reorder_level = DEFAULT_REORDER_LEVEL if product.reorder_level is None else product.reorder_level
+    now_low = (product.quantity or 0) <= reorder_level
+    if product.is_low_stock != now_low:
+        product.is_low_stock = now_low
+        product.low_stock_changed_at = datetime.utcnow()
 
 
 def get_product(db: Session, product_id: int) -> Product | None:
     """Get a product by ID with relationships loaded."""
-    product = db.query(Product).filter(Product.id == product_id).first()
-    
-    if product:
-        # Load relationships
-        if product.supplier_id:
-            product.supplier = db.query(Supplier).filter(Supplier.id == product.supplier_id).first()
-        if product.category_id:
-            product.category = db.query(Category).filter(Category.id == product.category_id).first()
-    
-    return product
+    return _product_query(db).filter(Product.id == product_id).first()
 
 
 def get_products(db: Session, skip: int = 0, limit: int = 100):
     """Get all products with relationships loaded."""
-    products = db.query(Product).offset(skip).limit(limit).all()
-    
-    # Load relationships for each product
-    for product in products:
-        if product.supplier_id:
-            product.supplier = db.query(Supplier).filter(Supplier.id == product.supplier_id).first()
-        if product.category_id:
-            product.category = db.query(Category).filter(Category.id == product.category_id).first()
-    
-    return products
+    return _product_query(db).order_by(Product.id).offset(skip).limit(limit).all()
+
+
+def _product_rows_query():
+    """Core SELECT of ProductResponse's columns with supplier and category joined in"""
+    return (
+        select(
+            Product.id, Product.name, Product.sku, Product.quantity, Product.price, Product.reorder_level,
+            Product.supplier_id, Product.category_id, Product.is_low_stock, Product.created_at, Product.updated_at,
+            Supplier.id.label("joined_supplier_id"), Supplier.name.label("supplier_name"),
+            Category.id.label("joined_category_id"), Category.name.label("category_name"),
+        )
+        .outerjoin(Supplier, Product.supplier_id == Supplier.id)
+        .outerjoin(Category, Product.category_id == Category.id)
+    )
+
+
+def _product_row_dict(row) -> Dict:
+    product = dict(row._mapping)
+    supplier_id, supplier_name = product.pop("joined_supplier_id"), product.pop("supplier_name")
+    category_id, category_name = product.pop("joined_category_id"), product.pop("category_name")
+    product["supplier"] = {"id": supplier_id, "name": supplier_name} if supplier_id is not None else None
+    product["category"] = {"id": category_id, "name": category_name} if category_id is not None else None
+    return product
+
+
+def get_product_rows(db: Session, skip: int = 0, limit: int = 100, low_stock_only: bool = False) -> List[Dict]:
+    """
+    get_products (or get_low_stock_products) as plain dicts shaped like
+    ProductResponse. Skips building ORM objects, which costs more than the
+    query itself for a full page - used by the list routes.
+    """
+    stmt = _product_rows_query()
+    if low_stock_only:
+        stmt = stmt.where(Product.is_low_stock == True)
+    rows = db.execute(stmt.order_by(Product.id).offset(skip).limit(limit))
+    return [_product_row_dict(row) for row in rows]
+
+
+def get_low_stock_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
+    """Products at or below their reorder level, by id (an index range, not a table scan)"""
+    return (
+        _product_query(db)
+        .filter(Product.is_low_stock == True)
+        .order_by(Product.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_low_stock_changes(
+    db: Session, since: Optional[datetime] = None, cursor: Optional[str] = None, limit: int = 100
+) -> Tuple[List[Product], Optional[str]]:
+    """
+    Products whose low-stock flag flipped (or that were created) at or after
+    `since`, oldest change first. Pass the returned cursor back to poll for
+    newer changes; it is returned even when the page is empty. Only the
+    latest change per product is kept, so a product that flips again moves
+    to the end of the feed. Changes appear LOW_STOCK_FEED_SETTLE_SECONDS
+    after they are made, once every transaction that could still commit an
+    earlier timestamp has done so - the cursor never passes an unseen change.
+    """
+    settled = datetime.utcnow() - timedelta(seconds=LOW_STOCK_FEED_SETTLE_SECONDS)
+    query = db.query(Product).filter(Product.low_stock_changed_at <= settled)
+    if cursor:
+        changed_at, row_id = decode_cursor(cursor)
+        # The >= bound is implied by the OR, but it is what lets the planner
+        # walk ix_products_low_stock_changed_at_id instead of OR-ing two ranges
+        query = query.filter(
+            Product.low_stock_changed_at >= changed_at,
+            or_(Product.low_stock_changed_at > changed_at, Product.id > row_id),
+        )
+    elif since is not None:
+        query = query.filter(Product.low_stock_changed_at >= since)
+    else:
+        query = query.filter(Product.low_stock_changed_at != None)
+
+    rows = query.order_by(Product.low_stock_changed_at, Product.id).limit(limit).all()
+    # Always hand back a cursor, so pollers can resume after the last change seen
+    next_cursor = encode_cursor(rows[-1].low_stock_changed_at, rows[-1].id) if rows else cursor
+    return rows, next_cursor
 
 
 def update_product(db: Session, product_id: int, updates: dict):
@@ -104,35 +255,32 @@ def update_product(db: Session, product_id: int, updates: dict):
 
     # Validate supplier exists if being changed
     if "supplier_id" in updates and updates["supplier_id"] is not None:
-        supplier = db.query(Supplier).filter(Supplier.id == updates["supplier_id"]).first()
-        if not supplier:
+        if not supplier_cache.exists(db, updates["supplier_id"]):
             raise ValueError(f"Supplier with id={updates['supplier_id']} does not exist")
     
     # Validate category exists if being changed
     if "category_id" in updates and updates["category_id"] is not None:
-        category = db.query(Category).filter(Category.id == updates["category_id"]).first()
-        if not category:
+        if not category_cache.exists(db, updates["category_id"]):
             raise ValueError(f"Category with id={updates['category_id']} does not exist")
 
     # Apply updates
     for field, value in updates.items():
         if hasattr(product, field):
             setattr(product, field, value)
+    _sync_low_stock(product)
 
     try:
+        if SEARCHABLE_FIELDS & updates.keys():
+            db.flush()
+            refresh_search_text(db, Product.id == product_id)
+        bump_catalog_version(db, PRODUCTS)
         db.commit()
         db.refresh(product)
-        
-        # Load relationships
-        if product.supplier_id:
-            product.supplier = db.query(Supplier).filter(Supplier.id == product.supplier_id).first()
-        if product.category_id:
-            product.category = db.query(Category).filter(Category.id == product.category_id).first()
-        
         return product
     except IntegrityError as e:
         db.rollback()
-        raise ValueError("Database error while updating product") from e
+        missing = _missing_reference(db, updates.get("supplier_id"), updates.get("category_id"))
+        raise ValueError(missing or "Database error while updating product") from e
 
 
 def delete_product(db: Session, product_id: int):
@@ -161,8 +309,93 @@ def delete_product(db: Session, product_id: int):
     
     try:
         db.delete(product)
+        bump_catalog_version(db, PRODUCTS)
         db.commit()
         return True
     except IntegrityError as e:
         db.rollback()
-        raise ValueError("Cannot delete product due to foreign key constraints") from e
\ No newline at end of file
+        raise ValueError("Cannot delete product due to foreign key constraints") from e
+
+
+def bulk_create_products(db: Session, rows: List[Tuple[int, Dict]]) -> Tuple[int, List[Dict]]:
+    """
+    Import one chunk of products (used by POST /products/bulk).
+    - rows are (row_number, raw_fields) pairs
+    - Supplier, category and SKU checks are one IN-query each for the whole chunk
+    - Valid rows are inserted with a single executemany and committed together
+    Returns (created_count, errors) where errors are {"row", "sku", "error"} dicts.
+    """
+    errors = []
+    parsed = []
+    for row_no, raw in rows:
+        try:
+            parsed.append((row_no, ProductCreate(**raw)))
+        except ValidationError as e:
+            err = e.errors()[0]
+            loc = ".".join(str(part) for part in err["loc"])
+            errors.append({"row": row_no, "sku": raw.get("sku"), "error": f"{loc}: {err['msg']}"})
+
+    if not parsed:
+        return 0, errors
+
+    supplier_ids = {p.supplier_id for _, p in parsed if p.supplier_id}
+    category_ids = {p.category_id for _, p in parsed if p.category_id}
+    skus = {p.sku for _, p in parsed}
+    known_suppliers = set(db.scalars(select(Supplier.id).where(Supplier.id.in_(supplier_ids)))) if supplier_ids else set()
+    known_categories = set(db.scalars(select(Category.id).where(Category.id.in_(category_ids)))) if category_ids else set()
+    taken_skus = set(db.scalars(select(Product.sku).where(Product.sku.in_(skus))))
+
+    to_insert = []
+    for row_no, p in parsed:
+        if p.supplier_id and p.supplier_id not in known_suppliers:
+            error = f"Supplier with id={p.supplier_id} does not exist"
+        elif p.category_id and p.category_id not in known_categories:
+            error = f"Category with id={p.category_id} does not exist"
+        elif p.sku in taken_skus:
+            error = f"Product with SKU '{p.sku}' already exists"
+        else:
+            taken_skus.add(p.sku)
+            to_insert.append((row_no, p.model_dump()))
+            continue
+        errors.append({"row": row_no, "sku": p.sku, "error": error})
+
+    if not to_insert:
+        return 0, errors
+
+    try:
+        db.execute(insert(Product), [values for _, values in to_insert])
+        refresh_search_text(db, Product.sku.in_([values["sku"] for _, values in to_insert]))
+        bump_catalog_version(db, PRODUCTS)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        errors.extend(
+            {"row": row_no, "sku": values["sku"], "error": "Database error while creating product"}
+            for row_no, values in to_insert
+        )
+        return 0, errors
+    return len(to_insert), errors
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ASYNC READS - used by the products router when it runs on get_async_db
+# ═══════════════════════════════════════════════════════════════════
+
+async def get_product_async(db: AsyncSession, product_id: int) -> Product | None:
+    result = await db.execute(
+        select(Product).options(*_product_load_options()).where(Product.id == product_id)
+    )
+    return result.unique().scalars().first()
+
+
+async def get_products_async(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(
+        select(Product).options(*_product_load_options())
+        .order_by(Product.id).offset(skip).limit(limit)
+    )
+    return result.unique().scalars().all()
+
+
+async def get_product_rows_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Dict]:
+    result = await db.execute(_product_rows_query().order_by(Product.id).offset(skip).limit(limit))
+    return [_product_row_dict(row) for row in result]
@@ -0,0 +1,271 @@
+"""
+Server-side product search over name, SKU, supplier name and category name.
+
+Every product carries a denormalised ``search_text`` column that the CRUD
+functions refresh with one set-based UPDATE whenever one of those four values
+changes. Each backend indexes that column its own way:
+
+- SQLite: an FTS5 table kept in sync by triggers (prefix queries), plus a
+  vocabulary lookup that adds close spellings for words with typos
+- PostgreSQL: a pg_trgm GIN index (substring and word-similarity matching)
+- MySQL: a FULLTEXT index (boolean-mode prefix matching)
+
+The index returns up to SEARCH_CANDIDATES ids; those are ranked in Python
+(exact > prefix > substring > fuzzy, name/SKU above supplier/category) and
+only the final page is loaded as ORM objects. When a query matches more
+rows than that, the candidates have to be the best ones, not just the first
+by id: PostgreSQL and MySQL order them by their own relevance score, and
+SQLite fetches them in tiers that follow the Python ranking (see
+_sqlite_candidates) - ordering every hit of a common word by FTS5's rank
+would cost 100+ ms at a million products.
+"""
+import os
+from bisect import bisect_left
+from typing import List, Set, Tuple
+
+from sqlalchemy import and_, func, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from App.models import Product, Supplier, Category
+from App.utils.cache import TTLCache
+from App.utils.search import (
+    normalize, tokenize, max_typos, within_edit_distance, QueryScorer
+)
+
+# Rows fetched from the index before ranking
+SEARCH_CANDIDATES = 200
+# Spelling corrections tried per misspelled query word (SQLite)
+MAX_CORRECTIONS = 8
+# Query words beyond this are ignored
+MAX_QUERY_TERMS = 8
+# Products scoring below this (0..1) are dropped from the results
+MIN_SCORE = 0.2
+# Supplier and category matches count for less than name/SKU matches
+SECONDARY_WEIGHT = 0.6
+# How long SQLite spelling-correction vocabularies are reused; words added
+# since are still found by exact/prefix search, just not as corrections
+VOCABULARY_TTL_SECONDS = float(os.getenv("SEARCH_VOCABULARY_TTL_SECONDS", "300"))
+_vocabulary_cache = TTLCache(maxsize=64, ttl=VOCABULARY_TTL_SECONDS)
+
+
+def _search_text_expr():
+    supplier_name = select(Supplier.name).where(Supplier.id == Product.supplier_id).scalar_subquery()
+    category_name = select(Category.name).where(Category.id == Product.category_id).scalar_subquery()
+    return (
+        func.coalesce(Product.name, "") + " " + func.coalesce(Product.sku, "") + " "
+        + func.coalesce(supplier_name, "") + " " + func.coalesce(category_name, "")
+    )
+
+
+def refresh_search_text(db: Session, *criteria) -> None:
+    """
+    Recompute search_text for the products matching `criteria` in one UPDATE
+    (inside the caller's transaction; flush pending ORM changes first).
+    updated_at is left alone - the product itself didn't change.
+    """
+    db.execute(
+        update(Product)
+        .where(*criteria)
+        .values(search_text=_search_text_expr(), updated_at=Product.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# ─── Candidate retrieval, one per backend ────────────────────────────
+
+def _fts_match(groups: List[List[str]]) -> str:
+    """FTS5 query: every group must match, any alternative within a group may"""
+    return " AND ".join("(" + " OR ".join(group) + ")" for group in groups)
+
+
+def _fts_ids(db: Session, match: str, exclude: Set[int], n: int = SEARCH_CANDIDATES) -> List[int]:
+    # No ORDER BY rank: scoring every hit of a common prefix is what makes FTS
+    # slow on big tables. Callers get ordered candidates from the tiers in
+    # _sqlite_candidates instead, and rank them in Python.
+    ids = db.scalars(
+        text("SELECT rowid FROM product_search WHERE product_search MATCH :match LIMIT :n"),
+        {"match": match, "n": n},
+    )
+    return [i for i in ids if i not in exclude]
+
+
+def _is_indexed(db: Session, term: str) -> bool:
+    """
+    Whether any indexed word starts with term. Looked up in the cached
+    vocabulary: probing FTS5 with "term"* reads every posting of a common
+    word, and a word missing from the cache only costs the query some
+    spelling alternatives it didn't need.
+    """
+    if term.isdigit():
+        return True  # numbers never get corrections
+    words = _vocabulary(db, term[0])
+    i = bisect_left(words, term)
+    return i < len(words) and words[i].startswith(term)
+
+
+def _vocabulary(db: Session, letter: str) -> List[str]:
+    """
+    Indexed non-numeric words starting with `letter`, sorted. fts5vocab counts
+    every posting of every term it returns, so the list is cached per letter.
+    """
+    words = _vocabulary_cache.get(letter)
+    if words is None:
+        rows = db.scalars(
+            text("SELECT term FROM product_search_vocab WHERE term >= :lo AND term < :hi"),
+            {"lo": letter, "hi": letter + "\U0010ffff"},
+        )
+        words = [word for word in rows if not word.isdigit()]
+        _vocabulary_cache.set(letter, words)
+    return words
+
+
+def _corrections(db: Session, term: str) -> List[str]:
+    """Indexed words within max_typos(term) edits of term and sharing its first letter, closest first"""
+    distance = max_typos(term)
+    if not distance or term.isdigit():
+        return []
+    found = []
+    for word in _vocabulary(db, term[0]):
+        if abs(len(word) - len(term)) <= distance and within_edit_distance(term, word, distance):
+            found.append(word)
+    found.sort(key=lambda word: (abs(len(word) - len(term)), word))
+    return found[:MAX_CORRECTIONS]
+
+
+def _sqlite_candidates(db: Session, terms: List[str], query: str, limit: int) -> List[int]:
+    """
+    Candidates best first, in tiers that follow the ranking in _score: an
+    exact SKU, then every word whole in the name, every word starting a word
+    of the name, every word whole anywhere, every word as a prefix anywhere.
+    Stops once the tiers give `limit` candidates; within a tier, ties keep
+    id order as the ranking does.
+    """
+    # Unique-index lookups; SKUs are usually stored upper case
+    ids = list(db.scalars(select(Product.id).where(Product.sku.in_({query, query.upper()}))))
+    ids += _fts_ids(db, _fts_match([[f'name : "{t}"'] for t in terms]), set(ids))
+    if len(ids) >= limit:
+        return ids
+
+    # Every product matching all words by prefix (the last tier). A prefix of
+    # a common word makes FTS5 read all of its postings, so this is fetched
+    # once: if it fits in the budget it is the complete candidate set, and
+    # only when it doesn't are the tiers in between worth their queries.
+    everything = _fts_ids(db, _fts_match([[f'"{t}"*'] for t in terms]), set(), SEARCH_CANDIDATES + 1)
+    if len(everything) > SEARCH_CANDIDATES:
+        for tier in ([[f'name : "{t}"*'] for t in terms], [[f'"{t}"'] for t in terms]):
+            ids += _fts_ids(db, _fts_match(tier), set(ids))
+            if len(ids) >= limit:
+                return ids
+    seen = set(ids)
+    ids += [i for i in everything[:SEARCH_CANDIDATES] if i not in seen]
+    if len(ids) >= limit:
+        return ids
+
+    # Too few hits: give words that match nothing their close spellings as alternatives
+    groups = []
+    corrected = False
+    for t in terms:
+        alternatives = [] if _is_indexed(db, t) else _corrections(db, t)
+        corrected = corrected or bool(alternatives)
+        groups.append([f'"{t}"*'] + [f'"{w}"' for w in alternatives])
+    if corrected:
+        ids += _fts_ids(db, _fts_match(groups), set(ids))
+    return ids
+
+
+def _postgres_candidates(db: Session, terms: List[str], query: str, limit: int) -> List[int]:
+    # Both conditions are served by the gin_trgm_ops index; %> is pg_trgm's
+    # word-similarity operator, which is what makes misspellings match
+    conditions = [
+        or_(Product.search_text.icontains(t, autoescape=True), Product.search_text.op("%>")(t))
+        for t in terms
+    ]
+    score = sum(func.word_similarity(t, Product.search_text) for t in terms)
+    return list(db.scalars(
+        select(Product.id).where(and_(*conditions)).order_by(score.desc()).limit(SEARCH_CANDIDATES)
+    ))
+
+
+def _mysql_candidates(db: Session, terms: List[str], query: str, limit: int) -> List[int]:
+    # InnoDB ignores words shorter than innodb_ft_min_token_size (3 by default)
+    indexed = [t for t in terms if len(t) >= 3]
+    if not indexed:
+        return _like_candidates(db, terms, query, limit)
+    return list(db.scalars(
+        text(
+            "SELECT id FROM products WHERE MATCH (search_text) AGAINST (:q IN BOOLEAN MODE) "
+            "ORDER BY MATCH (search_text) AGAINST (:q IN BOOLEAN MODE) DESC LIMIT :n"
+        ),
+        {"q": " ".join(f"+{t}*" for t in indexed), "n": SEARCH_CANDIDATES},
+    ))
+
+
+def _like_candidates(db: Session, terms: List[str], query: str, limit: int) -> List[int]:
+    """Unindexed fallback for other backends (and very short MySQL queries)"""
+    return list(db.scalars(
+        select(Product.id)
+        .where(and_(*(Product.search_text.icontains(t, autoescape=True) for t in terms)))
+        .order_by(Product.id)
+        .limit(SEARCH_CANDIDATES)
+    ))
+
+
+_CANDIDATES = {
+    "sqlite": _sqlite_candidates,
+    "postgresql": _postgres_candidates,
+    "mysql": _mysql_candidates,
+}
+
+
+# ─── Ranking ─────────────────────────────────────────────────────────
+
+def _score(scorer: QueryScorer, query: str, name: str, sku: str, supplier: str, category: str) -> float:
+    if normalize(sku) == query:
+        return 2.0  # exact SKU lookups always win
+    primary = scorer.field(tokenize(f"{name} {sku}"))
+    if min(primary) >= SECONDARY_WEIGHT:
+        return sum(primary) / len(primary)  # supplier/category can't beat any of these
+    secondary = scorer.text(f"{supplier or ''} {category or ''}")
+    total = 0.0
+    for in_primary, in_secondary in zip(primary, secondary):
+        best = max(in_primary, SECONDARY_WEIGHT * in_secondary)
+        if best == 0:
+            return 0.0  # every query word has to match something
+        total += best
+    return total / len(primary)
+
+
+def _rank(db: Session, candidates: List[int], terms: List[str], query: str, limit: int) -> List[int]:
+    """Score candidates from a plain column select (no ORM objects) and return the best ids"""
+    rows = db.execute(
+        select(Product.id, Product.name, Product.sku, Supplier.name, Category.name)
+        .outerjoin(Supplier, Product.supplier_id == Supplier.id)
+        .outerjoin(Category, Product.category_id == Category.id)
+        .where(Product.id.in_(candidates))
+    ).all()
+    scorer = QueryScorer(terms)
+    scored: List[Tuple[float, int]] = []
+    for product_id, name, sku, supplier, category in rows:
+        score = _score(scorer, query, name, sku, supplier, category)
+        if score >= MIN_SCORE:
+            scored.append((-score, product_id))
+    scored.sort()
+    return [product_id for _, product_id in scored[:limit]]
+
+
+def search_products(db: Session, q: str, limit: int = 20) -> List[Product]:
+    """
+    Products matching every word of `q` by prefix, substring or close
+    spelling, best match first. Returns [] for a query without words.
+    """
+    terms = tokenize(q)[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+    query = normalize(q).strip()
+    candidates = _CANDIDATES.get(db.get_bind().dialect.name, _like_candidates)(db, terms, query, limit)
+    if not candidates:
+        return []
+
+    best = _rank(db, candidates, terms, query, limit)
+    products = {p.id: p for p in db.query(Product).filter(Product.id.in_(best)).all()}
+    return [products[i] for i in best if i in products]
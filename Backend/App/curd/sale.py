@@ -1,16 +1,22 @@
-from typing import Optional, List, Dict
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload, load_only, lazyload
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from App.models import Sale, SaleItem, Product
 from App.schemas import SaleTransactionCreate
 from App.schemas import SaleResponse, SaleWithDetails
+from App.utils.pagination import keyset_page
+from App.curd.product import adjust_stock
+from App.curd.catalog_version import bump_catalog_version, PRODUCTS
+from App.curd.invoice import invoice_allocator
+from App.curd.sales_rollup import add_sale_to_rollups
 
 def _generate_invoice_number(db: Session) -> str:
-    # Simple invoice generator — timestamp + count to reduce collisions
-    cnt = db.query(Sale).count() or 0
-    return f"INV-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{cnt+1}"
+    # Block-allocated, unique across workers - see App.curd.invoice
+    return invoice_allocator.next_number(db)
 
 def create_sale_transaction(db: Session, sale_in: SaleTransactionCreate, user_id: Optional[int] = None) -> Dict:
     """
@@ -21,16 +27,10 @@ def create_sale_transaction(db: Session, sale_in: SaleTransactionCreate, user_id
     if not sale_in.items:
         raise ValueError("Sale must include at least one item")
 
-    # Collect product ids and load products in-session (with_for_update where supported)
+    # Collect product ids and load products for prices and a fast stock pre-check.
+    # The authoritative stock check is the conditional UPDATE further down.
     product_ids = list({item.product_id for item in sale_in.items})
-    products_q = db.query(Product).filter(Product.id.in_(product_ids))
-
-    # Try to lock rows for update when DB supports it
-    try:
-        products = {p.id: p for p in products_q.with_for_update().all()}
-    except Exception:
-        # Some DBs (SQLite) don't support FOR UPDATE in the same way; fallback to simple load
-        products = {p.id: p for p in products_q.all()}
+    products = {p.id: p for p in db.query(Product).filter(Product.id.in_(product_ids)).all()}
 
     # Validate products exist
     for pid in product_ids:
@@ -54,7 +54,6 @@ def create_sale_transaction(db: Session, sale_in: SaleTransactionCreate, user_id
         total_amount += line_total
         total_items += item.quantity
         prepared_lines.append({
-            "product": prod,
             "product_id": prod.id,
             "quantity": item.quantity,
             "unit_price": unit_price,
@@ -73,27 +72,46 @@ def create_sale_transaction(db: Session, sale_in: SaleTransactionCreate, user_id
         created_at=datetime.utcnow()
     )
 
+    # Total quantity per product, so each product is decremented once
+    deductions: Dict[int, int] = {}
+    for li in prepared_lines:
+        deductions[li["product_id"]] = deductions.get(li["product_id"], 0) + li["quantity"]
+
     try:
+        # Deduct stock with conditional atomic updates (in id order to avoid
+        # lock-order deadlocks); a concurrent sale that got there first makes
+        # the update match no row
+        for pid in sorted(deductions):
+            if not adjust_stock(db, pid, -deductions[pid]):
+                raise ValueError(f"Not enough stock for product_id={pid}")
+
         db.add(sale_obj)
         db.flush()  # assign id
 
-        # Create sale items and deduct stock
+        # Create sale items
         for li in prepared_lines:
-            prod = li["product"]
             si = SaleItem(
                 sale_id=sale_obj.id,
                 product_id=li["product_id"],
                 quantity=li["quantity"],
                 unit_price=li["unit_price"],
-                total_price=li["total_price"]
+                total_price=li["total_price"],
+                category_id=products[li["product_id"]].category_id
             )
-            prod.quantity = (prod.quantity or 0) - li["quantity"]
-            if prod.quantity < 0:
-                raise ValueError(f"Not enough stock after deduction for product_id={prod.id}")
-
             db.add(si)
-            db.add(prod)
 
+        # Reporting rollups, committed together with the sale
+        add_sale_to_rollups(
+            db,
+            created_at=sale_obj.created_at,
+            payment_method=sale_obj.payment_method,
+            total_amount=total_amount,
+            lines=prepared_lines,
+            category_ids={pid: p.category_id for pid, p in products.items()},
+        )
+
+        # Once, after every stock UPDATE - see adjust_stock
+        bump_catalog_version(db, PRODUCTS)
         db.commit()
         db.refresh(sale_obj)
 
@@ -115,12 +133,74 @@ def create_sale_transaction(db: Session, sale_in: SaleTransactionCreate, user_id
         except Exception:
             detail = "; ".join(map(str, e.args)) if e.args else "Integrity error"
         raise ValueError("Database error while creating sale: " + detail)
+    except ValueError:
+        db.rollback()
+        raise
     except Exception:
+        # Lock timeouts and other database/programming errors are not
+        # validation failures; undo the partial sale and let them surface
         db.rollback()
-        raise ValueError("Sale must include at least one item")
+        raise
     
 def get_sale(db: Session, sale_id: int) -> Optional[Sale]:
     return db.query(Sale).filter(Sale.id == sale_id).first()
 
 def get_sales(db: Session, skip: int = 0, limit: int = 100) -> List[Sale]:
-    return db.query(Sale).order_by(Sale.created_at.desc()).offset(skip).limit(limit).all()
\ No newline at end of file
+    return db.query(Sale).order_by(Sale.created_at.desc(), Sale.id.desc()).offset(skip).limit(limit).all()
+
+
+def _sale_detail_query(db: Session):
+    """
+    Sales with their line items and the products they reference.
+    Items come from one IN-query per page and products are joined into it
+    (id/name/sku only), so a page costs two queries regardless of size.
+    """
+    return db.query(Sale).options(_sale_detail_options())
+
+
+def _sale_detail_options():
+    return (
+        selectinload(Sale.sale_items)
+        .joinedload(SaleItem.product)
+        .options(
+            load_only(Product.id, Product.name, Product.sku),
+            lazyload(Product.supplier),
+            lazyload(Product.category),
+        )
+    )
+
+
+def get_sale_with_details(db: Session, sale_id: int) -> Optional[Sale]:
+    return _sale_detail_query(db).filter(Sale.id == sale_id).first()
+
+
+def get_sales_with_details(db: Session, skip: int = 0, limit: int = 100) -> List[Sale]:
+    return (
+        _sale_detail_query(db)
+        .order_by(Sale.created_at.desc(), Sale.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_sales_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Sale], Optional[str]]:
+    """Newest-first keyset page of sales with details; returns (sales, next_cursor)"""
+    return keyset_page(_sale_detail_query(db), Sale, cursor, limit)
+
+
+# Async reads - used by the sales router when it runs on get_async_db
+async def get_sale_with_details_async(db: AsyncSession, sale_id: int) -> Optional[Sale]:
+    result = await db.execute(select(Sale).options(_sale_detail_options()).where(Sale.id == sale_id))
+    return result.scalars().first()
+
+
+async def get_sales_with_details_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Sale]:
+    result = await db.execute(
+        select(Sale)
+        .options(_sale_detail_options())
+        .order_by(Sale.created_at.desc(), Sale.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
@@ -0,0 +1,218 @@
+"""
+Daily sales rollups (day x product, day x category, day x payment method).
+
+create_sale_transaction adds each sale to the rollups in its own transaction,
+so reports read a few hundred pre-aggregated rows instead of scanning sales
+and sale_items. rebuild_sales_rollups recomputes a date range from the raw
+tables for backfills and repairs (python -m App.scripts.rebuild_sales_rollups).
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from App.models import Category, Product, Sale, SaleItem
+from App.models.sales_rollup import (
+    DailyProductSales, DailyCategorySales, DailyPaymentSales, UNCATEGORIZED
+)
+from App.curd.counters import increment_counters
+
+
+def add_sale_to_rollups(
+    db: Session,
+    created_at: datetime,
+    payment_method: Optional[str],
+    total_amount: float,
+    lines: Iterable[Dict],
+    category_ids: Dict[int, Optional[int]],
+) -> None:
+    """
+    Add one sale to the daily rollups. `lines` are dicts with product_id,
+    quantity and total_price; `category_ids` maps product id -> category id
+    (the same ids the sale stores on its sale_items).
+    Does not commit - call inside the sale's transaction.
+    """
+    day = created_at.date()
+    by_product: Dict[int, List] = defaultdict(lambda: [0, 0.0])
+    by_category: Dict[int, List] = defaultdict(lambda: [0, 0.0])
+    for line in lines:
+        category_id = category_ids.get(line["product_id"]) or UNCATEGORIZED
+        for bucket in (by_product[line["product_id"]], by_category[category_id]):
+            bucket[0] += line["quantity"]
+            bucket[1] += line["total_price"]
+
+    increment_counters(db, DailyProductSales, ("day", "product_id"), [
+        {"day": day, "product_id": pid, "quantity": qty, "revenue": revenue}
+        for pid, (qty, revenue) in by_product.items()
+    ])
+    increment_counters(db, DailyCategorySales, ("day", "category_id"), [
+        {"day": day, "category_id": cid, "quantity": qty, "revenue": revenue}
+        for cid, (qty, revenue) in by_category.items()
+    ])
+    increment_counters(db, DailyPaymentSales, ("day", "payment_method"), [
+        {"day": day, "payment_method": payment_method or "", "sale_count": 1, "revenue": total_amount}
+    ])
+
+
+def _as_date(value) -> date:
+    # SQLite's date() returns text
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+ROLLUP_MODELS = (DailyProductSales, DailyCategorySales, DailyPaymentSales)
+
+
+def _clear_rollups(db: Session, start: Optional[date], end: Optional[date]) -> None:
+    """
+    Delete the range's rollup rows, first thing in the rebuild's transaction,
+    so that no sale can add to the rollups between the rebuild's reads and
+    its commit. A sale added in that window would be counted in neither.
+    - PostgreSQL: the rollup tables are locked against writes (reads go on).
+      Row locks alone wouldn't stop a sale from inserting a new key.
+    - MySQL/InnoDB: the DELETE's next-key locks cover the range, gaps included.
+    - SQLite: the DELETE takes the database write lock.
+    Sales in the meantime wait for the rebuild to commit.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        tables = ", ".join(model.__tablename__ for model in ROLLUP_MODELS)
+        db.execute(text(f"LOCK TABLE {tables} IN EXCLUSIVE MODE"))
+    for model in ROLLUP_MODELS:
+        db.execute(delete(model).where(*_day_range(model, start, end)))
+
+
+def rebuild_sales_rollups(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, int]:
+    """
+    Recompute the rollups for days in [start, end] (inclusive; open-ended when
+    omitted) from sales and sale_items, replacing what is stored. Lines count
+    toward the category they were sold under (sale_items.category_id), as the
+    live rollups do. Safe to run while sales are being made; they wait for it
+    to commit. Returns the row count per table.
+    """
+    _clear_rollups(db, start, end)
+
+    day = func.date(Sale.created_at)
+    sale_range = []
+    if start is not None:
+        sale_range.append(Sale.created_at >= datetime.combine(start, datetime.min.time()))
+    if end is not None:
+        sale_range.append(Sale.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+
+    product_rows = db.execute(
+        select(day.label("day"), SaleItem.product_id,
+               func.sum(SaleItem.quantity).label("quantity"), func.sum(SaleItem.total_price).label("revenue"))
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(*sale_range)
+        .group_by(day, SaleItem.product_id)
+    ).all()
+    category_id = func.coalesce(SaleItem.category_id, UNCATEGORIZED)
+    category_rows = db.execute(
+        select(day.label("day"), category_id.label("category_id"),
+               func.sum(SaleItem.quantity).label("quantity"), func.sum(SaleItem.total_price).label("revenue"))
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(*sale_range)
+        .group_by(day, category_id)
+    ).all()
+    payment_rows = db.execute(
+        select(day.label("day"), func.coalesce(Sale.payment_method, "").label("payment_method"),
+               func.count(Sale.id).label("sale_count"), func.sum(Sale.total_amount).label("revenue"))
+        .where(*sale_range)
+        .group_by(day, func.coalesce(Sale.payment_method, ""))
+    ).all()
+
+    counts = {}
+    for model, rows in zip(ROLLUP_MODELS, (product_rows, category_rows, payment_rows)):
+        values = [dict(row._mapping, day=_as_date(row.day)) for row in rows]
+        if values:
+            db.execute(insert(model), values)
+        counts[model.__tablename__] = len(values)
+    db.commit()
+    return counts
+
+
+# Reporting reads
+
+def _day_range(model, start: Optional[date], end: Optional[date]) -> list:
+    clauses = []
+    if start is not None:
+        clauses.append(model.day >= start)
+    if end is not None:
+        clauses.append(model.day <= end)
+    return clauses
+
+
+def get_revenue_series(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None, interval: str = "day"
+) -> List[Dict]:
+    """Sale count and revenue per day (or per month, keyed by its first day), oldest first"""
+    rows = db.execute(
+        select(DailyPaymentSales.day, func.sum(DailyPaymentSales.sale_count).label("sale_count"),
+               func.sum(DailyPaymentSales.revenue).label("revenue"))
+        .where(*_day_range(DailyPaymentSales, start, end))
+        .group_by(DailyPaymentSales.day)
+        .order_by(DailyPaymentSales.day)
+    ).all()
+
+    series: Dict[date, Dict] = {}
+    for row in rows:
+        period = row.day.replace(day=1) if interval == "month" else row.day
+        point = series.setdefault(period, {"period": period, "sale_count": 0, "revenue": 0.0})
+        point["sale_count"] += row.sale_count
+        point["revenue"] += float(row.revenue)
+    return list(series.values())
+
+
+def get_revenue_by_product(
+    db: Session, start: Optional[date] = None, end: Optional[date] = None, limit: int = 50
+) -> List[Dict]:
+    """Top products by revenue over the range"""
+    revenue = func.sum(DailyProductSales.revenue).label("revenue")
+    rows = db.execute(
+        select(DailyProductSales.product_id, Product.name, Product.sku,
+               func.sum(DailyProductSales.quantity).label("quantity"), revenue)
+        .outerjoin(Product, DailyProductSales.product_id == Product.id)
+        .where(*_day_range(DailyProductSales, start, end))
+        .group_by(DailyProductSales.product_id, Product.name, Product.sku)
+        .order_by(revenue.desc(), DailyProductSales.product_id)
+        .limit(limit)
+    ).all()
+    return [
+        {"product_id": r.product_id, "name": r.name, "sku": r.sku,
+         "quantity": int(r.quantity), "revenue": float(r.revenue)}
+        for r in rows
+    ]
+
+
+def get_revenue_by_category(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+    """Revenue per category over the range; uncategorized sales have category_id None"""
+    revenue = func.sum(DailyCategorySales.revenue).label("revenue")
+    rows = db.execute(
+        select(DailyCategorySales.category_id, Category.name,
+               func.sum(DailyCategorySales.quantity).label("quantity"), revenue)
+        .outerjoin(Category, DailyCategorySales.category_id == Category.id)
+        .where(*_day_range(DailyCategorySales, start, end))
+        .group_by(DailyCategorySales.category_id, Category.name)
+        .order_by(revenue.desc(), DailyCategorySales.category_id)
+    ).all()
+    return [
+        {"category_id": r.category_id or None, "name": r.name,
+         "quantity": int(r.quantity), "revenue": float(r.revenue)}
+        for r in rows
+    ]
+
+
+def get_revenue_by_payment_method(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+    """Sale count and revenue per payment method over the range"""
+    revenue = func.sum(DailyPaymentSales.revenue).label("revenue")
+    rows = db.execute(
+        select(DailyPaymentSales.payment_method,
+               func.sum(DailyPaymentSales.sale_count).label("sale_count"), revenue)
+        .where(*_day_range(DailyPaymentSales, start, end))
+        .group_by(DailyPaymentSales.payment_method)
+        .order_by(revenue.desc(), DailyPaymentSales.payment_method)
+    ).all()
+    return [
+        {"payment_method": r.payment_method or None,
+         "sale_count": int(r.sale_count), "revenue": float(r.revenue)}
+        for r in rows
+    ]
@@ -1,6 +1,11 @@
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from App.models import Supplier
+from App.models import Supplier, Product
+from App.curd.product_search import refresh_search_text
+from App.curd.catalog_version import bump_catalog_version, SUPPLIERS
+from App.curd.catalog_cache import supplier_cache
 from App.schemas import SupplierCreate,SupplierUpdate,SupplierResponse,SupplierWithProducts
 from typing import List, Optional
 
@@ -24,8 +29,10 @@ def Create_supplier(db:Session,supplier_in:SupplierCreate)->Supplier:
         )
     try:
         db.add(db_supplier)
+        bump_catalog_version(db, SUPPLIERS)
         db.commit()
         db.refresh(db_supplier)
+        supplier_cache.added(db_supplier.id)
         return db_supplier
     except IntegrityError as e:
         db.rollback()
@@ -40,8 +47,9 @@ def Create_supplier(db:Session,supplier_in:SupplierCreate)->Supplier:
 def get_supplier(db:Session,supplier_id:int)->Optional[Supplier]:
     return db.query(Supplier).filter(Supplier.id==supplier_id).first()
 
-def get_suppliers(db:Session ,skip:int=0,limit:int=100)->List[Supplier]:
-    return db.query(Supplier).offset(skip).limit(limit).all()
+def get_suppliers(db:Session ,skip:int=0,limit:int=100)->List[SupplierResponse]:
+    """Served from the in-process cache, reloaded only after the table changed"""
+    return supplier_cache.list(db, skip=skip, limit=limit)
 
 def update_supplier(db: Session, supplier_id: int, supplier_in: SupplierUpdate) -> Optional[Supplier]:
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
@@ -59,6 +67,11 @@ def update_supplier(db: Session, supplier_id: int, supplier_in: SupplierUpdate)
         setattr(supplier, field, value)
     try:
         db.add(supplier)
+        if "name" in update_data:
+            # Supplier names are part of the product search index
+            db.flush()
+            refresh_search_text(db, Product.supplier_id == supplier_id)
+        bump_catalog_version(db, SUPPLIERS)
         db.commit()
         db.refresh(supplier)
         return supplier
@@ -70,9 +83,16 @@ def delete_supplier(db: Session, supplier_id: int) -> bool:
     supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
     if not supplier:
         return False
+    product_ids = list(db.scalars(select(Product.id).where(Product.supplier_id == supplier_id)))
     try:
         db.delete(supplier)
+        if product_ids:
+            # Products left without a supplier drop its name from their search text
+            db.flush()
+            refresh_search_text(db, Product.id.in_(product_ids))
+        bump_catalog_version(db, SUPPLIERS)
         db.commit()
+        supplier_cache.removed(supplier_id)
         return True
     except IntegrityError as e:
         db.rollback()
@@ -83,4 +103,13 @@ def delete_supplier(db: Session, supplier_id: int) -> bool:
         except Exception:
             detail = "; ".join(map(str, e.args)) if e.args else "Integrity error"
         raise ValueError("Cannot delete supplier: there are references to this supplier. " + detail)
-    
+
+
+# Async reads - used by the suppliers router when it runs on get_async_db
+async def get_supplier_async(db: AsyncSession, supplier_id: int) -> Optional[Supplier]:
+    result = await db.execute(select(Supplier).where(Supplier.id == supplier_id))
+    return result.scalars().first()
+
+async def get_suppliers_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Supplier]:
+    result = await db.execute(select(Supplier).order_by(Supplier.id).offset(skip).limit(limit))
+    return result.scalars().all()
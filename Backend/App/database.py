@@ -1,9 +1,17 @@
-from sqlalchemy import create_engine,text
+from sqlalchemy import create_engine,text,event,inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from App.utils.metrics import Histogram
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -13,13 +21,176 @@ if not DATABASE_URL:
         "Please create a .env file with DATABASE_URL"
     )
 
-engine = create_engine(
-        DATABASE_URL,
+# Pool sizing - tune against the number of workers sharing the database
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))   # seconds, -1 disables
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))   # seconds to wait for a free connection
+
+# Time spent waiting for a pooled connection (includes opening new ones)
+pool_wait_histogram = Histogram()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait_histogram.observe(time.perf_counter() - start)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERY INSTRUMENTATION - statements and DB time per request (or per block)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# QUERY_DEBUG=true: responses carry X-Query-Count / X-DB-Time (ms), and any
+# request running one statement N_PLUS_ONE_THRESHOLD times or more is logged
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "False").lower() == "true"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class QueryStats:
+    """
+    Statements executed and time spent in them, filled in by the engine
+    events while the stats are current. With track_statements, executions
+    are also counted per SQL text: the same text run again and again with
+    different parameters is what an N+1 pattern looks like.
+    """
+
+    __slots__ = ("count", "db_time", "statements")
+
+    def __init__(self, track_statements: bool = False):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """(statement, executions) run at least `threshold` times, most repeated first"""
+        if not self.statements:
+            return []
+        return sorted(
+            ((statement, n) for statement, n in self.statements.items() if n >= threshold),
+            key=lambda item: -item[1],
+        )
+
+    def add(self, other: "QueryStats") -> None:
+        self.count += other.count
+        self.db_time += other.db_time
+        if self.statements is not None and other.statements:
+            for statement, n in other.statements.items():
+                self.statements[statement] = self.statements.get(statement, 0) + n
+
+
+# Context variables are inherited by run_in_threadpool and by the async
+# engine's greenlets, so statements land in the right request's stats
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    stats.count += 1
+    stats.db_time += time.perf_counter() - started
+    if stats.statements is not None:
+        stats.statements[statement] = stats.statements.get(statement, 0) + 1
+
+
+def instrument_engine(engine) -> None:
+    """Feed the current QueryStats from this engine (for an async engine pass .sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _statement_started)
+    event.listen(engine, "after_cursor_execute", _statement_finished)
+
+
+def start_query_stats(track_statements: bool = False) -> Tuple[QueryStats, Token]:
+    """Make fresh QueryStats current; pass the token to stop_query_stats when done"""
+    stats = QueryStats(track_statements)
+    return stats, _query_stats.set(stats)
+
+
+def stop_query_stats(token: Token) -> None:
+    _query_stats.reset(token)
+
+
+@contextmanager
+def count_queries(track_statements: bool = True) -> Iterator[QueryStats]:
+    """
+    Count the statements the block runs, e.g. to hold a code path to a
+    query budget:
+
+        with count_queries() as queries:
+            get_products(db, skip=0, limit=100)
+        assert queries.count <= 2, queries.repeated(2)
+
+    Inside a request, the request's own stats still include the block.
+    """
+    outer = _query_stats.get()
+    stats, token = start_query_stats(track_statements)
+    try:
+        yield stats
+    finally:
+        stop_query_stats(token)
+        if outer is not None:
+            outer.add(stats)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """count_queries that raises AssertionError if the block runs more than max_queries statements"""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise AssertionError(
+            f"{stats.count} queries, budget is {max_queries}; most repeated: "
+            + "; ".join(f"{n}x {' '.join(statement.split())[:120]}" for statement, n in stats.repeated(2)[:3])
+        )
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    """SQLite ignores FOREIGN KEY clauses unless each connection turns them on"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL, **overrides):
+    """
+    Build the application's engine. There should be exactly one per process -
+    import `engine` from this module instead of calling create_engine elsewhere.
+    """
+    options = dict(
         pool_pre_ping=True,      # Verify connections before using
-        pool_size=10,            # Connection pool size
-        max_overflow=20,         # Max connections beyond pool_size
         echo=os.getenv("DEBUG", "False").lower() == "true"
     )
+    parsed = make_url(url)
+    in_memory_sqlite = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if not in_memory_sqlite:
+        # In-memory SQLite keeps its own single-connection pool
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_timeout=DB_POOL_TIMEOUT,
+        )
+    options.update(overrides)
+    db_engine = create_engine(url, **options)
+    if parsed.get_backend_name() == "sqlite":
+        event.listen(db_engine, "connect", _enable_sqlite_foreign_keys)
+    instrument_engine(db_engine)
+    return db_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -43,12 +214,88 @@ def get_db():
     finally:
         db.close()
 
+# ═══════════════════════════════════════════════════════════════════════════
+# ASYNC ENGINE - optional, for read-heavy routers (needs an async driver:
+# aiosqlite / asyncpg / aiomysql depending on DATABASE_URL)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Comma separated router names served through get_async_db,
+# e.g. ASYNC_DB_ROUTERS=products,categories,suppliers,sales,inventory
+ASYNC_DB_ROUTERS = {
+    name.strip() for name in os.getenv("ASYNC_DB_ROUTERS", "").split(",") if name.strip()
+}
+
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def async_db_enabled(router_name: str) -> bool:
+    """Whether the named router reads through get_async_db (see App.utils.dependencies.read_db)"""
+    return router_name in ASYNC_DB_ROUTERS
+
+
+def get_async_engine():
+    """Create (once) and return the async engine mirroring `engine`'s settings"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        parsed = make_url(DATABASE_URL)
+        backend = parsed.get_backend_name()
+        if backend not in _ASYNC_DRIVERS:
+            raise ValueError(f"No async driver configured for database backend '{backend}'")
+        options = dict(pool_pre_ping=True)
+        if not (backend == "sqlite" and parsed.database in (None, "", ":memory:")):
+            options.update(
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_timeout=DB_POOL_TIMEOUT,
+            )
+        _async_engine = create_async_engine(parsed.set(drivername=_ASYNC_DRIVERS[backend]), **options)
+        if backend == "sqlite":
+            event.listen(_async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+        instrument_engine(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    """
+    AsyncSession generator for FastAPI dependency injection - the async
+    counterpart of get_db. Relationships must be eager-loaded; lazy loads
+    are not available on an AsyncSession.
+    """
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (aiosqlite keeps a thread per connection)"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
+
 def init_db():
     """
     Initialize database - create all tables.
     
     This imports all models and creates their tables in the database.
     Safe to call multiple times (won't recreate existing tables).
+    Does nothing once the database has been migrated (has an alembic_version
+    table): from then on `alembic upgrade head` owns the schema, and
+    create_all running ahead of it would create indexes and tables the
+    pending revisions then trip over.
     """
     # Import all models to register them with Base
     # from App.models.product import Product
@@ -58,6 +305,9 @@ def init_db():
     # from App.models.inventory_transaction import InventoryTransaction
     # from App.models.sale import Sale, SaleItem
     from App import models
+    if inspect(engine).has_table("alembic_version"):
+        print("✅ Database schema is managed by migrations (alembic upgrade head)")
+        return
     # Create all tables
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created successfully!")
@@ -82,7 +332,8 @@ def reset_db():
     """
     print("🔄 Resetting database...")
     drop_db()
-    init_db()
+    # Not init_db(): drop_all leaves alembic_version behind
+    Base.metadata.create_all(bind=engine)
     print("✅ Database reset complete!")
 
 def test_connection():
@@ -103,12 +354,41 @@ def test_connection():
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         return False
+
+
+def get_pool_stats():
+    """
+    Snapshot of the connection pool for sizing: connections checked out,
+    overflow in use and the checkout wait-time histogram.
+    """
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": DB_MAX_OVERFLOW,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+        })
+    stats["checkout_wait_seconds"] = pool_wait_histogram.snapshot()
+    return stats
+
     
 __all__ = [
     "engine",
     "SessionLocal",
     "Base",
+    "create_db_engine",
+    "get_pool_stats",
+    "QueryStats",
+    "count_queries",
+    "query_budget",
     "get_db",
+    "get_async_db",
+    "get_async_engine",
+    "dispose_async_engine",
+    "async_db_enabled",
     "init_db",
     "drop_db",
     "reset_db",
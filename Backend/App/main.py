@@ -1,15 +1,33 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text 
 from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
 from App import models 
-from App.database import init_db, test_connection
-from App.utils.dependencies import get_db
+from App.database import init_db, test_connection, get_db, get_pool_stats, dispose_async_engine, pool_wait_histogram
+from App.utils.responses import DefaultJSONResponse
+from App.utils.password_pool import password_pool, PasswordHashingBusy
+from App.utils.request_metrics import RequestMetricsMiddleware, request_metrics, render_gauge, render_histogram
 load_dotenv()
 from App.routes import auth as auth_router
+from App.routes import product as products_router
+from App.routes import supplier as supplier_router
+from App.routes import inventory_transaction as inventory_tx_router
+from App.routes import sale as Sale
+from App.routes import category as categories_module
+from App.routes import dashboard as dashboard_router
+from App.routes import export as export_router
+from App.routes import report as report_router
+
+# Production startup: skip create_all, which inspects every table on every
+# boot of every worker. The schema is then managed by migrations only -
+# run `alembic upgrade head` as a deploy step, before starting the workers.
+# (Without FAST_STARTUP, init_db also leaves a migrated database alone.)
+FAST_STARTUP = os.getenv("FAST_STARTUP", "False").lower() == "true"
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -21,12 +39,14 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting Inventory Management System...")
     print("=" * 60)
     
-    # Test database connection
-    if test_connection():
+    # Test database connection (also opens the first pooled connection)
+    if not test_connection():
+        print("⚠️  Warning: Could not connect to database!")
+    elif FAST_STARTUP:
+        print("⚡ Fast startup: schema is managed by migrations (alembic upgrade head)")
+    else:
         # Initialize database (create tables if they don't exist)
         init_db()
-    else:
-        print("⚠️  Warning: Could not connect to database!")
     
     print("=" * 60)
     print("✅ Application started successfully!")
@@ -36,6 +56,8 @@ async def lifespan(app: FastAPI):
     yield  # Application runs here
     
     # Shutdown
+    await dispose_async_engine()
+    password_pool.shutdown()
     print("=" * 60)
     print("👋 Shutting down Inventory Management System...")
     print("=" * 60)
@@ -45,6 +67,7 @@ app = FastAPI(
     description="A comprehensive inventory management system with product tracking, sales, and supplier management",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,  # orjson when installed
     debug=os.getenv("DEBUG", "False").lower() == "true"
 )
 
@@ -56,6 +79,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the timings include every other middleware
+app.add_middleware(RequestMetricsMiddleware)
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy(request: Request, exc: PasswordHashingBusy):
+    """Shed logins/registrations while the password hashing pool is saturated"""
+    return DefaultJSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
 @app.get("/")
 def read_root():
     """
@@ -92,25 +124,63 @@ def health_check(db: Session = Depends(get_db)):
             "error": str(e)
         }
 
-from App.routes import product as products_router
-app.include_router(auth_router. router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(products_router.router, prefix="/api/v1", tags=["Products"])
+@app.get("/health/pool")
+def pool_stats():
+    """
+    Connection pool statistics - checked-out connections, overflow in use
+    and the checkout wait-time histogram. Use it to size DB_POOL_SIZE /
+    DB_MAX_OVERFLOW for the number of workers.
+    """
+    return get_pool_stats()
 
-from App.routes import supplier as supplier_router
-app.include_router(auth_router. router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(supplier_router.router,prefix="/api/v1", tags=["Suppliers"])
 
-from App.routes import inventory_transaction as inventory_tx_router
-app.include_router(auth_router. router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(inventory_tx_router.router, prefix="/api/v1", tags=["InventoryTransactions"])
+@app.get("/health/password-hashing")
+def password_hashing_stats():
+    """
+    Password hashing pool: hashes in progress and queued, how many were
+    shed with 503, and the latency histogram (queueing included). Size it
+    with PASSWORD_HASH_WORKERS / PASSWORD_HASH_MAX_QUEUE.
+    """
+    return password_pool.stats()
 
-from App.routes import sale as Sale
-app.include_router(auth_router. router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(Sale.router,prefix='/api/v1',tags=["SaleItem"])
 
-from App.routes import category as categories_module
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint: per-route latency, DB time and status
+    counts, requests in flight, the DB connection pool and the password
+    hashing pool.
+    """
+    pool = get_pool_stats()
+    hashing = password_pool.stats()
+    lines = request_metrics.render()
+    if "checked_out" in pool:
+        lines += render_gauge("db_pool_connections_checked_out", pool["checked_out"], "Pooled DB connections in use")
+        lines += render_gauge("db_pool_overflow", pool["overflow"], "DB connections open beyond pool_size")
+    lines += ["# HELP db_pool_checkout_wait_seconds Time waiting for a pooled DB connection",
+              "# TYPE db_pool_checkout_wait_seconds histogram"]
+    lines += render_histogram("db_pool_checkout_wait_seconds", pool_wait_histogram)
+    lines += render_gauge("password_hash_in_progress", hashing["in_progress"], "Password hashes running")
+    lines += render_gauge("password_hash_queued", hashing["queued"], "Password hashes waiting for a worker")
+    lines += ["# HELP password_hash_rejected_total Password hashes shed with 503",
+              "# TYPE password_hash_rejected_total counter",
+              f"password_hash_rejected_total {hashing['rejected']}",
+              "# HELP password_hash_seconds Password hash latency, queueing included",
+              "# TYPE password_hash_seconds histogram"]
+    lines += render_histogram("password_hash_seconds", password_pool.latency)
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+# Each router is mounted exactly once - every request is matched against
+# the route table in order, so duplicates only cost time
 app.include_router(auth_router. router, prefix="/api/v1/auth", tags=["Authentication"])
+app.include_router(products_router.router, prefix="/api/v1", tags=["Products"])
+app.include_router(supplier_router.router,prefix="/api/v1", tags=["Suppliers"])
+app.include_router(inventory_tx_router.router, prefix="/api/v1", tags=["InventoryTransactions"])
+app.include_router(Sale.router,prefix='/api/v1',tags=["SaleItem"])
 app.include_router(categories_module.router, prefix="/api/v1", tags=["Categories"]) 
+app.include_router(dashboard_router.router, prefix="/api/v1", tags=["Dashboard"])
+app.include_router(export_router.router, prefix="/api/v1", tags=["Exports"])
+app.include_router(report_router.router, prefix="/api/v1", tags=["Reports"])
 
 @app.get("/info")
 def app_info():
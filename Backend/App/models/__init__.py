@@ -14,6 +14,10 @@ from .category import Category
 from .user import User
 from .inventory_transaction import InventoryTransaction
 from .sale import Sale, SaleItem
+from .invoice_counter import InvoiceCounter
+from .sales_rollup import DailyProductSales, DailyCategorySales, DailyPaymentSales
+from .catalog_version import CatalogVersion
+from .refresh_token import RefreshToken
 
 # Export all models
 __all__ = [
@@ -23,5 +27,11 @@ __all__ = [
     "User",
     "InventoryTransaction",
     "Sale",
-    "SaleItem"
+    "SaleItem",
+    "InvoiceCounter",
+    "DailyProductSales",
+    "DailyCategorySales",
+    "DailyPaymentSales",
+    "CatalogVersion",
+    "RefreshToken"
 ]
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+from App.database import Base
+
+
+# Each table's version is the sum of this many rows. A writer bumps the row
+# picked by its worker process and thread, so concurrent sales adjusting
+# stock don't all queue on a single counter row.
+CATALOG_VERSION_SHARDS = 16
+
+
+class CatalogVersion(Base):
+    """Change counters behind the ETags of the category, supplier and product reads"""
+    __tablename__ = "catalog_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
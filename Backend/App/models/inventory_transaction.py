@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from App.database import Base
 from datetime import datetime
@@ -14,6 +14,12 @@ class TransactionType(str, enum.Enum):
 
 class InventoryTransaction(Base):
     __tablename__ = "inventory_transactions"
+    __table_args__ = (
+        # Keyset pagination order (see App.utils.pagination)
+        Index("ix_inventory_transactions_created_at_id", "created_at", "id"),
+        # Per-product ledger history, newest first
+        Index("ix_inventory_transactions_product_id_created_at", "product_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
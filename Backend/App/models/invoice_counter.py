@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Sequence
+from App.database import Base
+
+
+# Invoice numbers are handed out in blocks of this size per worker process.
+# On PostgreSQL the sequence itself steps by the block size, so changing it
+# needs an ALTER SEQUENCE ... INCREMENT BY on existing databases.
+INVOICE_BLOCK_SIZE = 100
+
+# Native sequence used on PostgreSQL (ignored by backends without sequences)
+invoice_number_seq = Sequence(
+    "invoice_number_seq", start=1, increment=INVOICE_BLOCK_SIZE, metadata=Base.metadata
+)
+
+
+class InvoiceCounter(Base):
+    """Named counters for backends without native sequences (SQLite, MySQL)"""
+    __tablename__ = "invoice_counters"
+
+    name = Column(String(50), primary_key=True)
+    next_value = Column(Integer, nullable=False, default=1)
@@ -1,19 +1,48 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Index, DDL, event, false
 from sqlalchemy.orm import relationship
 from App.database import Base
 from datetime import datetime
 
 
+# Used when a product has no reorder level of its own
+DEFAULT_REORDER_LEVEL = 10
+
+
+def _initial_low_stock(context) -> bool:
+    """INSERT default for is_low_stock, computed from the row being inserted"""
+    params = context.get_current_parameters()
+    quantity = params.get("quantity")
+    reorder_level = params.get("reorder_level")
+    return (quantity or 0) <= (DEFAULT_REORDER_LEVEL if reorder_level is None else reorder_level)
+
+
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Low-stock watch list and its changes feed (see App.curd.product)
+        Index("ix_products_is_low_stock_id", "is_low_stock", "id"),
+        Index("ix_products_low_stock_changed_at_id", "low_stock_changed_at", "id"),
+        # Refreshing search_text after a supplier/category rename
+        Index("ix_products_supplier_id", "supplier_id"),
+        Index("ix_products_category_id", "category_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     sku = Column(String(50), unique=True, nullable=False)
     quantity = Column(Integer, default=0)
     price = Column(Float)
-    reorder_level = Column(Integer, default=10)
+    reorder_level = Column(Integer, default=DEFAULT_REORDER_LEVEL)
+
+    # quantity <= reorder_level, kept in sync by every write that touches
+    # either column so the watch list is an index lookup
+    is_low_stock = Column(Boolean, nullable=False, default=_initial_low_stock, server_default=false())
+    low_stock_changed_at = Column(DateTime, default=datetime.utcnow)
     
+    # "name sku supplier category", maintained by App.curd.product_search and
+    # indexed per backend (see PRODUCT_SEARCH_DDL below)
+    search_text = Column(String(320))
+
     # Foreign keys - define BEFORE relationships
     supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
@@ -25,4 +54,43 @@ class Product(Base):
     # Relationships - define AFTER foreign keys
     supplier = relationship("Supplier", back_populates="products", lazy="joined")
     category = relationship("Category", back_populates="products", lazy="joined")
-    inventory_transactions = relationship("InventoryTransaction", back_populates="product")
\ No newline at end of file
+    inventory_transactions = relationship("InventoryTransaction", back_populates="product")
+
+
+# Full-text index over products.search_text. Created with the table by
+# create_all; keep in sync with the alembic migrations that build it (0006,
+# and 0008 for SQLite's name column).
+PRODUCT_SEARCH_DDL = {
+    "sqlite": [
+        # External-content FTS5 table; the triggers mirror name and search_text
+        # into it. name is indexed on its own as well so searches can rank
+        # name matches above supplier/category ones (App.curd.product_search)
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+        "name, search_text, content='products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        # Indexed terms, used to find corrections for misspelled query words
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_search_vocab USING fts5vocab(product_search, 'row')",
+        "CREATE TRIGGER IF NOT EXISTS products_search_ai AFTER INSERT ON products BEGIN "
+        "INSERT INTO product_search(rowid, name, search_text) VALUES (new.id, new.name, new.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS products_search_ad AFTER DELETE ON products BEGIN "
+        "INSERT INTO product_search(product_search, rowid, name, search_text) "
+        "VALUES ('delete', old.id, old.name, old.search_text); END",
+        # name and search_text change in separate statements on a rename, so
+        # both fire it; each time the 'delete' gets exactly what was indexed
+        "CREATE TRIGGER IF NOT EXISTS products_search_au AFTER UPDATE OF name, search_text ON products BEGIN "
+        "INSERT INTO product_search(product_search, rowid, name, search_text) "
+        "VALUES ('delete', old.id, old.name, old.search_text); "
+        "INSERT INTO product_search(rowid, name, search_text) VALUES (new.id, new.name, new.search_text); END",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_products_search_text_trgm ON products USING gin (search_text gin_trgm_ops)",
+    ],
+    "mysql": [
+        "CREATE FULLTEXT INDEX ix_products_search_text_ft ON products (search_text)",
+    ],
+}
+
+for _dialect, _statements in PRODUCT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Product.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from App.database import Base
 from datetime import datetime
@@ -6,6 +6,10 @@ from datetime import datetime
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        # Keyset pagination order (see App.utils.pagination)
+        Index("ix_sales_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     invoice_number = Column(String(50), unique=True, nullable=False)
@@ -24,6 +28,11 @@ class Sale(Base):
 
 class SaleItem(Base):
     __tablename__ = "sale_items"
+    __table_args__ = (
+        # Loading a sale's lines, and per-product sales lookups
+        Index("ix_sale_items_sale_id", "sale_id"),
+        Index("ix_sale_items_product_id", "product_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sale_id = Column(Integer, ForeignKey("sales.id"), nullable=False)
@@ -31,6 +40,9 @@ class SaleItem(Base):
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
     total_price = Column(Float, nullable=False)
+    # The product's category when it was sold, which the category rollups
+    # are keyed by; not a foreign key, history outlives the category
+    category_id = Column(Integer)
     
     # Relationships
     sale = relationship("Sale", back_populates="sale_items")
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, Date
+from App.database import Base
+
+
+# Rollup key used for products without a category (key columns can't be NULL)
+UNCATEGORIZED = 0
+
+
+class DailyProductSales(Base):
+    """Units and revenue per product per (UTC) day, maintained by create_sale_transaction"""
+    __tablename__ = "daily_product_sales"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+
+class DailyCategorySales(Base):
+    """Units and revenue per category per day; category_id 0 means uncategorized"""
+    __tablename__ = "daily_category_sales"
+
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+
+class DailyPaymentSales(Base):
+    """Sale count and revenue per payment method per day; '' means not recorded"""
+    __tablename__ = "daily_payment_sales"
+
+    day = Column(Date, primary_key=True)
+    payment_method = Column(String(50), primary_key=True)
+    sale_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
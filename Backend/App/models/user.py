@@ -23,6 +23,9 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime)
+    # Carried in access tokens as "ver"; bumped when the role changes, which
+    # refuses the tokens issued before (in every worker, see routes/auth.py)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     transactions = relationship("InventoryTransaction", back_populates="user")
@@ -1,13 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi. security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+import secrets
+import time
 from pydantic import BaseModel
 from typing import Optional, List
 import hashlib
-from App.database import get_db
+import hmac
+import os
+from App.database import get_db, SessionLocal
 from App.models.user import User, UserRole
+from App.models.refresh_token import RefreshToken
+from App.schemas.auth import RefreshTokenRequest
+from App.utils.cache import TTLCache
+from App.utils import auth as password_hashing
+from App.utils.auth import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    create_access_token,
+    create_refresh_token,
+    verify_token,
+)
 
 router = APIRouter()
 
@@ -15,9 +34,21 @@ router = APIRouter()
 # SETTINGS
 # ═══════════════════════════════════════════════════════════════════
 
-SECRET_KEY = "your-secret-key-change-this-in-production"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+# SECRET_KEY, ALGORITHM and the token lifetimes come from App.utils.auth
+# (SECRET_KEY, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS env vars).
+# Access tokens are short-lived and carry role and active flag; /auth/refresh
+# re-reads the user. A role change or deletion bumps users.token_version and
+# refuses the user's older access tokens in every worker within
+# PRINCIPAL_CACHE_TTL seconds.
+# Refresh tokens are single use: each is recorded in refresh_tokens by its
+# jti and spent when swapped for a new pair.
+
+# Already-verified access tokens, so hot clients skip the JWT decode
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "4096"))
+# How long a worker trusts a verified token and a user's token version
+# before reading users.token_version again. This is the longest a role change
+# or deletion made through one worker takes to reach the others.
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -29,7 +60,9 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 class Token(BaseModel):
     access_token:  str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
+    expires_in: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
 
 
 class RegisterRequest(BaseModel):
@@ -62,6 +95,17 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class Principal(BaseModel):
+    """The authenticated caller, as seen by the role dependencies"""
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+
 class MessageResponse(BaseModel):
     message: str
     user_id: Optional[int] = None
@@ -73,61 +117,155 @@ class MessageResponse(BaseModel):
 # PASSWORD & TOKEN FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════
 
+def is_legacy_hash(hashed_password: str) -> bool:
+    """Unsalted SHA256 hex digest, how passwords were stored before bcrypt"""
+    return not hashed_password.startswith("$2")
+
+
+def _verify_legacy(plain_password: str, hashed_password: str) -> bool:
+    return hmac.compare_digest(hashlib.sha256(plain_password.encode()).hexdigest(), hashed_password)
+
+
 def hash_password(password: str) -> str:
-    """Hash password using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password using bcrypt (on the password hashing pool)"""
+    return password_hashing.hash_password(password)
 
 
 def verify_password(plain_password: str, hashed_password:  str) -> bool:
-    """Verify password against hash"""
-    return hash_password(plain_password) == hashed_password
+    """Verify password against a bcrypt or legacy SHA256 hash"""
+    if is_legacy_hash(hashed_password):
+        return _verify_legacy(plain_password, hashed_password)
+    return password_hashing.verify_password(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    if is_legacy_hash(hashed_password):
+        return _verify_legacy(plain_password, hashed_password)
+    return await password_hashing.verify_password_async(plain_password, hashed_password)
 
 
-def create_token(user_id: int, username: str, role: str) -> str:
-    """Create JWT token with user info"""
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    data = {
+def create_token(user_id: int, username: str, role: str, is_active: bool = True, token_version: int = 0) -> str:
+    """Create short-lived access token with user info"""
+    return create_access_token({
         "sub": str(user_id),
         "username":  username,
         "role": role,
-        "exp": expire
-    }
-    return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+        "active": is_active,
+        "ver": token_version,
+    })
+
+
+def create_token_pair(db: Session, user: User, family: Optional[str] = None) -> Token:
+    """
+    Access + refresh token for a user that just logged in (new family) or
+    refreshed (the spent token's family). Records the refresh token in the
+    session; the caller commits.
+    """
+    jti = secrets.token_hex(16)
+    lifetime = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(
+        jti=jti, family=family or jti, user_id=user.id, expires_at=datetime.utcnow() + lifetime,
+    ))
+    return Token(
+        access_token=create_token(user.id, user.username, user.role.value, user.is_active, user.token_version),
+        refresh_token=create_refresh_token({"sub": str(user.id), "jti": jti}, expires_delta=lifetime),
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════
+# PRINCIPAL CACHE
+# ═══════════════════════════════════════════════════════════════════
+
+# Keyed by the whole token, not just its signature: a cached signature would
+# otherwise vouch for any payload pasted in front of it
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+
+# user id -> users.token_version (None once the user is deleted). Access
+# tokens carrying an older "ver" are refused, so the client refreshes and
+# picks up the new role. A version rather than a timestamp: iat has one
+# second resolution, so a token issued in the same second as the change
+# would pass a time check.
+# The database is the shared record: every worker re-reads it at most
+# PRINCIPAL_CACHE_TTL seconds after its cached copy was loaded.
+_token_versions = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+_UNKNOWN = object()
+
+
+def invalidate_principal(user_id: int, token_version: Optional[int]) -> None:
+    """
+    Refuse a user's access tokens older than token_version in this worker
+    right away - call after bumping User.token_version (role change), or
+    with None after deleting the user. Other workers catch up from the
+    database within PRINCIPAL_CACHE_TTL.
+    """
+    _token_versions.set(user_id, token_version)
+    _principal_cache.discard_where(lambda _token, principal: principal.id == user_id)
+
+
+def _load_token_version(user_id: int) -> Optional[int]:
+    db = SessionLocal()
+    try:
+        return db.query(User.token_version).filter(User.id == user_id).scalar()
+    finally:
+        db.close()
+
+
+async def _is_revoked(payload: dict) -> bool:
+    user_id = int(payload["sub"])
+    current = _token_versions.get(user_id, _UNKNOWN)
+    if current is _UNKNOWN:
+        current = await run_in_threadpool(_load_token_version, user_id)
+        _token_versions.set(user_id, current)
+    return current is None or payload.get("ver", 0) < current
 
 
 # ═══════════════════════════════════════════════════════════════════
 # AUTHORIZATION FUNCTIONS - USE THESE IN YOUR ROUTES! 
 # ═══════════════════════════════════════════════════════════════════
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current logged-in user - ANY role can access"""
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Get current logged-in user - ANY role can access.
+
+    Built from the access token's claims, so it's async: it runs on the
+    event loop instead of taking a threadpool thread. The only DB read is
+    the user's token version, at most once per PRINCIPAL_CACHE_TTL per user.
+    """
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate":  "Bearer"},
     )
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None: 
+
+    principal = _principal_cache.get(token)
+    if principal is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            principal = Principal(
+                id=int(payload["sub"]),
+                username=payload["username"],
+                role=UserRole(payload["role"]),
+                is_active=payload["active"],
+            )
+        except (JWTError, KeyError, ValueError):
+            raise credentials_exception
+        if payload.get("type") != "access" or await _is_revoked(payload):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if user is None: 
-        raise credentials_exception
+        # Never keep a principal around longer than its token is valid
+        ttl = min(payload["exp"] - time.time(), PRINCIPAL_CACHE_TTL)
+        if ttl > 0:
+            _principal_cache.set(token, principal, ttl=ttl)
 
-    return user
+    if not principal.is_active:
+        raise HTTPException(status_code=403, detail="Inactive user")
+
+    return principal
 
 
-def get_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_admin_user(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """Only ADMIN can access"""
     if current_user.role. value != "admin": 
         raise HTTPException(
@@ -137,9 +275,9 @@ def get_admin_user(
     return current_user
 
 
-def get_manager_or_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_manager_or_admin(
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """ADMIN or MANAGER can access"""
     if current_user.role. value not in ["admin", "manager"]:
         raise HTTPException(
@@ -174,62 +312,167 @@ def get_role_enum(role_string: str) -> UserRole:
 # AUTH ROUTES - Public
 # ═══════════════════════════════════════════════════════════════════
 
+# register and login are async so that waiting on the hashing pool doesn't
+# hold a threadpool thread; their (quick) DB work runs in the threadpool.
+# The helpers end their transaction before returning, which hands the
+# connection back to the pool: a burst of logins waiting on bcrypt must not
+# also hold every DB connection.
+
+def _check_username_and_email_free(db: Session, username: str, email: str) -> None:
+    try:
+        # Check if username exists
+        if db.query(User).filter(User.username == username).first():
+            raise HTTPException(status_code=400, detail="Username already taken")
+
+        # Check if email exists
+        if db.query(User).filter(User.email == email).first():
+            raise HTTPException(status_code=400, detail="Email already registered")
+    finally:
+        db.rollback()
+
+
+def _find_user(db: Session, username: str) -> Optional[User]:
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        if user:
+            db.expunge(user)  # keeps its loaded attributes after the rollback
+        return user
+    finally:
+        db.rollback()
+
+
+def _set_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.query(User).filter(User.id == user_id).update({User.hashed_password: hashed_password})
+    db.commit()
+
+
+def _issue_token_pair(db: Session, user: User) -> Token:
+    """Start a new refresh token family, dropping the user's expired tokens"""
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user.id, RefreshToken.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    tokens = create_token_pair(db, user)
+    db.commit()
+    return tokens
+
+
+def _save(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
 @router.post("/register", response_model=UserResponse)
-def register(data: RegisterRequest, db: Session = Depends(get_db)):
+async def register(data: RegisterRequest, db: Session = Depends(get_db)):
     """Register a new user (default role: staff)"""
 
-    # Check if username exists
-    if db.query(User).filter(User.username == data.username).first():
-        raise HTTPException(status_code=400, detail="Username already taken")
-
-    # Check if email exists
-    if db.query(User).filter(User.email == data. email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
+    await run_in_threadpool(_check_username_and_email_free, db, data.username, data.email)
 
     # Create user with default role (staff)
     user = User(
         username=data.username,
         email=data. email,
-        hashed_password=hash_password(data. password),
+        hashed_password=await password_hashing.hash_password_async(data.password),
         full_name=data. full_name,
         role=UserRole.STAFF
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    return user
+    return await run_in_threadpool(_save, db, user)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data:  OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db)
 ):
     """Login and get access token"""
 
     # Find user by username
-    user = db.query(User).filter(User.username == form_data. username).first()
+    user = await run_in_threadpool(_find_user, db, form_data.username)
 
     # Validate credentials
-    if not user or not verify_password(form_data.password, user. hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=401, 
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create and return token
-    token = create_token(user.id, user. username, user.role.value)
+    # Upgrade a legacy SHA256 hash now that we know the password
+    if is_legacy_hash(user.hashed_password):
+        new_hash = await password_hashing.hash_password_async(form_data.password)
+        await run_in_threadpool(_set_password_hash, db, user.id, new_hash)
 
-    return Token(access_token=token)
+    # Create and return tokens
+    return await run_in_threadpool(_issue_token_pair, db, user)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(data: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """
+    Swap a refresh token for a new access/refresh pair.
+
+    This is where role changes and deactivation reach the client: the user
+    is read again, so the new access token carries its current role.
+
+    The presented token is spent. Presenting a spent token again means it
+    was copied, so every refresh token from the same login is revoked and
+    both holders have to log in again; access tokens already issued run
+    out on their own.
+    """
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    payload = verify_token(data.refresh_token)
+    if not payload or payload.get("type") != "refresh" or not payload.get("sub") or not payload.get("jti"):
+        raise credentials_exception
+
+    stored = db.get(RefreshToken, payload["jti"])
+    if stored is None or stored.user_id != int(payload["sub"]):
+        raise credentials_exception
+
+    # Conditional, so two concurrent swaps of the same token can't both win
+    now = datetime.utcnow()
+    spent = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.jti == stored.jti, RefreshToken.used_at.is_(None))
+        .values(used_at=now)
+    ).rowcount
+    if spent != 1:
+        db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family == stored.family, RefreshToken.used_at.is_(None))
+            .values(used_at=now)
+        )
+        db.commit()
+        raise credentials_exception
+
+    user = db.query(User).filter(User.id == stored.user_id).first()
+    if user is None:
+        raise credentials_exception
+    if not user.is_active:
+        db.commit()
+        raise HTTPException(status_code=403, detail="Inactive user")
+
+    tokens = create_token_pair(db, user, family=stored.family)
+    db.commit()
+    return tokens
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user:  User = Depends(get_current_user)):
+def get_me(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """Get current user profile"""
-    return current_user
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -239,7 +482,7 @@ def get_me(current_user:  User = Depends(get_current_user)):
 @router.get("/users", response_model=List[UserResponse])
 def list_users(
     db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """List all users (Admin only)"""
     users = db.query(User).order_by(User. id).all()
@@ -250,7 +493,7 @@ def list_users(
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """Get a specific user by ID (Admin only)"""
     user = db. query(User).filter(User.id == user_id).first()
@@ -263,7 +506,7 @@ def get_user(
 def create_user(
     data: CreateUserRequest,
     db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """Create a new user with specified role (Admin only)"""
 
@@ -299,7 +542,7 @@ def change_user_role(
     user_id: int,
     role_data: RoleUpdateRequest,
     db:  Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """Change a user's role (Admin only) - Using request body"""
 
@@ -323,8 +566,10 @@ def change_user_role(
 
     # Update role
     user. role = role_enum
+    user.token_version += 1
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id, user.token_version)
 
     return MessageResponse(
         message=f"User '{user.username}' role changed from '{old_role}' to '{new_role}'",
@@ -339,7 +584,7 @@ def change_user_role_query(
     user_id: int,
     role:  str = Query(..., description="New role:  admin, manager, or staff"),
     db: Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """Change a user's role (Admin only) - Using query parameter"""
 
@@ -360,8 +605,10 @@ def change_user_role_query(
 
     # Update role
     user.role = role_enum
+    user.token_version += 1
     db.commit()
     db.refresh(user)
+    invalidate_principal(user.id, user.token_version)
 
     return MessageResponse(
         message=f"User '{user.username}' role changed from '{old_role}' to '{role}'",
@@ -375,7 +622,7 @@ def change_user_role_query(
 def delete_user(
     user_id: int,
     db:  Session = Depends(get_db),
-    admin: User = Depends(get_admin_user)
+    admin: Principal = Depends(get_admin_user)
 ):
     """Delete a user (Admin only)"""
 
@@ -391,9 +638,10 @@ def delete_user(
     # Store username for message
     username = user.username
 
-    # Delete user
+    # Delete user (its refresh tokens go with it)
     db.delete(user)
     db.commit()
+    invalidate_principal(user_id, None)
 
     return MessageResponse(
         message=f"User '{username}' has been deleted",
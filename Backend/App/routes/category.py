@@ -5,7 +5,10 @@ from sqlalchemy.orm import Session
 from App. schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
 from App.curd import category as category_crud
 from App.database import get_db
-from App.utils. dependencies import PaginationParams
+from App.utils. dependencies import PaginationParams, ReadSession, read_db, run_read
+from App.utils.http_cache import read_etag
+from App.utils.responses import ListSerializer
+from App.curd.catalog_version import CATEGORIES
 
 # Import auth functions
 from App.routes.auth import get_current_user, get_admin_user, get_manager_or_admin
@@ -13,24 +16,34 @@ from App.models.user import User
 
 router = APIRouter()
 
+# ETag / 304 handling for the reads below
+category_etag = read_etag("categories", CATEGORIES)
+category_list_json = ListSerializer(CategoryResponse)
+
 
 # VIEW - Any logged-in user
 @router.get("/categories", response_model=List[CategoryResponse])
-def api_list_categories(
+async def api_list_categories(
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
-    current_user:  User = Depends(get_current_user)
+    db: ReadSession = Depends(read_db("categories")),
+    current_user: User = Depends(get_current_user),
+    etag: dict = Depends(category_etag)
 ):
-    return category_crud.get_categories(db, skip=pagination.skip, limit=pagination. limit)
+    categories = await run_read(
+        db, category_crud.get_categories, category_crud.get_categories_async,
+        skip=pagination.skip, limit=pagination.limit,
+    )
+    return category_list_json.response(categories, headers=etag)
 
 
 @router.get("/categories/{category_id}", response_model=CategoryResponse)
-def api_get_category(
-    category_id:  int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def api_get_category(
+    category_id: int,
+    db: ReadSession = Depends(read_db("categories")),
+    current_user: User = Depends(get_current_user),
+    etag: dict = Depends(category_etag)
 ):
-    cat = category_crud. get_category(db, category_id)
+    cat = await run_read(db, category_crud.get_category, category_crud.get_category_async, category_id)
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
     return cat
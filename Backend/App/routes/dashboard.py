@@ -0,0 +1,31 @@
+import os
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from App.schemas.dashboard import DashboardSummary
+from App.curd.dashboard import get_dashboard_summary
+from App.database import get_db
+from App.utils.cache import TTLCache
+
+from App.routes.auth import get_current_user
+from App.models.user import User
+
+router = APIRouter()
+
+# Shared by every open dashboard; numbers may lag writes by up to the TTL
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+_summary_cache = TTLCache(maxsize=1, ttl=DASHBOARD_CACHE_TTL_SECONDS)
+
+
+# VIEW - Any logged-in user
+@router.get("/dashboard/summary", response_model=DashboardSummary)
+def api_dashboard_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Headline inventory and sales numbers (All roles)"""
+    summary = _summary_cache.get("summary")
+    if summary is None:
+        summary = get_dashboard_summary(db)
+        _summary_cache.set("summary", summary)
+    return summary
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Callable, Iterator, Literal, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from App.curd.export import (
+    iter_sales_export, iter_sale_items_export, iter_inventory_transactions_export,
+    SALE_EXPORT_FIELDS, SALE_ITEM_EXPORT_FIELDS, INVENTORY_EXPORT_FIELDS
+)
+from App.database import SessionLocal
+from App.utils.streaming import csv_chunks, ndjson_chunks, gzip_chunks
+
+from App.routes.auth import get_manager_or_admin
+from App.models.user import User
+
+router = APIRouter()
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+class ExportParams:
+    """Common query parameters for the export endpoints"""
+
+    def __init__(
+        self,
+        start: Optional[datetime] = Query(None, description="Include rows created at or after this time"),
+        end: Optional[datetime] = Query(None, description="Include rows created before this time"),
+        format: Literal["csv", "ndjson"] = Query("csv"),
+        gzip: bool = Query(False, description="Compress the download on the fly"),
+    ):
+        if start is not None and end is not None and start >= end:
+            raise HTTPException(status_code=400, detail="start must be before end")
+        self.start = start
+        self.end = end
+        self.format = format
+        self.gzip = gzip
+
+
+def _export_response(name: str, iter_rows: Callable, fields: Sequence[str], params: ExportParams) -> StreamingResponse:
+    """
+    Stream an export. The generator opens its own session, because it keeps
+    reading from the database after the endpoint (and get_db) has returned.
+    """
+    def body() -> Iterator:
+        db = SessionLocal()
+        try:
+            rows = iter_rows(db, start=params.start, end=params.end)
+            chunks = csv_chunks(rows, fields) if params.format == "csv" else ndjson_chunks(rows)
+            if params.gzip:
+                yield from gzip_chunks(chunks)
+            else:
+                for chunk in chunks:
+                    yield chunk.encode("utf-8")
+        finally:
+            db.close()
+
+    filename = f"{name}.{params.format}"
+    media_type = MEDIA_TYPES[params.format]
+    if params.gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# EXPORTS - Admin or Manager
+@router.get("/export/sales")
+def api_export_sales(
+    params: ExportParams = Depends(),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Stream every sale in the date range as CSV or NDJSON (Admin/Manager)"""
+    return _export_response("sales", iter_sales_export, SALE_EXPORT_FIELDS, params)
+
+
+@router.get("/export/sale-items")
+def api_export_sale_items(
+    params: ExportParams = Depends(),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Stream the line items of every sale in the date range (Admin/Manager)"""
+    return _export_response("sale_items", iter_sale_items_export, SALE_ITEM_EXPORT_FIELDS, params)
+
+
+@router.get("/export/inventory-transactions")
+def api_export_inventory_transactions(
+    params: ExportParams = Depends(),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Stream the inventory ledger for the date range (Admin/Manager)"""
+    return _export_response(
+        "inventory_transactions", iter_inventory_transactions_export, INVENTORY_EXPORT_FIELDS, params
+    )
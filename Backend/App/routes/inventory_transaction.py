@@ -2,12 +2,20 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from App.schemas import InventoryTransactionCreate, InventoryTransactionResponse
+from App.schemas import (
+    InventoryTransactionCreate, InventoryTransactionResponse,
+    InventoryTransactionBatchCreate, InventoryTransactionBatchResult
+)
 from App.curd.inventory_transaction import (
-    create_inventory_transaction, get_inventory_transactions, get_inventory_transaction
+    create_inventory_transaction, get_inventory_transactions, get_inventory_transaction,
+    get_inventory_transactions_page,
+    get_inventory_transactions_async, get_inventory_transaction_async,
+    create_inventory_transactions_batch
 )
 from App.database import get_db
-from App.utils.dependencies import PaginationParams
+from App.utils.dependencies import PaginationParams, CursorParams, ReadSession, read_db, run_read
+from App.schemas.pagination import CursorPage
+from App.utils.responses import ListSerializer
 
 # Import auth functions
 from App.routes.auth import get_current_user, get_admin_user, get_manager_or_admin
@@ -15,24 +23,44 @@ from App.models. user import User
 
 router = APIRouter()
 
+inventory_transaction_list_json = ListSerializer(InventoryTransactionResponse)
+
 
 # VIEW - Any logged-in user
+@router.get("/inventory-transactions/page", response_model=CursorPage[InventoryTransactionResponse])
+def api_list_inventory_transactions_page(
+    pagination: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List inventory transactions, newest first, using cursor pagination"""
+    try:
+        items, next_cursor = get_inventory_transactions_page(db, cursor=pagination.cursor, limit=pagination.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
 @router.get("/inventory-transactions", response_model=List[InventoryTransactionResponse])
-def api_list_inventory_transactions(
+async def api_list_inventory_transactions(
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
+    db: ReadSession = Depends(read_db("inventory")),
     current_user: User = Depends(get_current_user)
 ):
-    return get_inventory_transactions(db, skip=pagination.skip, limit=pagination. limit)
+    transactions = await run_read(
+        db, get_inventory_transactions, get_inventory_transactions_async,
+        skip=pagination.skip, limit=pagination.limit,
+    )
+    return inventory_transaction_list_json.response(transactions)
 
 
 @router.get("/inventory-transactions/{tx_id}", response_model=InventoryTransactionResponse)
-def api_get_inventory_transaction(
-    tx_id:  int,
-    db: Session = Depends(get_db),
+async def api_get_inventory_transaction(
+    tx_id: int,
+    db: ReadSession = Depends(read_db("inventory")),
     current_user: User = Depends(get_current_user)
 ):
-    tx = get_inventory_transaction(db, tx_id)
+    tx = await run_read(db, get_inventory_transaction, get_inventory_transaction_async, tx_id)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return tx
@@ -49,4 +77,20 @@ def api_create_inventory_transaction(
         tx = create_inventory_transaction(db, tx_in)
         return tx
     except ValueError as e: 
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/inventory-transactions/batch", response_model=InventoryTransactionBatchResult, status_code=201)
+def api_create_inventory_transactions_batch(
+    batch: InventoryTransactionBatchCreate,
+    db: Session = Depends(get_db),
+    manager: User = Depends(get_manager_or_admin)
+):
+    """Post many stock movements in one atomic transaction (e.g. receiving a delivery)"""
+    try:
+        created, errors = create_inventory_transactions_batch(
+            db, batch.items, best_effort=batch.mode == "best_effort"
+        )
+        return {"created": created, "errors": errors}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,14 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import os
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from App.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from App.schemas.product import ProductCreate, ProductResponse, ProductUpdate, BulkImportResult, LowStockChange
+from App.schemas.pagination import CursorPage
 from App.curd.product import (
-    create_product, get_product, get_products,
-    update_product, delete_product
+    create_product, get_product,
+    update_product, delete_product,
+    get_product_async, bulk_create_products,
+    get_low_stock_changes,
+    get_product_rows, get_product_rows_async
 )
+from App.curd.product_search import search_products
 from App.database import get_db
-from App.utils.dependencies import PaginationParams
+from App.utils.dependencies import PaginationParams, CursorParams, ReadSession, read_db, run_read
+from App.utils.streaming import aiter_lines, aiter_csv_rows
+from App.utils.http_cache import CatalogETag, read_etag
+from App.utils.responses import ListSerializer
+from App.curd.catalog_version import PRODUCTS, SUPPLIERS, CATEGORIES
 
 # Import auth functions
 from App. routes.auth import get_current_user, get_admin_user, get_manager_or_admin
@@ -16,30 +29,94 @@ from App.models.user import User
 
 router = APIRouter()
 
+# Rows validated and inserted per transaction by POST /products/bulk
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "500"))
+# Row errors listed in its response (the first ones by row); `failed` counts them all
+BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", "100"))
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+# Product responses embed supplier and category names, so their ETags
+# change with any of the three tables
+product_etag = CatalogETag(PRODUCTS, SUPPLIERS, CATEGORIES)
+# The list and detail routes read through the async engine when
+# ASYNC_DB_ROUTERS includes products; their ETag uses the same session
+product_read_etag = read_etag("products", PRODUCTS, SUPPLIERS, CATEGORIES)
+# List pages are built from plain rows and encoded in one pass
+product_list_json = ListSerializer(ProductResponse)
+
 
 # ═══════════════════════════════════════════════════════════════════
 # VIEW - Anyone logged in can view
 # ═══════════════════════════════════════════════════════════════════
 
-@router. get("/products", response_model=List[ProductResponse])
-def api_list_products(
+# Declared before /products/{product_id} so the paths don't collide
+@router.get("/products/low-stock", response_model=List[ProductResponse])
+def api_list_low_stock_products(
     pagination: PaginationParams = Depends(),
     db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),  # Any logged-in user
+    etag: dict = Depends(product_etag)
+):
+    """Products at or below their reorder level (All roles)"""
+    return product_list_json.response(
+        get_product_rows(db, skip=pagination.skip, limit=pagination.limit, low_stock_only=True), headers=etag
+    )
+
+
+@router.get("/products/search", response_model=List[ProductResponse])
+def api_search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to match in name, SKU, supplier or category"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Any logged-in user
 ):
-    """List all products (All roles)"""
-    products = get_products(db, skip=pagination.skip, limit=pagination. limit)
-    return products
+    """Search products by prefix, substring or close spelling, best match first (All roles)"""
+    return search_products(db, q, limit=limit)
 
 
-@router. get("/products/{product_id}", response_model=ProductResponse)
-def api_get_product(
-    product_id: int,
+@router.get("/products/low-stock/changes", response_model=CursorPage[LowStockChange])
+def api_low_stock_changes(
+    since: Optional[datetime] = Query(None, description="Start of the feed when no cursor is given"),
+    pagination: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Any logged-in user
+):
+    """
+    Feed of products entering or leaving low stock, oldest first (All roles).
+    Poll with the returned next_cursor to receive only newer changes.
+    Changes show up after a few seconds' settle delay (LOW_STOCK_FEED_SETTLE_SECONDS).
+    """
+    try:
+        products, next_cursor = get_low_stock_changes(
+            db, since=since, cursor=pagination.cursor, limit=pagination.limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CursorPage[LowStockChange](items=products, next_cursor=next_cursor)
+
+
+@router.get("/products", response_model=List[ProductResponse])
+async def api_list_products(
+    pagination: PaginationParams = Depends(),
+    db: ReadSession = Depends(read_db("products")),
+    current_user: User = Depends(get_current_user),  # Any logged-in user
+    etag: dict = Depends(product_read_etag)
+):
+    """List all products (All roles)"""
+    rows = await run_read(db, get_product_rows, get_product_rows_async, skip=pagination.skip, limit=pagination.limit)
+    return product_list_json.response(rows, headers=etag)
+
+
+@router.get("/products/{product_id}", response_model=ProductResponse)
+async def api_get_product(
+    product_id: int,
+    db: ReadSession = Depends(read_db("products")),
+    current_user: User = Depends(get_current_user),  # Any logged-in user
+    etag: dict = Depends(product_read_etag)
 ):
     """Get product by ID (All roles)"""
-    product = get_product(db, product_id)
+    product = await run_read(db, get_product, get_product_async, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -63,6 +140,94 @@ def api_create_product(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/products/bulk", response_model=BulkImportResult)
+async def api_bulk_import_products(
+    request: Request,
+    db: Session = Depends(get_db),
+    manager: User = Depends(get_manager_or_admin)  # Manager or Admin only! 
+):
+    """
+    Bulk-create products from a streamed UTF-8 CSV (header row first; quoted
+    fields may span lines) or NDJSON body, one record per line (Manager/Admin only).
+    Rows are processed in chunks; bad rows are reported and skipped, good rows
+    are committed chunk by chunk. The response lists the first
+    BULK_IMPORT_MAX_ERRORS bad rows and counts all of them in `failed`.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in CSV_CONTENT_TYPES | NDJSON_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson")
+
+    records = _csv_records if content_type in CSV_CONTENT_TYPES else _ndjson_records
+    total_rows = 0
+    created = 0
+    failed = 0
+    errors = []
+    chunk = []
+
+    def report(row_errors):
+        nonlocal failed, errors
+        failed += len(row_errors)
+        errors.extend(row_errors)
+        if len(errors) > 2 * BULK_IMPORT_MAX_ERRORS:
+            errors = sorted(errors, key=lambda e: e["row"])[:BULK_IMPORT_MAX_ERRORS]
+
+    async def flush():
+        nonlocal created, chunk
+        n, chunk_errors = await run_in_threadpool(bulk_create_products, db, chunk)
+        created += n
+        report(chunk_errors)
+        chunk = []
+
+    async for raw in records(aiter_lines(request.stream())):
+        total_rows += 1
+        if not isinstance(raw, dict):
+            report([{"row": total_rows, "sku": None, "error": "Malformed row"}])
+            continue
+        chunk.append((total_rows, raw))
+        if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+
+    errors.sort(key=lambda e: e["row"])
+    return BulkImportResult(
+        total_rows=total_rows, created=created, failed=failed, errors=errors[:BULK_IMPORT_MAX_ERRORS]
+    )
+
+
+async def _csv_records(lines):
+    """
+    Rows of a CSV body as dicts keyed by its header row; None for a row that
+    can't be read or doesn't have one cell per header column
+    """
+    header = None
+    async for values in aiter_csv_rows(lines):
+        if values is not None and not any(v.strip() for v in values):
+            continue
+        if header is None:
+            if values is None:
+                raise HTTPException(status_code=400, detail="Unreadable CSV header row")
+            header = [h.strip() for h in values]
+            continue
+        if values is None or len(values) != len(header):
+            yield None
+            continue
+        # Empty cells fall back to the schema defaults
+        yield {k: v for k, v in zip(header, values) if v != ""}
+
+
+async def _ndjson_records(lines):
+    """Records of an NDJSON body; None for a line that isn't valid JSON"""
+    async for line in lines:
+        if line is not None and not line.strip():
+            continue
+        try:
+            raw = json.loads(line) if line is not None else None
+        except ValueError:
+            raw = None
+        yield raw
+
+
 @router.patch("/products/{product_id}", response_model=ProductResponse)
 def api_update_product(
     product_id: int,
@@ -95,7 +260,10 @@ def api_delete_product(
     admin: User = Depends(get_admin_user)  # Admin only!
 ):
     """Delete a product (Admin only)"""
-    deleted = delete_product(db, product_id)
-    if not deleted:
-        raise HTTPException(status_code=404, detail="Product not found")
+    try:
+        delete_product(db, product_id)
+    except ValueError as e:
+        # Sold or stock-moved products are still referenced by foreign keys
+        status_code = 404 if str(e) == "Product not found" else 409
+        raise HTTPException(status_code=status_code, detail=str(e))
     return None
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from App.schemas.report import RevenuePoint, ProductRevenue, CategoryRevenue, PaymentMethodRevenue
+from App.curd.sales_rollup import (
+    get_revenue_series, get_revenue_by_product, get_revenue_by_category, get_revenue_by_payment_method
+)
+from App.database import get_db
+
+from App.routes.auth import get_manager_or_admin
+from App.models.user import User
+
+router = APIRouter()
+
+
+class DateRangeParams:
+    """Inclusive [start, end] day range for the reports; open-ended when omitted"""
+
+    def __init__(
+        self,
+        start: Optional[date] = Query(None, description="First day to include"),
+        end: Optional[date] = Query(None, description="Last day to include"),
+    ):
+        if start is not None and end is not None and start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        self.start = start
+        self.end = end
+
+
+# REPORTS - Admin or Manager (read from the daily rollup tables)
+@router.get("/reports/revenue", response_model=List[RevenuePoint])
+def api_revenue_series(
+    interval: Literal["day", "month"] = Query("day"),
+    dates: DateRangeParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Sale count and revenue per day or month (Admin/Manager)"""
+    return get_revenue_series(db, start=dates.start, end=dates.end, interval=interval)
+
+
+@router.get("/reports/revenue/by-product", response_model=List[ProductRevenue])
+def api_revenue_by_product(
+    limit: int = Query(50, ge=1, le=1000),
+    dates: DateRangeParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Best-selling products by revenue (Admin/Manager)"""
+    return get_revenue_by_product(db, start=dates.start, end=dates.end, limit=limit)
+
+
+@router.get("/reports/revenue/by-category", response_model=List[CategoryRevenue])
+def api_revenue_by_category(
+    dates: DateRangeParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Revenue per category (Admin/Manager)"""
+    return get_revenue_by_category(db, start=dates.start, end=dates.end)
+
+
+@router.get("/reports/revenue/by-payment-method", response_model=List[PaymentMethodRevenue])
+def api_revenue_by_payment_method(
+    dates: DateRangeParams = Depends(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_manager_or_admin)
+):
+    """Sale count and revenue per payment method (Admin/Manager)"""
+    return get_revenue_by_payment_method(db, start=dates.start, end=dates.end)
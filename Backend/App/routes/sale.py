@@ -1,76 +1,97 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError
 
 from App.schemas import SaleTransactionCreate, SaleTransactionResponse
-from App.schemas.sale import SaleWithDetails, SaleItemResponse
-from App. curd.sale import create_sale_transaction, get_sales, get_sale
+from App.schemas.sale import SaleWithDetails, SaleItemResponse, ProductInSaleItem
+from App. curd.sale import (
+    create_sale_transaction, get_sales_with_details, get_sale_with_details, get_sales_page,
+    get_sales_with_details_async, get_sale_with_details_async
+)
 from App.database import get_db
-from App.utils.dependencies import PaginationParams
-from App.models.sale import Sale, SaleItem
-from App.models.product import Product
+from App.utils.dependencies import PaginationParams, CursorParams, ReadSession, read_db, run_read
+from App.utils.responses import ListSerializer
+from App.schemas.pagination import CursorPage
+from App.models.sale import Sale
 
 from App.routes.auth import get_current_user, get_admin_user, get_manager_or_admin
 from App.models.user import User
 
 router = APIRouter()
 
+sale_list_json = ListSerializer(SaleWithDetails)
 
-def build_sale_response(sale: Sale, db: Session) -> dict:
-    """Build sale response with items and product details"""
-    sale_items = []
-    
-    for item in sale.sale_items:
-        product = db.query(Product).filter(Product.id == item. product_id).first()
-        sale_items.append({
-            "id":  item.id,
-            "product_id": item.product_id,
-            "quantity": item.quantity,
-            "unit_price": float(item.unit_price),
-            "total_price": float(item.total_price),
-            "product":  {
-                "id":  product.id,
-                "name": product.name,
-                "sku": product. sku
-            } if product else None
-        })
-    
-    return {
-        "id": sale. id,
-        "invoice_number": sale.invoice_number,
-        "customer_name": sale. customer_name,
-        "customer_email": sale.customer_email,
-        "customer_phone": sale.customer_phone,
-        "payment_method": sale.payment_method,
-        "total_amount":  float(sale.total_amount),
-        "user_id": sale. user_id,
-        "created_at": sale.created_at,
-        "sale_items": sale_items
-    }
 
+def build_sale_response(sale: Sale) -> SaleWithDetails:
+    """Build sale response from a sale loaded with get_sale(s)_with_details"""
+    sale_items = [
+        SaleItemResponse(
+            id=item.id,
+            product_id=item.product_id,
+            quantity=item.quantity,
+            unit_price=float(item.unit_price),
+            total_price=float(item.total_price),
+            product=ProductInSaleItem.model_validate(item.product) if item.product else None,
+        )
+        for item in sale.sale_items
+    ]
 
-@router.get("/sales", response_model=List[dict])
-def api_list_sales(
-    pagination: PaginationParams = Depends(),
+    return SaleWithDetails(
+        id=sale.id,
+        invoice_number=sale.invoice_number,
+        customer_name=sale.customer_name,
+        customer_email=sale.customer_email,
+        customer_phone=sale.customer_phone,
+        payment_method=sale.payment_method,
+        total_amount=float(sale.total_amount),
+        user_id=sale.user_id,
+        created_at=sale.created_at,
+        sale_items=sale_items,
+    )
+
+
+@router.get("/sales/page", response_model=CursorPage[SaleWithDetails])
+def api_list_sales_page(
+    pagination: CursorParams = Depends(),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
+):
+    """Get sales with items, newest first, using cursor pagination"""
+    try:
+        sales, next_cursor = get_sales_page(db, cursor=pagination.cursor, limit=pagination.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CursorPage[SaleWithDetails](
+        items=[build_sale_response(sale) for sale in sales],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/sales", response_model=List[SaleWithDetails])
+async def api_list_sales(
+    pagination: PaginationParams = Depends(),
+    db: ReadSession = Depends(read_db("sales")),
+    current_user: User = Depends(get_current_user)
 ):
     """Get all sales with items"""
-    sales = get_sales(db, skip=pagination.skip, limit=pagination. limit)
-    return [build_sale_response(sale, db) for sale in sales]
+    sales = await run_read(
+        db, get_sales_with_details, get_sales_with_details_async, skip=pagination.skip, limit=pagination.limit
+    )
+    return sale_list_json.response([build_sale_response(sale) for sale in sales])
 
 
-@router.get("/sales/{sale_id}", response_model=dict)
-def api_get_sale(
-    sale_id:  int,
-    db: Session = Depends(get_db),
+@router.get("/sales/{sale_id}", response_model=SaleWithDetails)
+async def api_get_sale(
+    sale_id: int,
+    db: ReadSession = Depends(read_db("sales")),
     current_user: User = Depends(get_current_user)
 ):
     """Get single sale with items"""
-    sale = get_sale(db, sale_id)
+    sale = await run_read(db, get_sale_with_details, get_sale_with_details_async, sale_id)
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
-    return build_sale_response(sale, db)
+    return build_sale_response(sale)
 
 
 @router.post("/sales", response_model=SaleTransactionResponse, status_code=201)
@@ -84,4 +105,7 @@ def api_create_sale(
         res = create_sale_transaction(db, sale_in, user_id=manager. id)
         return res
     except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    except OperationalError:
+        # Lock wait timed out ("database is locked" on SQLite); nothing was written
+        raise HTTPException(status_code=503, detail="Database busy, please retry", headers={"Retry-After": "1"})
\ No newline at end of file
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 
 from App.schemas import SupplierCreate, SupplierResponse, SupplierUpdate
 from App. curd. supplier import (
-    Create_supplier, get_supplier, get_suppliers, delete_supplier, update_supplier
+    Create_supplier, get_supplier, get_suppliers, delete_supplier, update_supplier,
+    get_supplier_async, get_suppliers_async
 )
 from App.database import get_db
-from App.utils. dependencies import PaginationParams
+from App.utils. dependencies import PaginationParams, ReadSession, read_db, run_read
+from App.utils.http_cache import read_etag
+from App.utils.responses import ListSerializer
+from App.curd.catalog_version import SUPPLIERS
 
 # Import auth functions
 from App.routes.auth import get_current_user, get_admin_user, get_manager_or_admin
@@ -15,24 +19,31 @@ from App.models.user import User
 
 router = APIRouter()
 
+# ETag / 304 handling for the reads below
+supplier_etag = read_etag("suppliers", SUPPLIERS)
+supplier_list_json = ListSerializer(SupplierResponse)
+
 
 # VIEW - Any logged-in user
 @router.get("/suppliers", response_model=List[SupplierResponse])
-def api_list_suppliers(
+async def api_list_suppliers(
     pagination: PaginationParams = Depends(),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: ReadSession = Depends(read_db("suppliers")),
+    current_user: User = Depends(get_current_user),
+    etag: dict = Depends(supplier_etag)
 ):
-    return get_suppliers(db, skip=pagination.skip, limit=pagination. limit)
+    suppliers = await run_read(db, get_suppliers, get_suppliers_async, skip=pagination.skip, limit=pagination.limit)
+    return supplier_list_json.response(suppliers, headers=etag)
 
 
 @router.get("/suppliers/{supplier_id}", response_model=SupplierResponse)
-def api_get_supplier(
+async def api_get_supplier(
     supplier_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: ReadSession = Depends(read_db("suppliers")),
+    current_user: User = Depends(get_current_user),
+    etag: dict = Depends(supplier_etag)
 ):
-    supplier = get_supplier(db, supplier_id)
+    supplier = await run_read(db, get_supplier, get_supplier_async, supplier_id)
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return supplier
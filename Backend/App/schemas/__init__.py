@@ -8,6 +8,8 @@ from .product import (
     ProductCreate, 
     ProductUpdate, 
     ProductResponse,
+    BulkImportRowError,
+    BulkImportResult,
 )
 
 # Supplier schemas
@@ -56,6 +58,9 @@ from .inventory_transaction import (
     InventoryTransactionUpdate,
     InventoryTransactionResponse,
     InventoryTransactionWithDetails,
+    InventoryTransactionBatchCreate,
+    InventoryTransactionBatchError,
+    InventoryTransactionBatchResult,
     TransactionType
 )
 
@@ -84,6 +89,12 @@ from . sale_transaction import (
     SaleItemInput
 )
 
+# Dashboard schemas
+from .dashboard import DashboardSummary
+
+# Report schemas
+from .report import RevenuePoint, ProductRevenue, CategoryRevenue, PaymentMethodRevenue
+
 # Rebuild models for forward references
 try:
     SaleItemResponse.model_rebuild()
@@ -99,6 +110,8 @@ __all__ = [
     "ProductCreate",
     "ProductUpdate",
     "ProductResponse",
+    "BulkImportRowError",
+    "BulkImportResult",
     
     # Supplier
     "SupplierBase",
@@ -137,6 +150,9 @@ __all__ = [
     "InventoryTransactionUpdate",
     "InventoryTransactionResponse",
     "InventoryTransactionWithDetails",
+    "InventoryTransactionBatchCreate",
+    "InventoryTransactionBatchError",
+    "InventoryTransactionBatchResult",
     "TransactionType",
     
     # Sale
@@ -157,4 +173,13 @@ __all__ = [
     "SaleTransactionCreate",
     "SaleTransactionResponse",
     "SaleItemInput",
+
+    # Dashboard
+    "DashboardSummary",
+
+    # Reports
+    "RevenuePoint",
+    "ProductRevenue",
+    "CategoryRevenue",
+    "PaymentMethodRevenue",
 ]
\ No newline at end of file
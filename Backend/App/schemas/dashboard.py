@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class DashboardSummary(BaseModel):
+    total_products: int
+    low_stock_count: int
+    total_categories: int
+    total_suppliers: int
+    total_sales: int
+    total_revenue: float
+    total_inventory_value: float
+    total_transactions: int
+    generated_at: datetime
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, List, Literal, TYPE_CHECKING
 from datetime import datetime
 from enum import Enum
 
@@ -51,6 +51,26 @@ class InventoryTransactionResponse(InventoryTransactionBase):
         from_attributes = True
 
 
+# For POST /inventory-transactions/batch
+class InventoryTransactionBatchCreate(BaseModel):
+    items: List[InventoryTransactionCreate] = Field(..., min_length=1, max_length=1000)
+    mode: Literal["all_or_nothing", "best_effort"] = Field(
+        "all_or_nothing",
+        description="all_or_nothing rejects the whole batch on any bad item; best_effort skips bad items"
+    )
+
+
+class InventoryTransactionBatchError(BaseModel):
+    index: int
+    product_id: int
+    error: str
+
+
+class InventoryTransactionBatchResult(BaseModel):
+    created: List[InventoryTransactionResponse] = []
+    errors: List[InventoryTransactionBatchError] = []
+
+
 # With related data (product and user info)
 if TYPE_CHECKING:
     from .product import ProductResponse
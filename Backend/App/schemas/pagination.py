@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a cursor-paginated listing; pass next_cursor back to get the next page"""
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 
@@ -57,6 +57,7 @@ class ProductResponse(BaseModel):
     reorder_level: int
     supplier_id: int
     category_id: Optional[int] = None
+    is_low_stock: bool = False
     created_at: datetime
     updated_at: datetime
     
@@ -65,4 +66,33 @@ class ProductResponse(BaseModel):
     category: Optional[CategoryInProduct] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# For GET /products/low-stock/changes
+class LowStockChange(BaseModel):
+    id: int
+    name: str
+    sku: str
+    quantity: int
+    reorder_level: Optional[int] = None
+    is_low_stock: bool
+    low_stock_changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# For POST /products/bulk
+class BulkImportRowError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    total_rows: int
+    created: int
+    failed: int
+    # The first BULK_IMPORT_MAX_ERRORS failed rows; `failed` counts them all
+    errors: List[BulkImportRowError] = []
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+
+class RevenuePoint(BaseModel):
+    period: date  # the day, or the first day of the month
+    sale_count: int
+    revenue: float
+
+
+class ProductRevenue(BaseModel):
+    product_id: int
+    name: Optional[str] = None
+    sku: Optional[str] = None
+    quantity: int
+    revenue: float
+
+
+class CategoryRevenue(BaseModel):
+    category_id: Optional[int] = None
+    name: Optional[str] = None
+    quantity: int
+    revenue: float
+
+
+class PaymentMethodRevenue(BaseModel):
+    payment_method: Optional[str] = None
+    sale_count: int
+    revenue: float
@@ -3,13 +3,22 @@ from typing import Optional, List,TYPE_CHECKING
 from datetime import datetime
 
 
+class ProductInSaleItem(BaseModel):
+    id: int
+    name: str
+    sku: str
+
+    class Config:
+        from_attributes = True
+
+
 class SaleItemResponse(BaseModel):
     id: int
     product_id: int
     quantity: int
     unit_price:  float
     total_price:  float
-    product:  Optional[dict] = None
+    product:  Optional[ProductInSaleItem] = None
 
     class Config:
         from_attributes = True
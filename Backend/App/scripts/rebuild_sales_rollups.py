@@ -0,0 +1,39 @@
+"""
+Rebuild the daily sales rollup tables from sales and sale_items.
+
+Use it to backfill after creating the rollup tables, or to repair a date
+range. Days outside the range are left untouched. It can run while the
+app is taking sales, but those sales wait until it commits, so on a busy
+database repair a short range rather than everything.
+
+Run from the Backend directory:
+    python -m App.scripts.rebuild_sales_rollups                      # everything
+    python -m App.scripts.rebuild_sales_rollups --start 2025-01-01 --end 2025-12-31
+"""
+import argparse
+import time
+from datetime import date
+
+from App.database import SessionLocal
+from App.curd.sales_rollup import rebuild_sales_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, help="first day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        counts = rebuild_sales_rollups(db, start=args.start, end=args.end)
+    finally:
+        db.close()
+    for table, rows in counts.items():
+        print(f"{table:24} {rows:>8} rows")
+    print(f"✅ Rollups rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: sync (threadpool) vs async (AsyncSession) read endpoints.
+
+Seeds a throwaway SQLite database, then drives the list/get endpoints of
+every router through an in-process ASGI client under concurrent load, once
+with the sync handlers and once with ASYNC_DB_ROUTERS enabled.
+
+Run from the Backend directory (needs httpx and aiosqlite):
+    python -m App.test.bench_async_reads --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ALL_ROUTERS = "products,categories,suppliers,sales,inventory"
+ENDPOINTS = [
+    "/api/v1/products",
+    "/api/v1/products/1",
+    "/api/v1/categories",
+    "/api/v1/suppliers",
+    "/api/v1/sales",
+    "/api/v1/sales/1",
+    "/api/v1/inventory-transactions",
+]
+
+
+def seed(products: int, sales: int) -> None:
+    from datetime import datetime
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, Sale, SaleItem, InventoryTransaction, User
+    from App.models.user import UserRole
+    from App.models.inventory_transaction import TransactionType
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    now = datetime.utcnow()
+    db.add(User(id=1, username="bench", email="bench@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.add_all([Supplier(id=i, name=f"Supplier {i}", email=f"s{i}@example.com") for i in range(1, 11)])
+    db.add_all([Category(id=i, name=f"Category {i}") for i in range(1, 11)])
+    db.flush()
+    db.add_all([
+        Product(id=i, name=f"Product {i}", sku=f"SKU-{i}", quantity=100, price=10.0,
+                supplier_id=i % 10 + 1, category_id=i % 10 + 1)
+        for i in range(1, products + 1)
+    ])
+    db.flush()
+    for i in range(1, sales + 1):
+        db.add(Sale(id=i, invoice_number=f"INV-{i}", total_amount=50.0, user_id=1, created_at=now))
+        db.add_all([
+            SaleItem(sale_id=i, product_id=(i + k) % products + 1, quantity=1, unit_price=10.0, total_price=10.0)
+            for k in range(5)
+        ])
+        db.add(InventoryTransaction(product_id=i % products + 1, transaction_type=TransactionType.STOCK_IN,
+                                    quantity=1, unit_price=10.0, total_price=10.0, created_at=now))
+    db.commit()
+    db.close()
+
+
+async def drive(total: int, concurrency: int) -> dict:
+    import httpx
+    from App.main import app
+    from App.database import dispose_async_engine
+    from App.routes.auth import create_token
+
+    headers = {"Authorization": f"Bearer {create_token(1, 'bench', 'admin')}"}
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for path in ENDPOINTS:
+            await client.get(path)  # warm up caches and the pool
+            sem = asyncio.Semaphore(concurrency)
+
+            async def one():
+                async with sem:
+                    r = await client.get(path)
+                    assert r.status_code == 200, (path, r.status_code, r.text[:200])
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            elapsed = time.perf_counter() - start
+            results[path] = round(total / elapsed, 1)
+    await dispose_async_engine()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--sales", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(drive(args.requests, args.concurrency))))
+        return
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench-async-"), "bench.db")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    os.environ.update(env)
+    seed(args.products, args.sales)
+
+    runs = {}
+    for mode, routers in (("sync", ""), ("async", ALL_ROUTERS)):
+        out = subprocess.run(
+            [sys.executable, "-m", "App.test.bench_async_reads", "--child",
+             "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+            env=dict(env, ASYNC_DB_ROUTERS=routers), capture_output=True, text=True, check=True,
+        )
+        runs[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"{'endpoint':40} {'sync rps':>10} {'async rps':>10} {'speedup':>8}")
+    for path in ENDPOINTS:
+        sync_rps, async_rps = runs["sync"][path], runs["async"][path]
+        print(f"{path:40} {sync_rps:>10} {async_rps:>10} {async_rps / sync_rps:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
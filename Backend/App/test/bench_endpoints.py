@@ -0,0 +1,600 @@
+"""
+Endpoint benchmark suite: every /api/v1 route against a seeded database.
+
+Seeds a database at the chosen scale (products, sales with 1-4 items each,
+inventory ledger rows; suppliers, categories and users alongside) from a
+fixed random seed and fixed dates, so two runs at the same scale see the
+same data. Then drives every /api/v1 route through the app in-process
+(ASGI, no network): --requests per route (a fraction of that for the
+bcrypt-bound and bulk ones) from --concurrency concurrent clients, after a
+short warm-up. Writes run too, against rows created for the run.
+
+Reports p50/p95/p99 latency, requests per second and unexpected statuses
+per route, and saves everything with the commit, scale and settings as
+JSON (bench-results/ by default). --compare prints the change against an
+earlier result file. The run fails if a /api/v1 route has no benchmark, so
+new routes get one.
+
+Run from the Backend directory:
+    python -m App.test.bench_endpoints --scale small
+    python -m App.test.bench_endpoints --scale large --db /tmp/bench-large.db   # seeds once, reused after
+    python -m App.test.bench_endpoints --scale small --compare bench-results/<earlier>.json
+
+--scale large is 100k products, 1M sales and 5M inventory transactions;
+--products/--sales/--transactions override it. A non-empty database
+(--db, or DATABASE_URL for PostgreSQL/MySQL) is reused as is.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+# products, sales, inventory transactions
+SCALES = {
+    "small": (2_000, 10_000, 20_000),
+    "medium": (20_000, 100_000, 500_000),
+    "large": (100_000, 1_000_000, 5_000_000),
+}
+SEED = 42
+# Seeded rows are dated in the SEED_DAYS before SEED_END, not before "now",
+# so every run (and every machine) gets the same data
+SEED_END = datetime(2026, 1, 1)
+SEED_DAYS = 365
+CHUNK = 20_000
+# Every STOCKED_EVERY-th product gets unlimited stock, for the sale/stock-out benchmarks
+STOCKED_EVERY = 10
+PAYMENT_METHODS = ["cash", "card", "upi", "bank transfer"]
+BENCH_PASSWORD = "bench-password"
+
+ADJECTIVES = ["wireless", "compact", "portable", "premium", "ergonomic", "rugged", "smart", "classic", "digital", "slim"]
+NOUNS = ["keyboard", "monitor", "speaker", "charger", "backpack", "kettle", "drill", "lamp", "chair", "router",
+         "camera", "jacket", "watch", "bottle", "scanner", "projector", "cable", "adapter", "printer", "desk"]
+SEARCHES = ["keyb", "wireless charger", "proj", "smart watch", "camra", "SKU-0000042", "lamp", "portable speaker"]
+
+
+# ═══════════════════════════════════════════════════════════════════
+# SEEDING
+# ═══════════════════════════════════════════════════════════════════
+
+def _insert(table, rows: List[dict]) -> None:
+    from App.database import engine
+
+    with engine.begin() as conn:
+        conn.execute(table.insert(), rows)
+
+
+def _insert_chunked(table, make_row: Callable[[int], dict], count: int) -> None:
+    for start in range(1, count + 1, CHUNK):
+        _insert(table, [make_row(i) for i in range(start, min(start + CHUNK, count + 1))])
+
+
+def seed(products: int, sales: int, transactions: int) -> None:
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, Sale, SaleItem, InventoryTransaction, User
+    from App.models.user import UserRole
+    from App.models.inventory_transaction import TransactionType
+    from App.curd.sales_rollup import rebuild_sales_rollups
+    from App.utils.password_pool import bcrypt_hash
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(SEED)
+    start = SEED_END - timedelta(days=SEED_DAYS)
+    n_suppliers = max(10, products // 100)
+    n_categories = max(10, min(500, products // 200))
+    step = SEED_DAYS * 86400 / max(sales, 1)
+    tx_step = SEED_DAYS * 86400 / max(transactions, 1)
+
+    hashed = bcrypt_hash(BENCH_PASSWORD)
+    _insert(User.__table__, [
+        {"id": i, "username": f"bench{i}", "email": f"bench{i}@example.com", "hashed_password": hashed,
+         "full_name": f"Bench User {i}", "role": UserRole.ADMIN if i == 1 else UserRole.STAFF, "is_active": True,
+         "created_at": start}
+        for i in range(1, 21)
+    ])
+    supplier_names = [f"{rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark'])} Supply {i}"
+                      for i in range(1, n_suppliers + 1)]
+    category_names = [f"{rng.choice(NOUNS).title()} {i}" for i in range(1, n_categories + 1)]
+    _insert(Supplier.__table__, [
+        {"id": i, "name": name, "email": f"supplier{i}@example.com", "created_at": start}
+        for i, name in enumerate(supplier_names, 1)
+    ])
+    _insert(Category.__table__, [
+        {"id": i, "name": name, "created_at": start} for i, name in enumerate(category_names, 1)
+    ])
+
+    # Product id -> category id, so sale lines record the category they sold under
+    product_categories = [None] * (products + 1)
+
+    def product_row(i: int) -> dict:
+        supplier, category = rng.randrange(n_suppliers), rng.randrange(n_categories)
+        product_categories[i] = category + 1
+        name = f"{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS).title()} {rng.randint(1, 999)}"
+        sku = f"SKU-{i:07d}"
+        quantity = 1_000_000_000 if i % STOCKED_EVERY == 0 else rng.randint(0, 200)
+        return {
+            "id": i, "name": name, "sku": sku, "quantity": quantity, "price": round(rng.uniform(1, 500), 2),
+            "reorder_level": 10, "is_low_stock": quantity <= 10, "low_stock_changed_at": start,
+            "supplier_id": supplier + 1, "category_id": category + 1, "created_at": start, "updated_at": start,
+            # Same format App.curd.product_search maintains
+            "search_text": f"{name} {sku} {supplier_names[supplier]} {category_names[category]}",
+        }
+
+    _insert_chunked(Product.__table__, product_row, products)
+
+    item_id = 0
+    for chunk_start in range(1, sales + 1, CHUNK):
+        sale_rows, item_rows = [], []
+        for i in range(chunk_start, min(chunk_start + CHUNK, sales + 1)):
+            created_at = start + timedelta(seconds=i * step)
+            total = 0.0
+            for _ in range(rng.randint(1, 4)):
+                item_id += 1
+                quantity, unit_price = rng.randint(1, 5), round(rng.uniform(1, 500), 2)
+                total += quantity * unit_price
+                product_id = rng.randint(1, products)
+                item_rows.append({"id": item_id, "sale_id": i, "product_id": product_id,
+                                  "quantity": quantity, "unit_price": unit_price,
+                                  "total_price": round(quantity * unit_price, 2),
+                                  "category_id": product_categories[product_id]})
+            sale_rows.append({"id": i, "invoice_number": f"SEED-{i:08d}", "total_amount": round(total, 2),
+                              "payment_method": rng.choice(PAYMENT_METHODS), "customer_name": f"Customer {i % 5000}",
+                              "user_id": rng.randint(1, 20), "created_at": created_at})
+        _insert(Sale.__table__, sale_rows)
+        _insert(SaleItem.__table__, item_rows)
+
+    transaction_types = list(TransactionType)
+
+    def transaction_row(i: int) -> dict:
+        quantity, unit_price = rng.randint(1, 50), round(rng.uniform(1, 500), 2)
+        return {"id": i, "product_id": rng.randint(1, products), "transaction_type": rng.choice(transaction_types),
+                "quantity": quantity, "unit_price": unit_price, "total_price": round(quantity * unit_price, 2),
+                "reference_number": f"PO-{i:08d}", "created_by": rng.randint(1, 20),
+                "created_at": start + timedelta(seconds=i * tx_step)}
+
+    _insert_chunked(InventoryTransaction.__table__, transaction_row, transactions)
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Explicit ids don't advance the sequences the app's inserts use
+            for table in ("users", "suppliers", "categories", "products", "sales", "sale_items",
+                          "inventory_transactions"):
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                )
+        if engine.dialect.name in ("sqlite", "postgresql"):
+            conn.exec_driver_sql("ANALYZE")
+
+    db = SessionLocal()
+    try:
+        rebuild_sales_rollups(db)
+    finally:
+        db.close()
+
+
+def row_counts() -> Dict[str, int]:
+    from sqlalchemy import func, select
+    from App.database import engine
+    from App.models import Product, Sale, SaleItem, InventoryTransaction, Supplier, Category, User
+
+    with engine.connect() as conn:
+        return {
+            model.__tablename__: conn.execute(select(func.count()).select_from(model)).scalar()
+            for model in (Product, Sale, SaleItem, InventoryTransaction, Supplier, Category, User)
+        }
+
+
+def prepare_run(count: int, nonce: str) -> Dict[str, List[int]]:
+    """Rows the delete and role-change benchmarks use up, created fresh for this run"""
+    from sqlalchemy import select
+    from App.database import engine
+    from App.models import Supplier, Category, User
+    from App.models.user import UserRole
+
+    pools = {}
+    with engine.begin() as conn:
+        for pool, model, make_row in (
+            ("users", User, lambda i: {"username": f"del-{nonce}-{i}", "email": f"del-{nonce}-{i}@example.com",
+                                       "hashed_password": "x", "role": UserRole.STAFF, "is_active": True}),
+            ("role_users", User, lambda i: {"username": f"role-{nonce}-{i}", "email": f"role-{nonce}-{i}@example.com",
+                                            "hashed_password": "x", "role": UserRole.STAFF, "is_active": True}),
+            ("suppliers", Supplier, lambda i: {"name": f"Disposable {nonce} {i}", "email": f"del-{nonce}-{i}@example.com"}),
+            ("categories", Category, lambda i: {"name": f"Disposable {nonce} {i}"}),
+        ):
+            rows = [make_row(i) for i in range(count)]
+            conn.execute(model.__table__.insert(), rows)
+            name_column = model.username if model is User else model.name
+            names = [row["username"] if model is User else row["name"] for row in rows]
+            pools[pool] = list(conn.execute(select(model.id).where(name_column.in_(names)).order_by(model.id)).scalars())
+    return pools
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ENDPOINTS
+# ═══════════════════════════════════════════════════════════════════
+
+class Endpoint:
+    """
+    One route to benchmark. `make(i, rng)` returns the keyword arguments for
+    httpx's client.request (url, params, json, ...) for the i-th request;
+    `share` scales --requests for routes that are slow by design.
+    """
+
+    def __init__(self, method: str, route: str, make: Callable[[int, random.Random], dict],
+                 expect=(200,), share: float = 1.0):
+        self.method = method
+        self.route = route
+        self.make = make
+        self.expect = set(expect)
+        self.share = share
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+def build_endpoints(counts: Dict[str, int], pools: Dict[str, List[int]], nonce: str) -> List[Endpoint]:
+    from App.database import SessionLocal
+    from App.models import User
+    from App.routes.auth import create_token_pair
+
+    products, sales = counts["products"], counts["sales"]
+    transactions, suppliers, categories = counts["inventory_transactions"], counts["suppliers"], counts["categories"]
+    created_products: List[int] = []
+    day = SEED_END - timedelta(days=30)
+    one_day = {"start": day.isoformat(), "end": (day + timedelta(days=1)).isoformat()}
+    month = {"start": (SEED_END - timedelta(days=30)).date().isoformat(), "end": SEED_END.date().isoformat()}
+
+    def stocked(rng) -> int:
+        return rng.randint(1, max(1, products // STOCKED_EVERY)) * STOCKED_EVERY
+
+    def page(rng, rows: int) -> dict:
+        return {"skip": rng.randint(0, max(0, rows - 50)), "limit": 50}
+
+    def refresh_json(i, rng) -> dict:
+        # Refresh tokens are single use, so each request gets its own stored
+        # one and measures a successful rotation (minted outside the timing)
+        db = SessionLocal()
+        try:
+            tokens = create_token_pair(db, db.get(User, 1))
+            db.commit()
+        finally:
+            db.close()
+        return {"url": "/api/v1/auth/refresh", "json": {"refresh_token": tokens.refresh_token}}
+
+    def product_json(i, rng) -> dict:
+        return {"name": f"Bench {nonce} {i}", "sku": f"B-{nonce}-{i}", "quantity": 50, "price": 9.99,
+                "supplier_id": rng.randint(1, suppliers), "category_id": rng.randint(1, categories)}
+
+    def created_product(i, rng) -> dict:
+        response = {"url": "/api/v1/products", "json": product_json(i, rng)}
+        response["on_json"] = lambda body: created_products.append(body["id"])
+        return response
+
+    def bulk_csv(i, rng) -> dict:
+        lines = ["name,sku,quantity,price,supplier_id,category_id"] + [
+            f"Bulk {nonce} {i}-{k},BULK-{nonce}-{i}-{k},10,4.5,{rng.randint(1, suppliers)},{rng.randint(1, categories)}"
+            for k in range(100)
+        ]
+        return {"url": "/api/v1/products/bulk", "content": "\n".join(lines).encode(),
+                "headers": {"Content-Type": "text/csv"}}
+
+    def sale_json(i, rng) -> dict:
+        return {"customer_name": f"Bench {i}", "payment_method": rng.choice(PAYMENT_METHODS), "items": [
+            {"product_id": stocked(rng), "quantity": rng.randint(1, 3), "unit_price": 10.0}
+            for _ in range(rng.randint(1, 3))
+        ]}
+
+    def ledger_item(rng) -> dict:
+        return {"product_id": rng.randint(1, products), "transaction_type": "stock_in",
+                "quantity": rng.randint(1, 20), "unit_price": 2.5}
+
+    return [
+        # Auth
+        Endpoint("POST", "/api/v1/auth/register", lambda i, rng: {"url": "/api/v1/auth/register", "json": {
+            "username": f"reg-{nonce}-{i}", "email": f"reg-{nonce}-{i}@example.com", "password": BENCH_PASSWORD}},
+            share=0.1),
+        Endpoint("POST", "/api/v1/auth/login", lambda i, rng: {"url": "/api/v1/auth/login", "data": {
+            "username": f"bench{rng.randint(1, 20)}", "password": BENCH_PASSWORD}}, share=0.1),
+        Endpoint("POST", "/api/v1/auth/refresh", refresh_json),
+        Endpoint("GET", "/api/v1/auth/me", lambda i, rng: {"url": "/api/v1/auth/me"}),
+        Endpoint("GET", "/api/v1/auth/users", lambda i, rng: {"url": "/api/v1/auth/users"}),
+        Endpoint("GET", "/api/v1/auth/users/{user_id}", lambda i, rng: {"url": f"/api/v1/auth/users/{rng.randint(1, 20)}"}),
+        Endpoint("POST", "/api/v1/auth/users", lambda i, rng: {"url": "/api/v1/auth/users", "json": {
+            "username": f"new-{nonce}-{i}", "email": f"new-{nonce}-{i}@example.com", "password": BENCH_PASSWORD,
+            "role": "staff"}}, share=0.1),
+        Endpoint("PATCH", "/api/v1/auth/users/{user_id}/role", lambda i, rng: {
+            "url": f"/api/v1/auth/users/{pools['role_users'][i % len(pools['role_users'])]}/role",
+            "json": {"role": "manager" if i % 2 else "staff"}}),
+        Endpoint("PUT", "/api/v1/auth/users/{user_id}/role", lambda i, rng: {
+            "url": f"/api/v1/auth/users/{pools['role_users'][i % len(pools['role_users'])]}/role",
+            "params": {"role": "staff" if i % 2 else "manager"}}),
+        Endpoint("DELETE", "/api/v1/auth/users/{user_id}", lambda i, rng: {
+            "url": f"/api/v1/auth/users/{pools['users'][i]}"}),
+        # Refused once an admin exists, which is the path every later call takes
+        Endpoint("POST", "/api/v1/auth/create-admin", lambda i, rng: {"url": "/api/v1/auth/create-admin", "params": {
+            "username": f"admin-{nonce}-{i}", "email": f"admin-{nonce}-{i}@example.com", "password": BENCH_PASSWORD}},
+            expect=(400,)),
+
+        # Products
+        Endpoint("GET", "/api/v1/products", lambda i, rng: {"url": "/api/v1/products", "params": page(rng, products)}),
+        Endpoint("GET", "/api/v1/products/{product_id}", lambda i, rng: {
+            "url": f"/api/v1/products/{rng.randint(1, products)}"}),
+        Endpoint("GET", "/api/v1/products/low-stock", lambda i, rng: {
+            "url": "/api/v1/products/low-stock", "params": {"limit": 50}}),
+        Endpoint("GET", "/api/v1/products/low-stock/changes", lambda i, rng: {
+            "url": "/api/v1/products/low-stock/changes", "params": {"since": (SEED_END - timedelta(days=400)).isoformat(),
+                                                                     "limit": 50}}),
+        Endpoint("GET", "/api/v1/products/search", lambda i, rng: {
+            "url": "/api/v1/products/search", "params": {"q": rng.choice(SEARCHES), "limit": 20}}),
+        Endpoint("POST", "/api/v1/products", created_product, expect=(201,)),
+        Endpoint("POST", "/api/v1/products/bulk", bulk_csv, share=0.2),
+        Endpoint("PATCH", "/api/v1/products/{product_id}", lambda i, rng: {
+            "url": f"/api/v1/products/{rng.randint(1, products)}", "json": {"price": round(rng.uniform(1, 500), 2)}}),
+        # Deletes the products the POST benchmark created
+        Endpoint("DELETE", "/api/v1/products/{product_id}", lambda i, rng: {
+            "url": f"/api/v1/products/{created_products[i]}"}, expect=(200, 204)),
+
+        # Suppliers and categories
+        Endpoint("GET", "/api/v1/suppliers", lambda i, rng: {"url": "/api/v1/suppliers", "params": page(rng, suppliers)}),
+        Endpoint("GET", "/api/v1/suppliers/{supplier_id}", lambda i, rng: {
+            "url": f"/api/v1/suppliers/{rng.randint(1, suppliers)}"}),
+        Endpoint("POST", "/api/v1/suppliers", lambda i, rng: {"url": "/api/v1/suppliers", "json": {
+            "name": f"Supplier {nonce} {i}", "email": f"sup-{nonce}-{i}@example.com"}}, expect=(201,)),
+        Endpoint("PATCH", "/api/v1/suppliers/{supplier_id}", lambda i, rng: {
+            "url": f"/api/v1/suppliers/{rng.randint(1, suppliers)}", "json": {"contact_person": f"Contact {i}"}}),
+        Endpoint("DELETE", "/api/v1/suppliers/{supplier_id}", lambda i, rng: {
+            "url": f"/api/v1/suppliers/{pools['suppliers'][i]}"}, expect=(200, 204)),
+        Endpoint("GET", "/api/v1/categories", lambda i, rng: {"url": "/api/v1/categories", "params": page(rng, categories)}),
+        Endpoint("GET", "/api/v1/categories/{category_id}", lambda i, rng: {
+            "url": f"/api/v1/categories/{rng.randint(1, categories)}"}),
+        Endpoint("POST", "/api/v1/categories", lambda i, rng: {"url": "/api/v1/categories", "json": {
+            "name": f"Cat {nonce} {i}"}}, expect=(201,)),
+        Endpoint("PATCH", "/api/v1/categories/{category_id}", lambda i, rng: {
+            "url": f"/api/v1/categories/{rng.randint(1, categories)}", "json": {"description": f"Described {i}"}}),
+        Endpoint("DELETE", "/api/v1/categories/{category_id}", lambda i, rng: {
+            "url": f"/api/v1/categories/{pools['categories'][i]}"}, expect=(200, 204)),
+
+        # Inventory ledger
+        Endpoint("GET", "/api/v1/inventory-transactions", lambda i, rng: {
+            "url": "/api/v1/inventory-transactions", "params": page(rng, transactions)}),
+        Endpoint("GET", "/api/v1/inventory-transactions/page", lambda i, rng: {
+            "url": "/api/v1/inventory-transactions/page", "params": {"limit": 50}}),
+        Endpoint("GET", "/api/v1/inventory-transactions/{tx_id}", lambda i, rng: {
+            "url": f"/api/v1/inventory-transactions/{rng.randint(1, transactions)}"}),
+        Endpoint("POST", "/api/v1/inventory-transactions", lambda i, rng: {
+            "url": "/api/v1/inventory-transactions", "json": ledger_item(rng)}, expect=(201,)),
+        Endpoint("POST", "/api/v1/inventory-transactions/batch", lambda i, rng: {
+            "url": "/api/v1/inventory-transactions/batch", "json": {"items": [ledger_item(rng) for _ in range(20)]}},
+            expect=(200, 201)),
+
+        # Sales
+        Endpoint("GET", "/api/v1/sales", lambda i, rng: {"url": "/api/v1/sales", "params": page(rng, sales)}),
+        Endpoint("GET", "/api/v1/sales/page", lambda i, rng: {"url": "/api/v1/sales/page", "params": {"limit": 50}}),
+        Endpoint("GET", "/api/v1/sales/{sale_id}", lambda i, rng: {"url": f"/api/v1/sales/{rng.randint(1, sales)}"}),
+        Endpoint("POST", "/api/v1/sales", lambda i, rng: {"url": "/api/v1/sales", "json": sale_json(i, rng)},
+                 expect=(201,)),
+
+        # Dashboard, exports (one day each) and reports (the last 30 days)
+        Endpoint("GET", "/api/v1/dashboard/summary", lambda i, rng: {"url": "/api/v1/dashboard/summary"}),
+        Endpoint("GET", "/api/v1/export/sales", lambda i, rng: {"url": "/api/v1/export/sales", "params": one_day},
+                 share=0.2),
+        Endpoint("GET", "/api/v1/export/sale-items", lambda i, rng: {
+            "url": "/api/v1/export/sale-items", "params": one_day}, share=0.2),
+        Endpoint("GET", "/api/v1/export/inventory-transactions", lambda i, rng: {
+            "url": "/api/v1/export/inventory-transactions", "params": one_day}, share=0.2),
+        Endpoint("GET", "/api/v1/reports/revenue", lambda i, rng: {
+            "url": "/api/v1/reports/revenue", "params": {"interval": "day", **month}}),
+        Endpoint("GET", "/api/v1/reports/revenue/by-product", lambda i, rng: {
+            "url": "/api/v1/reports/revenue/by-product", "params": {"limit": 20, **month}}),
+        Endpoint("GET", "/api/v1/reports/revenue/by-category", lambda i, rng: {
+            "url": "/api/v1/reports/revenue/by-category", "params": month}),
+        Endpoint("GET", "/api/v1/reports/revenue/by-payment-method", lambda i, rng: {
+            "url": "/api/v1/reports/revenue/by-payment-method", "params": month}),
+    ]
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RUNNING
+# ═══════════════════════════════════════════════════════════════════
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, max(0, math.ceil(pct * len(sorted_samples)) - 1))]
+
+
+async def run_endpoint(client, endpoint: Endpoint, requests: int, warmup: int, concurrency: int,
+                       headers: dict) -> dict:
+    rng = random.Random(f"{SEED}:{endpoint.name}")
+    specs = [endpoint.make(i, rng) for i in range(warmup)]
+    latencies, statuses = [], {}
+
+    async def send(spec: dict, record: bool) -> None:
+        spec = dict(spec)
+        on_json = spec.pop("on_json", None)
+        spec["headers"] = {**headers, **spec.get("headers", {})}
+        started = time.perf_counter()
+        r = await client.request(endpoint.method, **spec)
+        elapsed = (time.perf_counter() - started) * 1000
+        if on_json is not None and r.status_code in endpoint.expect:
+            on_json(r.json())
+        if record:
+            latencies.append(elapsed)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    for spec in specs:
+        await send(spec, record=False)
+
+    next_index = iter(range(warmup, warmup + requests))
+
+    async def worker() -> None:
+        for i in next_index:
+            await send(endpoint.make(i, rng), record=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(n for status, n in statuses.items() if status not in endpoint.expect)
+    return {
+        "method": endpoint.method,
+        "route": endpoint.route,
+        "requests": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "errors": errors,
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+async def run(args, counts: Dict[str, int]) -> Dict[str, dict]:
+    import httpx
+    from fastapi.routing import APIRoute
+    from App.main import app
+    from App.routes.auth import create_token
+
+    nonce = format(int(time.time() * 1000) % 36 ** 6, "x")
+    endpoints = build_endpoints(counts, prepare_run(args.requests + args.warmup, nonce), nonce)
+
+    routes = {f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute)
+              and route.path.startswith("/api/v1") for method in route.methods}
+    missing = sorted(routes - {endpoint.name for endpoint in endpoints})
+    if missing and not args.allow_missing:
+        raise SystemExit("No benchmark for: " + ", ".join(missing) + " (add them to build_endpoints)")
+
+    selected = [e for e in endpoints if not args.only or any(part in e.name for part in args.only)]
+    headers = {"Authorization": f"Bearer {create_token(1, 'bench1', 'admin')}"}
+    results = {}
+    print(f"{'endpoint':58} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rps':>8} {'errors':>6}")
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for endpoint in selected:
+                requests = max(1, int(args.requests * endpoint.share))
+                result = await run_endpoint(client, endpoint, requests, min(args.warmup, requests),
+                                            args.concurrency, headers)
+                results[endpoint.name] = result
+                print(f"{endpoint.name:58} {result['requests']:>5} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                      f"{result['p99_ms']:>8.2f} {result['rps']:>8.1f} {result['errors']:>6}")
+    return results
+
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*cmd) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *cmd], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def compare(results: Dict[str, dict], baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline_path} ({(baseline['meta'].get('commit') or 'unknown')[:10]})")
+    print(f"{'endpoint':58} {'p50':>16} {'p95':>16} {'rps':>14}")
+    for name, result in results.items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:58} {'(new)':>16}")
+            continue
+
+        def delta(key: str) -> str:
+            change = (result[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            return f"{result[key]:.2f} ({change:+.0f}%)"
+
+        print(f"{name:58} {delta('p50_ms'):>16} {delta('p95_ms'):>16} {delta('rps'):>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--products", type=int, help="override the scale's product count")
+    parser.add_argument("--sales", type=int, help="override the scale's sale count")
+    parser.add_argument("--transactions", type=int, help="override the scale's inventory transaction count")
+    parser.add_argument("--db", help="SQLite file to seed and reuse (default: a throwaway one, or DATABASE_URL)")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="unmeasured requests per endpoint first")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--only", nargs="*", help="only endpoints whose 'METHOD /path' contains one of these")
+    parser.add_argument("--allow-missing", action="store_true", help="don't fail on routes without a benchmark")
+    parser.add_argument("--output", help="result file (default: bench-results/endpoints-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    products, sales, transactions = SCALES[args.scale]
+    products, sales, transactions = args.products or products, args.sales or sales, args.transactions or transactions
+    if args.db:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+    elif not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-endpoints-'), 'bench.db')}"
+
+    from sqlalchemy import inspect
+    from App.database import engine
+
+    if inspect(engine).has_table("products") and row_counts()["products"]:
+        print("Reusing the seeded database")
+    else:
+        started = time.perf_counter()
+        seed(products, sales, transactions)
+        print(f"Seeded {products} products, {sales} sales, {transactions} inventory transactions "
+              f"in {time.perf_counter() - started:.1f}s")
+    counts = row_counts()
+    print(", ".join(f"{table}={n}" for table, n in counts.items()) + "\n")
+
+    started = time.perf_counter()
+    results = asyncio.run(run(args, counts))
+    revision = git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "duration_s": round(time.perf_counter() - started, 1),
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": counts,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": SEED,
+            "settings": {name: os.getenv(name) for name in (
+                "ASYNC_DB_ROUTERS", "FAST_JSON_RESPONSES", "PASSWORD_HASH_WORKERS", "BCRYPT_ROUNDS", "QUERY_DEBUG",
+            ) if os.getenv(name) is not None},
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        "bench-results", f"endpoints-{(revision['commit'] or 'unknown')[:10]}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    if any(result["errors"] for result in results.values()):
+        print("\nSome requests returned unexpected statuses (see 'statuses' in the result file)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Microbenchmark: encoding one page of a list route to JSON bytes.
+
+Loads a page of products (with supplier/category) and a page of sales
+(with items and their products) from a throwaway SQLite database, then
+times each way of turning the rows into the response body:
+
+- fastapi       what a route returning ORM rows does by default: validate
+                into the response model, dump to dicts, json.dumps
+- fastapi+orjson the same with ORJSONResponse rendering the dicts
+- list-adapter  App.utils.responses.ListSerializer: one precompiled
+                TypeAdapter validating and writing JSON in pydantic-core
+
+Encoding is timed separately from loading the rows; all paths must produce
+the same JSON (checked before timing). A last table times the whole
+products page as the list route builds it: ORM objects + FastAPI's
+encoding before, Core rows (get_product_rows) + ListSerializer after.
+
+Run from the Backend directory:
+    python -m App.test.bench_json_encoding --rounds 300
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def seed(products: int, sales: int) -> None:
+    from datetime import datetime
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, Sale, SaleItem, User
+    from App.models.user import UserRole
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    now = datetime.utcnow()
+    db.add(User(id=1, username="bench", email="bench@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.add_all([Supplier(id=i, name=f"Supplier {i}", email=f"s{i}@example.com") for i in range(1, 21)])
+    db.add_all([Category(id=i, name=f"Category {i}") for i in range(1, 21)])
+    db.flush()
+    db.add_all([
+        Product(id=i, name=f"Product {i} with a longer name", sku=f"SKU-{i:06d}", quantity=100 + i,
+                price=9.99 + i, supplier_id=i % 20 + 1, category_id=i % 20 + 1)
+        for i in range(1, products + 1)
+    ])
+    db.flush()
+    for i in range(1, sales + 1):
+        db.add(Sale(id=i, invoice_number=f"INV-{i:06d}", total_amount=50.0, user_id=1,
+                    customer_name=f"Customer {i}", payment_method="cash", created_at=now))
+        db.add_all([
+            SaleItem(sale_id=i, product_id=(i + k) % products + 1, quantity=1, unit_price=10.0, total_price=10.0)
+            for k in range(4)
+        ])
+    db.commit()
+    db.close()
+
+
+def timed(fn, rounds: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", type=int, default=100, help="rows per page (the routes cap it at 100)")
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-json-'), 'bench.db')}"
+    seed(products=args.page * 5, sales=args.page * 2)
+
+    from typing import List
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from App.database import SessionLocal
+    from App.curd.product import get_products, get_product_rows
+    from App.curd.sale import get_sales_with_details
+    from App.routes.sale import build_sale_response
+    from App.schemas.product import ProductResponse
+    from App.schemas import SaleWithDetails
+    from App.utils.responses import ListSerializer, orjson
+
+    db = SessionLocal()
+    pages = {
+        "products": (ProductResponse, get_products(db, skip=0, limit=args.page)),
+        "sales": (SaleWithDetails, [build_sale_response(s) for s in get_sales_with_details(db, skip=0, limit=args.page)]),
+    }
+
+    loop = asyncio.new_event_loop()
+
+    def fastapi_encode(field, rows, response_class):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=rows, is_coroutine=True))
+        return response_class(content).body
+
+    print(f"{'page':10} {'path':16} {'ms/page':>9} {'speedup':>8}")
+    for name, (schema, rows) in pages.items():
+        field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+        serializer = ListSerializer(schema)
+        paths = {"fastapi": lambda: fastapi_encode(field, rows, JSONResponse)}
+        if orjson is not None:
+            paths["fastapi+orjson"] = lambda: fastapi_encode(field, rows, ORJSONResponse)
+        paths["list-adapter"] = lambda: serializer.encode(rows)
+
+        expected = json.loads(paths["fastapi"]())
+        for label, fn in paths.items():
+            if json.loads(fn()) != expected:
+                raise SystemExit(f"{name}: {label} output differs from FastAPI's")
+        if serializer.encode(rows) != paths["fastapi"]():
+            print(f"  note: {name} list-adapter bytes differ only in formatting")
+
+        baseline = None
+        for label, fn in paths.items():
+            ms = timed(fn, args.rounds)
+            baseline = baseline or ms
+            print(f"{name + f'[{len(rows)}]':10} {label:16} {ms:>9.3f} {baseline / ms:>7.1f}x")
+
+    field = create_model_field(name="Response", type_=List[ProductResponse], mode="serialization")
+    serializer = ListSerializer(ProductResponse)
+
+    def orm_page():
+        db.expunge_all()  # load fresh objects, as a new request's session would
+        return fastapi_encode(field, get_products(db, skip=0, limit=args.page), JSONResponse)
+
+    def rows_page():
+        return serializer.encode(get_product_rows(db, skip=0, limit=args.page))
+
+    if json.loads(orm_page()) != json.loads(rows_page()):
+        raise SystemExit("products: get_product_rows output differs from the ORM page")
+    before, after = timed(orm_page, args.rounds), timed(rows_page, args.rounds)
+    print(f"\nproducts page, load + encode: {before:.3f} ms -> {after:.3f} ms ({before / after:.1f}x)")
+    db.close()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: latency of search_products at catalogue scale.
+
+Seeds a throwaway database with --products generated products (names drawn
+from a word list, so terms have realistic spread), then runs a fixed mix of
+prefix, multi-word, SKU and misspelled queries through the same CRUD
+function /products/search uses and reports p50/p95/max per query kind.
+
+Run from the Backend directory (uses a throwaway SQLite database unless
+DATABASE_URL is already set; a database that already has a products table
+is searched as is, so a seeded one can be reused):
+    python -m App.test.bench_product_search --products 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+ADJECTIVES = [
+    "wireless", "compact", "portable", "premium", "ergonomic", "rugged", "smart", "classic", "digital",
+    "heavy", "slim", "deluxe", "mini", "pro", "ultra", "organic", "stainless", "industrial", "vintage", "eco",
+]
+NOUNS = [
+    "keyboard", "monitor", "speaker", "headphones", "charger", "backpack", "blender", "kettle", "toaster",
+    "drill", "hammer", "wrench", "lamp", "chair", "desk", "notebook", "printer", "router", "camera", "tripod",
+    "jacket", "sneakers", "watch", "bottle", "grinder", "scanner", "projector", "microphone", "cable", "adapter",
+]
+COLOURS = ["black", "white", "silver", "red", "blue", "green", "graphite", "navy", "olive", "sand"]
+
+QUERIES = {
+    "prefix": ["keyb", "proj", "stainl", "headph", "micro"],
+    "multi-word": ["wireless keyboard", "portable speaker black", "smart watch", "organic kettle", "pro camera tripod"],
+    "sku": ["SKU-0000042", "SKU-0123456", "SKU-0999999", "SKU-0500000", "SKU-0000007"],
+    "typo": ["keybaord", "projetor", "headphnes", "wirless charger", "blendr"],
+}
+
+
+def seed(products: int) -> None:
+    from App.database import Base, engine
+    from App import models
+    from App.models import Supplier, Category, Product
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    suppliers = [f"{rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne'])} Supply {i}" for i in range(1, 201)]
+    categories = [f"Category {noun.title()}" for noun in NOUNS]
+    with engine.begin() as conn:
+        conn.execute(Supplier.__table__.insert(), [
+            {"id": i, "name": name, "email": f"supplier{i}@example.com"} for i, name in enumerate(suppliers, 1)
+        ])
+        conn.execute(Category.__table__.insert(), [
+            {"id": i, "name": name} for i, name in enumerate(categories, 1)
+        ])
+    batch = []
+    for i in range(1, products + 1):
+        noun = rng.randrange(len(NOUNS))
+        supplier = rng.randrange(len(suppliers))
+        name = f"{rng.choice(ADJECTIVES).title()} {NOUNS[noun].title()} {rng.choice(COLOURS).title()} {rng.randint(1, 999)}"
+        sku = f"SKU-{i:07d}"
+        batch.append({
+            "id": i, "name": name, "sku": sku, "quantity": 50, "price": 9.99,
+            "supplier_id": supplier + 1, "category_id": noun + 1,
+            # Same format App.curd.product_search maintains; written directly to keep seeding fast
+            "search_text": f"{name} {sku} {suppliers[supplier]} {categories[noun]}",
+        })
+        if len(batch) == 20000:
+            with engine.begin() as conn:
+                conn.execute(Product.__table__.insert(), batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(Product.__table__.insert(), batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=20, help="times each query is run")
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="p95 target; exit 1 if exceeded")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        db_path = os.path.join(tempfile.mkdtemp(prefix="bench-search-"), "search.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from sqlalchemy import func, inspect, select
+    from App.database import engine
+    from App.models import Product
+
+    if inspect(engine).has_table("products"):
+        with engine.connect() as conn:
+            existing = conn.execute(select(func.count()).select_from(Product)).scalar()
+        print(f"reusing the {existing} products already seeded\n")
+    else:
+        started = time.perf_counter()
+        seed(args.products)
+        print(f"seeded {args.products} products in {time.perf_counter() - started:.1f}s\n")
+
+    from App.database import SessionLocal
+    from App.curd.product_search import search_products
+
+    db = SessionLocal()
+    worst_p95 = 0.0
+    print(f"{'kind':12} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'hits':>6}")
+    try:
+        for kind, queries in QUERIES.items():
+            timings = []
+            hits = 0
+            for _ in range(args.rounds):
+                for q in queries:
+                    start = time.perf_counter()
+                    results = search_products(db, q, limit=20)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    hits += bool(results)
+                    db.expunge_all()
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            worst_p95 = max(worst_p95, p95)
+            print(f"{kind:12} {statistics.median(timings):>8.2f} {p95:>8.2f} {timings[-1]:>8.2f} "
+                  f"{hits * 100 // len(timings):>5}%")
+    finally:
+        db.close()
+
+    if worst_p95 > args.budget_ms:
+        print(f"\np95 {worst_p95:.2f} ms is over the {args.budget_ms:.0f} ms budget")
+        raise SystemExit(1)
+    print(f"\nAll query kinds within the {args.budget_ms:.0f} ms p95 budget")
+
+
+if __name__ == "__main__":
+    main()
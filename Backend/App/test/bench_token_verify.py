@@ -0,0 +1,82 @@
+"""
+Microbenchmark: authenticating one request (the get_current_user dependency).
+
+Times three ways of turning a bearer token into the caller's principal,
+against a throwaway SQLite database:
+
+- decode+db     what the dependency used to do on a cache miss: verify the
+                JWT, then load the user row for role and active flag
+- decode        verify the JWT, check the user's token version (already
+                cached) and build the principal from its claims
+- cached        a token this process has already verified (LRU hit)
+
+Run from the Backend directory:
+    python -m App.test.bench_token_verify --rounds 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def timed(fn, rounds: int) -> float:
+    """Median microseconds per call"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-token-'), 'bench.db')}"
+
+    from jose import jwt
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import User
+    from App.models.user import UserRole
+    from App.routes import auth
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(id=1, username="bench", email="bench@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.commit()
+
+    token = auth.create_token(1, "bench", "admin")
+    loop = asyncio.new_event_loop()
+
+    def decode_and_db():
+        payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+        db.expunge_all()
+        user = db.query(User).filter(User.id == int(payload["sub"])).first()
+        return auth.Principal.model_validate(user)
+
+    def decode():
+        auth._principal_cache.clear()
+        return loop.run_until_complete(auth.get_current_user(token))
+
+    def cached():
+        return loop.run_until_complete(auth.get_current_user(token))
+
+    baseline = None
+    print(f"{'path':12} {'us/request':>11} {'speedup':>8}")
+    for label, fn in (("decode+db", decode_and_db), ("decode", decode), ("cached", cached)):
+        us = timed(fn, args.rounds)
+        baseline = baseline or us
+        print(f"{label:12} {us:>11.1f} {baseline / us:>7.1f}x")
+
+    db.close()
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
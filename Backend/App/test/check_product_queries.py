@@ -0,0 +1,156 @@
+"""
+Query-count check for the product CRUD functions in App/curd/product.py.
+
+Seeds products that each have their own supplier and category, then calls
+every product read path, create and update directly (no HTTP, no ETag) at
+several page sizes and serialises the result through ProductResponse, so
+any relationship that isn't eager-loaded shows up as extra SELECTs. Each
+call must run exactly the number of statements in PAGED / SINGLE: a page
+costs the same one query whatever its size, and the single-row writes a
+fixed handful.
+
+Run from the Backend directory (uses a throwaway SQLite database unless
+DATABASE_URL is already set):
+    python -m App.test.check_product_queries --sizes 1 10 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+# name -> statements per page, for every page size
+PAGED = {
+    "get_products": 1,
+    "get_low_stock_products": 1,
+    "get_product_rows": 1,
+    "get_products_async": 1,
+    "get_product_rows_async": 1,
+}
+
+# name -> statements per call. create: supplier and category existence
+# (cold cache), SKU check, INSERT, search_text refresh, catalogue version
+# bump, joined re-read. update: product read, supplier existence, search_text
+# refresh, UPDATE, version bump, joined re-read.
+SINGLE = {
+    "get_product": 1,
+    "get_product_async": 1,
+    "create_product": 7,
+    "update_product": 6,
+}
+
+
+def seed(rows: int) -> None:
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([Supplier(id=i, name=f"Supplier {i}") for i in range(1, rows + 1)])
+    db.add_all([Category(id=i, name=f"Category {i}") for i in range(1, rows + 1)])
+    db.flush()
+    # Every product is low stock, so the low-stock page is as full as the others
+    db.add_all([
+        Product(id=i, name=f"Product {i}", sku=f"PQ-{i}", quantity=0, price=10.0, reorder_level=5,
+                is_low_stock=True, supplier_id=i, category_id=i)
+        for i in range(1, rows + 1)
+    ])
+    db.commit()
+    db.close()
+
+
+def serialise(result) -> None:
+    """Touch every field the API would, including supplier and category"""
+    from App.schemas.product import ProductResponse
+
+    items = result if isinstance(result, list) else [result]
+    for item in items:
+        ProductResponse.model_validate(item)
+
+
+def measure_sync(call) -> int:
+    from App.database import SessionLocal, count_queries
+    from App.curd.catalog_cache import supplier_cache, category_cache
+
+    supplier_cache.clear()
+    category_cache.clear()
+    db = SessionLocal()
+    try:
+        with count_queries() as stats:
+            serialise(call(db))
+    finally:
+        db.close()
+    return stats.count
+
+
+async def measure_async(call) -> int:
+    from App.database import count_queries, get_async_db
+
+    async for db in get_async_db():
+        with count_queries() as stats:
+            serialise(await call(db))
+    return stats.count
+
+
+def check(name: str, counted: int, expected: int, label: str) -> bool:
+    ok = counted == expected
+    print(f"[{'ok' if ok else 'FAIL'}] {name:24} {label:10} {counted:>3} queries (expected {expected})")
+    return ok
+
+
+def run(sizes) -> int:
+    from App.curd import product as crud
+    from App.database import dispose_async_engine
+    from App.schemas.product import ProductCreate
+
+    failures = 0
+    for size in sizes:
+        for name in ("get_products", "get_low_stock_products"):
+            fn = getattr(crud, name)
+            counted = measure_sync(lambda db: fn(db, skip=0, limit=size))
+            failures += not check(name, counted, PAGED[name], f"limit={size}")
+        counted = measure_sync(lambda db: crud.get_product_rows(db, skip=0, limit=size))
+        failures += not check("get_product_rows", counted, PAGED["get_product_rows"], f"limit={size}")
+
+    async def async_reads():
+        nonlocal failures
+        for size in sizes:
+            for name in ("get_products_async", "get_product_rows_async"):
+                fn = getattr(crud, name)
+                counted = await measure_async(lambda db: fn(db, skip=0, limit=size))
+                failures += not check(name, counted, PAGED[name], f"limit={size}")
+        counted = await measure_async(lambda db: crud.get_product_async(db, 1))
+        failures += not check("get_product_async", counted, SINGLE["get_product_async"], "")
+        await dispose_async_engine()
+
+    asyncio.run(async_reads())
+
+    counted = measure_sync(lambda db: crud.get_product(db, 1))
+    failures += not check("get_product", counted, SINGLE["get_product"], "")
+    new = ProductCreate(name="Query check", sku="PQ-NEW", quantity=1, price=1.0, supplier_id=1, category_id=2)
+    counted = measure_sync(lambda db: crud.create_product(db, new))
+    failures += not check("create_product", counted, SINGLE["create_product"], "")
+    counted = measure_sync(lambda db: crud.update_product(db, 1, {"name": "Renamed", "supplier_id": 3}))
+    failures += not check("update_product", counted, SINGLE["update_product"], "")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="page sizes to check")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='product-queries-'), 'products.db')}"
+    seed(max(args.sizes) * 2)
+
+    failures = run(args.sizes)
+    if failures:
+        print(f"\n{failures} product call(s) ran an unexpected number of queries")
+        sys.exit(1)
+    print("\nEvery product path runs a fixed number of queries")
+
+
+if __name__ == "__main__":
+    main()
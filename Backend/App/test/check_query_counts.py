@@ -0,0 +1,152 @@
+"""
+Query-count regression check for the read endpoints (catches N+1 patterns).
+
+Seeds a throwaway database and calls every list/detail read through the app
+with QUERY_DEBUG on, reading X-Query-Count from the response. In-process
+caches are cleared before every call, so the counts are for the cold path.
+Each list is requested with a small and a large page: the count must not
+grow with the page size (that's an N+1), and both must equal the
+endpoint's budget exactly. A read that got cheaper fails too, until its
+budget is lowered, so the budgets stay a record of the real counts.
+
+Run from the Backend directory (uses a throwaway SQLite database unless
+DATABASE_URL is already set):
+    python -m App.test.check_query_counts
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+# (path, statements run). "{limit}" is filled with both page sizes; the
+# counts include the catalogue-version read behind each ETag, and for
+# categories/suppliers the version reads around the cache load
+ENDPOINTS = [
+    ("/api/v1/products?limit={limit}", 2),
+    ("/api/v1/products/low-stock?limit={limit}", 2),
+    ("/api/v1/products/1", 2),
+    ("/api/v1/products/search?q=product&limit={limit}", 4),
+    ("/api/v1/categories?limit={limit}", 4),
+    ("/api/v1/suppliers?limit={limit}", 4),
+    ("/api/v1/sales?limit={limit}", 2),
+    ("/api/v1/sales/page?limit={limit}", 2),
+    ("/api/v1/sales/1", 2),
+    ("/api/v1/inventory-transactions?limit={limit}", 1),
+    ("/api/v1/inventory-transactions/page?limit={limit}", 1),
+    ("/api/v1/reports/revenue/by-product?limit={limit}", 1),
+    ("/api/v1/dashboard/summary", 1),
+]
+
+# path -> (router, statements run) when that router is in ASYNC_DB_ROUTERS:
+# the async reads skip the in-process cache and its version reads
+ASYNC_ENDPOINTS = {
+    "/api/v1/categories?limit={limit}": ("categories", 2),
+    "/api/v1/suppliers?limit={limit}": ("suppliers", 2),
+}
+
+
+def seed(rows: int) -> None:
+    from datetime import datetime, timedelta
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, Sale, SaleItem, InventoryTransaction, User
+    from App.models.user import UserRole
+    from App.models.inventory_transaction import TransactionType
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = datetime.utcnow() - timedelta(days=7)
+    db.add(User(id=1, username="counts", email="counts@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.add_all([Supplier(id=i, name=f"Supplier {i}", email=f"s{i}@example.com") for i in range(1, rows + 1)])
+    db.add_all([Category(id=i, name=f"Category {i}") for i in range(1, rows + 1)])
+    db.flush()
+    db.add_all([
+        Product(id=i, name=f"Product {i}", sku=f"COUNT-{i}", quantity=i % 15, price=10.0,
+                supplier_id=i, category_id=i)
+        for i in range(1, rows + 1)
+    ])
+    db.flush()
+    for i in range(1, rows + 1):
+        created_at = start + timedelta(minutes=i)
+        db.add(Sale(id=i, invoice_number=f"COUNT-INV-{i}", total_amount=30.0, user_id=1, created_at=created_at))
+        db.add_all([
+            SaleItem(sale_id=i, product_id=(i + k) % rows + 1, quantity=1, unit_price=10.0, total_price=10.0)
+            for k in range(3)
+        ])
+        db.add(InventoryTransaction(product_id=i, transaction_type=TransactionType.STOCK_IN, quantity=1,
+                                    unit_price=10.0, total_price=10.0, created_by=1, created_at=created_at))
+    db.commit()
+    db.close()
+
+
+def clear_caches() -> None:
+    from App.curd.catalog_cache import category_cache, supplier_cache
+    from App.curd import product_search
+    from App.routes import dashboard
+
+    category_cache.clear()
+    supplier_cache.clear()
+    product_search._vocabulary_cache.clear()
+    dashboard._summary_cache.clear()
+
+
+async def count(client, path: str, headers: dict) -> int:
+    clear_caches()
+    r = await client.get(path, headers=headers)
+    if r.status_code != 200:
+        raise SystemExit(f"GET {path} -> {r.status_code}: {r.text[:200]}")
+    return int(r.headers["x-query-count"])
+
+
+async def run(small: int, large: int) -> int:
+    import httpx
+    from App.database import async_db_enabled
+    from App.main import app
+    from App.routes.auth import create_token
+
+    headers = {"Authorization": f"Bearer {create_token(1, 'counts', 'admin')}"}
+    failures = 0
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://counts") as client:
+            # Authenticate once, so the token version lookup isn't counted against the first endpoint
+            await client.get("/api/v1/auth/me", headers=headers)
+            for path, budget in ENDPOINTS:
+                router_name, async_budget = ASYNC_ENDPOINTS.get(path, (None, None))
+                if router_name and async_db_enabled(router_name):
+                    budget = async_budget
+                counts = [await count(client, path.format(limit=n), headers) for n in (small, large)]
+                problems = []
+                if counts[1] > counts[0]:
+                    problems.append(f"grows with the page ({counts[0]} -> {counts[1]})")
+                if max(counts) > budget:
+                    problems.append(f"over budget ({max(counts)} > {budget})")
+                elif min(counts) < budget:
+                    problems.append(f"under budget ({min(counts)} < {budget}), lower it")
+                print(f"[{'FAIL' if problems else 'ok'}] {path.replace('{limit}', 'N'):52} "
+                      f"{counts[0]:>3} / {counts[1]:>3} queries (budget {budget})  {'; '.join(problems)}")
+                failures += bool(problems)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small", type=int, default=5, help="small page size")
+    parser.add_argument("--large", type=int, default=50, help="large page size")
+    args = parser.parse_args()
+
+    os.environ["QUERY_DEBUG"] = "true"
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='query-counts-'), 'counts.db')}"
+    seed(args.large * 2)
+
+    failures = asyncio.run(run(args.small, args.large))
+    if failures:
+        print(f"\n{failures} endpoint(s) don't run their budgeted number of queries")
+        sys.exit(1)
+    print("\nAll reads run exactly their budgeted queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Query-plan regression check for the hot reads.
+
+Seeds a throwaway database, runs the hot CRUD reads over products, sales,
+sale items, the inventory ledger and the daily sales rollups (lists, detail
+pages, the low-stock feeds, reports and the dashboard), captures every
+SELECT they emit and asks the database for its plan. The check fails (exit
+code 1) when any of those statements reads one of those tables with a full
+table scan or sorts rows in a temporary b-tree instead of walking an index -
+unless the read is listed as needing exactly that (the dashboard's
+whole-table totals, a report ordered by an aggregate).
+
+Run from the Backend directory (uses a throwaway SQLite database unless
+DATABASE_URL is already set; point it at an empty MySQL/PostgreSQL schema
+to check those planners):
+    python -m App.test.check_query_plans --rows 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from sqlalchemy import event
+
+LEDGER_TABLES = (
+    "products", "sales", "sale_items", "inventory_transactions",
+    "daily_product_sales", "daily_category_sales", "daily_payment_sales",
+)
+# What a read's plans may contain without failing: full scans of these
+# tables, and/or a sort ("ORDER BY") of its result
+ORDER_BY = "ORDER BY"
+
+
+def seed(rows: int) -> None:
+    from datetime import datetime, timedelta
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, Sale, SaleItem, InventoryTransaction, User
+    from App.models.user import UserRole
+    from App.models.inventory_transaction import TransactionType
+    from App.curd.sales_rollup import rebuild_sales_rollups
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    # A year of history, so a report's date range is a small slice of the rollups
+    start = datetime.utcnow() - timedelta(days=365)
+    products = max(100, rows // 10)
+    db.add(User(id=1, username="plans", email="plans@example.com", hashed_password="x", role=UserRole.ADMIN))
+    db.add(Supplier(id=1, name="Plan supplier", email="plans-supplier@example.com"))
+    db.add(Category(id=1, name="Plan category"))
+    db.flush()
+    # Every tenth product is low on stock, flagged well outside the feed's settle window
+    db.add_all([
+        Product(id=i, name=f"Product {i}", sku=f"PLAN-{i}", quantity=5 if i % 10 == 0 else 100, price=10.0,
+                supplier_id=1, category_id=1, low_stock_changed_at=start + timedelta(minutes=i))
+        for i in range(1, products + 1)
+    ])
+    db.flush()
+    for i in range(1, rows + 1):
+        created_at = start + timedelta(days=365) * i / rows
+        db.add(Sale(id=i, invoice_number=f"PLAN-INV-{i}", total_amount=30.0, user_id=1, created_at=created_at,
+                    payment_method=("cash", "card", "transfer")[i % 3]))
+        db.add_all([
+            SaleItem(sale_id=i, product_id=(i + k) % products + 1, quantity=1, unit_price=10.0, total_price=10.0,
+                     category_id=1)
+            for k in range(3)
+        ])
+        db.add(InventoryTransaction(product_id=i % products + 1, transaction_type=TransactionType.STOCK_IN,
+                                    quantity=1, unit_price=10.0, total_price=10.0, created_at=created_at))
+    db.commit()
+    rebuild_sales_rollups(db)
+    db.close()
+
+    with engine.begin() as conn:
+        if engine.dialect.name in ("sqlite", "postgresql"):
+            conn.exec_driver_sql("ANALYZE")
+        elif engine.dialect.name == "mysql":
+            conn.exec_driver_sql("ANALYZE TABLE " + ", ".join(LEDGER_TABLES))
+
+
+def hot_reads():
+    """(label, callable(db), allowed) for every hot read served by the API; see ORDER_BY"""
+    from datetime import date, timedelta
+    from App.curd import sale as sale_curd
+    from App.curd import inventory_transaction as inventory_curd
+    from App.curd import product as product_curd
+    from App.curd import sales_rollup as rollup_curd
+    from App.curd.dashboard import get_dashboard_summary
+
+    def sales_second_page(db):
+        _, cursor = sale_curd.get_sales_page(db, limit=50)
+        sale_curd.get_sales_page(db, cursor=cursor, limit=50)
+
+    def inventory_second_page(db):
+        _, cursor = inventory_curd.get_inventory_transactions_page(db, limit=50)
+        inventory_curd.get_inventory_transactions_page(db, cursor=cursor, limit=50)
+
+    def low_stock_changes_polled(db):
+        _, cursor = product_curd.get_low_stock_changes(db, limit=5)
+        product_curd.get_low_stock_changes(db, cursor=cursor, limit=5)
+
+    week = {"start": date.today() - timedelta(days=7), "end": date.today()}
+    # A report sums rollup rows per key and orders the sums: that sort can't use an index
+    aggregate = {ORDER_BY}
+    # Product pages walk the table in id (rowid) order and stop at LIMIT,
+    # which SQLite reports as a SCAN
+    by_rowid = {"products"}
+    return [
+        ("product list", lambda db: product_curd.get_product_rows(db, skip=0, limit=100), by_rowid),
+        ("product list (ORM)", lambda db: product_curd.get_products(db, skip=0, limit=100), by_rowid),
+        ("product detail", lambda db: product_curd.get_product(db, 42), ()),
+        ("low-stock list", lambda db: product_curd.get_low_stock_products(db, skip=0, limit=100), ()),
+        ("low-stock rows", lambda db: product_curd.get_product_rows(db, limit=100, low_stock_only=True), ()),
+        ("low-stock changes", low_stock_changes_polled, ()),
+        ("low-stock changes since",
+         lambda db: product_curd.get_low_stock_changes(db, since=week["start"], limit=100), ()),
+        ("sales list", lambda db: sale_curd.get_sales_with_details(db, skip=0, limit=100), ()),
+        ("sales page", sales_second_page, ()),
+        ("sale detail", lambda db: sale_curd.get_sale_with_details(db, 42), ()),
+        ("inventory list", lambda db: inventory_curd.get_inventory_transactions(db, skip=0, limit=100), ()),
+        ("inventory page", inventory_second_page, ()),
+        ("inventory get", lambda db: inventory_curd.get_inventory_transaction(db, 42), ()),
+        ("revenue series", lambda db: rollup_curd.get_revenue_series(db, **week), ()),
+        ("revenue by product", lambda db: rollup_curd.get_revenue_by_product(db, **week), aggregate),
+        ("revenue by category", lambda db: rollup_curd.get_revenue_by_category(db, **week), aggregate),
+        ("revenue by payment method",
+         lambda db: rollup_curd.get_revenue_by_payment_method(db, **week), aggregate),
+        # Headline totals over whole tables, one cached SELECT (see App.curd.dashboard)
+        ("dashboard summary", get_dashboard_summary, {"products", "sales"}),
+    ]
+
+
+def capture_selects(engine, fn):
+    """Run fn(db) and return the (statement, parameters) of every SELECT it emitted."""
+    from App.database import SessionLocal
+
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    db = SessionLocal()
+    try:
+        fn(db)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", record)
+    return captured
+
+
+def explain(conn, statement, parameters, allowed=()):
+    """Return (plan lines, problems) for one statement on the current backend; see ORDER_BY for `allowed`."""
+    dialect = conn.dialect.name
+    problems = []
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        lines = [row[-1] for row in rows]
+        for line in lines:
+            words = line.split()
+            if len(words) < 2:
+                continue
+            table = words[1]
+            if table not in LEDGER_TABLES or table in allowed:
+                continue
+            if words[0] == "SCAN" and "USING" not in words:
+                problems.append(line)
+        if ORDER_BY not in allowed:
+            problems.extend(line for line in lines if line.startswith("USE TEMP B-TREE FOR ORDER BY"))
+    elif dialect == "postgresql":
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        conn.exec_driver_sql("RESET enable_seqscan")
+        lines = [row[0] for row in rows]
+        problems = [
+            line for line in lines
+            if any(f"Seq Scan on {t} " in line + " " for t in LEDGER_TABLES if t not in allowed)
+        ]
+    elif dialect == "mysql":
+        result = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+        keys = list(result.keys())
+        lines = []
+        for row in result.fetchall():
+            info = dict(zip(keys, row))
+            lines.append(f"{info.get('table')}: type={info.get('type')} key={info.get('key')} extra={info.get('Extra')}")
+            if info.get("table") in LEDGER_TABLES and info.get("table") not in allowed and info.get("type") == "ALL":
+                problems.append(lines[-1])
+    else:
+        raise SystemExit(f"No plan check for dialect {dialect!r}")
+    return lines, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="sales (and ledger rows) to seed")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not just failures")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        db_path = os.path.join(tempfile.mkdtemp(prefix="query-plans-"), "plans.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from App.database import engine
+
+    seed(args.rows)
+
+    failures = 0
+    for label, fn, allowed in hot_reads():
+        for statement, parameters in capture_selects(engine, fn):
+            with engine.connect() as conn:
+                lines, problems = explain(conn, statement, parameters, allowed)
+            status = "FAIL" if problems else "ok"
+            if problems or args.verbose:
+                print(f"[{status}] {label}")
+                print("    " + " ".join(statement.split())[:200])
+                for line in lines:
+                    print(f"      {line}")
+            failures += bool(problems)
+        if not args.verbose:
+            print(f"[checked] {label}")
+
+    if failures:
+        print(f"\n{failures} statement(s) scan or sort a table without an index")
+        sys.exit(1)
+    print("\nAll hot reads use an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Startup-time check: how long a fresh worker takes to serve its first request.
+
+Migrates a throwaway SQLite database to head, then starts the app in a new
+interpreter --runs times per mode (the default startup and FAST_STARTUP=true)
+and measures, in each:
+
+- import          `import App.main` (models, routers, app construction)
+- startup         the lifespan startup (connection test, create_all unless
+                  FAST_STARTUP)
+- first request   GET /api/v1/categories with a bearer token: token version
+                  lookup, first pooled query, first statement compilation,
+                  first serialisation
+
+Medians are reported per mode. The check fails (exit code 1) when the
+FAST_STARTUP total (import + startup + first request) is over --budget-ms.
+Against a remote database create_all costs a round trip per table, so the
+gap between the modes is larger there than on local SQLite.
+
+Run from the Backend directory:
+    python -m App.test.check_startup_time --runs 5 --budget-ms 3000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {"default": "False", "fast": "True"}
+PHASES = ("import", "startup", "first request")
+
+
+def child() -> None:
+    """Runs in the fresh interpreter: measure one cold start, print JSON"""
+    import asyncio
+
+    started = time.perf_counter()
+    from App.main import app
+    imported = time.perf_counter()
+
+    async def serve_first_request() -> dict:
+        import httpx
+        from App.routes.auth import create_token
+
+        async with app.router.lifespan_context(app):
+            ready = time.perf_counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+                r = await client.get(
+                    "/api/v1/categories",
+                    headers={"Authorization": f"Bearer {create_token(1, 'startup', 'admin')}"},
+                )
+            served = time.perf_counter()
+            assert r.status_code == 200, r.text
+        return {
+            "import": (imported - started) * 1000,
+            "startup": (ready - imported) * 1000,
+            "first request": (served - ready) * 1000,
+            "routes": len(app.routes),
+        }
+
+    print("STARTUP " + json.dumps(asyncio.run(serve_first_request())))
+
+
+def migrate(database_url: str) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        env={**os.environ, "DATABASE_URL": database_url},
+        check=True,
+        capture_output=True,
+    )
+    # The user the first request's token names; its token version is checked
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, username, email, hashed_password, role, is_active, token_version) "
+            "SELECT 1, 'startup', 'startup@example.com', 'x', 'ADMIN', 1, 0 "
+            "WHERE NOT EXISTS (SELECT 1 FROM users WHERE id = 1)"
+        ))
+    engine.dispose()
+
+
+def measure(database_url: str, fast_startup: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "App.test.check_startup_time", "--child"],
+        env={**os.environ, "DATABASE_URL": database_url, "FAST_STARTUP": fast_startup},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    line = next(l for l in out.splitlines() if l.startswith("STARTUP "))
+    return json.loads(line[len("STARTUP "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode")
+    parser.add_argument("--budget-ms", type=float, default=3000.0,
+                        help="max median import + startup + first request with FAST_STARTUP")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    database_url = os.getenv("DATABASE_URL") or \
+        f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='check-startup-'), 'startup.db')}"
+    migrate(database_url)
+
+    totals = {}
+    print(f"{'mode':8} {'import':>9} {'startup':>9} {'1st req':>9} {'total':>9} {'routes':>7}   (median ms)")
+    for mode, flag in MODES.items():
+        runs = [measure(database_url, flag) for _ in range(args.runs)]
+        medians = {phase: statistics.median(r[phase] for r in runs) for phase in PHASES}
+        totals[mode] = statistics.median(sum(r[phase] for phase in PHASES) for r in runs)
+        print(f"{mode:8} {medians['import']:>9.1f} {medians['startup']:>9.1f} "
+              f"{medians['first request']:>9.1f} {totals[mode]:>9.1f} {runs[0]['routes']:>7}")
+
+    if totals["fast"] > args.budget_ms:
+        print(f"\nFAST_STARTUP cold start {totals['fast']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\nFAST_STARTUP cold start {totals['fast']:.0f} ms is within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Stress test: catalogue reads during a login storm.
+
+Seeds a throwaway SQLite database with one bcrypt user, then drives the app
+in-process (ASGI): --readers clients loop over the catalogue list endpoints
+for --seconds, first alone and then alongside --logins clients posting to
+/auth/login as fast as they can. Prints read latency for both phases, how
+many logins succeeded or were shed with 503, and the hashing pool stats.
+
+Run from the Backend directory (needs httpx):
+    python -m App.test.stress_login --logins 64 --readers 8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+READ_PATHS = ["/api/v1/categories", "/api/v1/suppliers", "/api/v1/products"]
+
+
+def seed() -> None:
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Supplier, Category, Product, User
+    from App.models.user import UserRole
+    from App.utils.password_pool import bcrypt_hash
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(id=1, username="storm", email="storm@example.com",
+                hashed_password=bcrypt_hash("storm-password"), role=UserRole.ADMIN))
+    db.add_all([Supplier(id=i, name=f"Supplier {i}", email=f"s{i}@example.com") for i in range(1, 11)])
+    db.add_all([Category(id=i, name=f"Category {i}") for i in range(1, 11)])
+    db.flush()
+    db.add_all([
+        Product(id=i, name=f"Product {i}", sku=f"SKU-{i}", quantity=100, price=10.0,
+                supplier_id=i % 10 + 1, category_id=i % 10 + 1)
+        for i in range(1, 201)
+    ])
+    db.commit()
+    db.close()
+
+
+def percentile(samples, pct: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct))] if samples else 0.0
+
+
+async def run(args) -> None:
+    import httpx
+    from App.main import app
+    from App.routes.auth import create_token
+    from App.utils.password_pool import password_pool
+
+    headers = {"Authorization": f"Bearer {create_token(1, 'storm', 'admin')}"}
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def reader(deadline: float, latencies: list) -> None:
+            i = 0
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                r = await client.get(READ_PATHS[i % len(READ_PATHS)], headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert r.status_code == 200, r.text
+                i += 1
+
+        async def login(deadline: float, outcomes: dict) -> None:
+            while time.perf_counter() < deadline:
+                r = await client.post("/api/v1/auth/login", data={"username": "storm", "password": "storm-password"})
+                outcomes[r.status_code] = outcomes.get(r.status_code, 0) + 1
+                if r.status_code == 503:
+                    await asyncio.sleep(0.05)
+
+        # Warm up the worker processes so the storm phase doesn't pay for spawning them
+        await client.post("/api/v1/auth/login", data={"username": "storm", "password": "storm-password"})
+
+        phases = {}
+        for phase, logins in (("reads alone", 0), ("reads + logins", args.logins)):
+            latencies, outcomes = [], {}
+            deadline = time.perf_counter() + args.seconds
+            await asyncio.gather(
+                *(reader(deadline, latencies) for _ in range(args.readers)),
+                *(login(deadline, outcomes) for _ in range(logins)),
+            )
+            phases[phase] = latencies
+            print(f"{phase:15} reads={len(latencies):6}  p50={statistics.median(latencies):7.2f} ms  "
+                  f"p95={percentile(latencies, 0.95):7.2f} ms  logins={outcomes or '-'}")
+
+    stats = password_pool.stats()
+    print(f"\nhashing pool: workers={stats['workers']} max_queue={stats['max_queue']} "
+          f"completed={stats['completed']} rejected={stats['rejected']}")
+    password_pool.shutdown()
+
+    slowdown = percentile(phases["reads + logins"], 0.95) / max(percentile(phases["reads alone"], 0.95), 1e-9)
+    print(f"read p95 slowdown under the login storm: {slowdown:.1f}x")
+    if args.max_slowdown and slowdown > args.max_slowdown:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent catalogue readers")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each phase")
+    parser.add_argument("--max-slowdown", type=float, default=0.0,
+                        help="exit 1 if read p95 grows more than this factor during the storm (0 = report only)")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='stress-login-'), 'stress.db')}"
+    seed()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
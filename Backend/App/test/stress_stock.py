@@ -0,0 +1,86 @@
+"""
+Stress harness: N parallel sales against one hot product.
+
+Seeds a product with a fixed stock level, fires `--sales` concurrent
+create_sale_transaction calls (one unit each) from `--workers` threads, and
+reports throughput, outcomes and the oversell count (units sold beyond the
+starting stock). A correct implementation always reports oversold = 0.
+
+Run from the Backend directory (uses a throwaway SQLite database unless
+DATABASE_URL is already set):
+    python -m App.test.stress_stock --stock 100 --sales 300 --workers 32
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--sales", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        db_path = os.path.join(tempfile.mkdtemp(prefix="stress-stock-"), "stress.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from App.database import Base, engine, SessionLocal
+    from App import models
+    from App.models import Product, Supplier, SaleItem
+    from App.schemas import SaleTransactionCreate
+    from App.curd.sale import create_sale_transaction
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    supplier = Supplier(name="Stress supplier", email=f"stress-{time.time_ns()}@example.com")
+    db.add(supplier)
+    db.flush()
+    product = Product(name="Hot SKU", sku=f"HOT-{time.time_ns()}", quantity=args.stock, price=1.0,
+                      supplier_id=supplier.id)
+    db.add(product)
+    db.commit()
+    product_id = product.id
+    db.close()
+
+    sale_in = SaleTransactionCreate(items=[{"product_id": product_id, "quantity": 1, "unit_price": 1.0}])
+
+    def one_sale(_):
+        session = SessionLocal()
+        try:
+            create_sale_transaction(session, sale_in)
+            return "sold"
+        except ValueError as e:
+            return "out_of_stock" if "Not enough stock" in str(e) else f"error: {str(e)[:80]}"
+        except Exception as e:
+            return f"error: {type(e).__name__}"
+        finally:
+            session.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        outcomes = Counter(pool.map(one_sale, range(args.sales)))
+    elapsed = time.perf_counter() - start
+
+    db = SessionLocal()
+    final_quantity = db.query(Product.quantity).filter(Product.id == product_id).scalar()
+    units_sold = sum(q for (q,) in db.query(SaleItem.quantity).filter(SaleItem.product_id == product_id))
+    db.close()
+
+    print(f"sales attempted : {args.sales} ({args.workers} workers)")
+    print(f"elapsed         : {elapsed:.2f}s ({args.sales / elapsed:.1f} sales/s)")
+    for outcome, count in outcomes.most_common():
+        print(f"  {outcome:40} {count}")
+    print(f"starting stock  : {args.stock}")
+    print(f"units sold      : {units_sold}")
+    print(f"final quantity  : {final_quantity}")
+    print(f"oversold        : {max(0, units_sold - args.stock)}")
+    print(f"stock mismatch  : {args.stock - units_sold - final_quantity}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,24 @@
 """
 Authentication utilities for JWT token handling and password hashing.
 """
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import os
 from dotenv import load_dotenv
 
+from App.utils.password_pool import password_pool, bcrypt_hash, bcrypt_verify
+
 load_dotenv()
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PASSWORD HASHING CONFIGURATION
 # ═══════════════════════════════════════════════════════════════════════════
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt runs on the bounded worker pool in App.utils.password_pool. The
+# hashes are standard $2b$ strings (what passlib's bcrypt scheme produced),
+# but bcrypt is called directly: passlib 1.7's backend self-test fails
+# against bcrypt 5.
+# All four functions raise PasswordHashingBusy when the pool is saturated.
 
 
 def hash_password(password: str) -> str:
@@ -29,7 +34,7 @@ def hash_password(password: str) -> str:
     Example:
         hashed = hash_password("MySecurePassword123")
     """
-    return pwd_context. hash(password)
+    return password_pool.run(bcrypt_hash, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -43,10 +48,17 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    try:
-        return pwd_context.verify(plain_password, hashed_password)
-    except Exception: 
-        return False
+    return password_pool.run(bcrypt_verify, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password for async routes - awaits the pool instead of blocking a thread"""
+    return await password_pool.run_async(bcrypt_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async routes"""
+    return await password_pool.run_async(bcrypt_verify, plain_password, hashed_password)
 
 
 # ═══════════════════════════════════════════════════════════════════════════
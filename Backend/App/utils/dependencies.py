@@ -1,33 +1,42 @@
-from typing import Generator, Optional
-from sqlalchemy. orm import Session
+from typing import Optional, Union
 
-# ✅ Import directly from database module using relative path
-# DON'T import from App.database - that causes circular import
-from sqlalchemy. orm import sessionmaker
-from sqlalchemy import create_engine
-import os
-from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-load_dotenv()
+# One engine and session factory per process - re-exported so existing
+# `from App.utils.dependencies import get_db` imports keep working
+from App.database import engine, SessionLocal, get_db, get_async_db, async_db_enabled
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL not found")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# What a read_db dependency hands the handler
+ReadSession = Union[Session, AsyncSession]
 
 
-def get_db() -> Generator: 
-    """Database session generator"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally: 
-        db.close()
+def read_db(router_name: str):
+    """
+    Session dependency for a router's read routes: get_async_db when the
+    router is listed in ASYNC_DB_ROUTERS, get_db otherwise. The handler is
+    async either way and calls its CRUD function through run_read.
+    """
+    return get_async_db if async_db_enabled(router_name) else get_db
+
+
+async def run_read(db, sync_fn, async_fn, *args, **kwargs):
+    """Run async_fn on an AsyncSession, or sync_fn on a Session in the threadpool"""
+    if isinstance(db, AsyncSession):
+        return await async_fn(db, *args, **kwargs)
+    return await run_in_threadpool(sync_fn, db, *args, **kwargs)
 
 
 class PaginationParams:
     def __init__(self, skip: int = 0, limit: int = 100):
         self.skip = max(0, skip)
-        self.limit = min(limit, 100)
\ No newline at end of file
+        self.limit = min(limit, 100)
+
+
+class CursorParams:
+    """Keyset pagination for the ledger tables - see App.utils.pagination"""
+    def __init__(self, cursor: Optional[str] = None, limit: int = 100):
+        self.cursor = cursor
+        self.limit = max(1, min(limit, 100))
@@ -0,0 +1,73 @@
+"""
+Conditional GET for the catalogue reads (categories, suppliers, products).
+
+The ETag is the combined version of the tables a response is built from
+(see App.curd.catalog_version), so checking If-None-Match costs one small
+indexed read and a 304 skips the real query and the serialisation.
+"""
+import os
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from App.curd.catalog_version import get_catalog_version, get_catalog_version_async
+from App.database import get_db, get_async_db, async_db_enabled
+
+# Seconds a browser may reuse a catalogue response without asking again.
+# 0 (the default) means it must revalidate every time - cheap with a 304.
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "0"))
+CATALOG_CACHE_CONTROL = (
+    f"private, max-age={CATALOG_CACHE_MAX_AGE}" if CATALOG_CACHE_MAX_AGE > 0 else "private, no-cache"
+)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison, so a W/ prefix on either side is ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class CatalogETag:
+    """
+    Dependency for GET routes serving catalogue rows: sets ETag and
+    Cache-Control on the response, or ends the request with 304 Not
+    Modified when the client already holds the current version.
+
+        etag: dict = Depends(CatalogETag(PRODUCTS, SUPPLIERS, CATEGORIES))
+    """
+
+    def __init__(self, *tables: str):
+        self.tables = tables
+
+    def check(self, request: Request, response: Response, version: str) -> Dict[str, str]:
+        etag = f'"{version}"'
+        headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        # Also returned, for routes that build their own Response (FastAPI
+        # only copies dependency headers onto responses it creates itself)
+        return headers
+
+    def __call__(self, request: Request, response: Response, db: Session = Depends(get_db)) -> Dict[str, str]:
+        return self.check(request, response, get_catalog_version(db, self.tables))
+
+
+class AsyncCatalogETag(CatalogETag):
+    """CatalogETag for the routers running on get_async_db"""
+
+    async def __call__(
+        self, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
+    ) -> Dict[str, str]:
+        return self.check(request, response, await get_catalog_version_async(db, self.tables))
+
+
+def read_etag(router_name: str, *tables: str) -> CatalogETag:
+    """The CatalogETag on the same session as read_db(router_name)"""
+    return AsyncCatalogETag(*tables) if async_db_enabled(router_name) else CatalogETag(*tables)
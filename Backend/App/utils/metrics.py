@@ -0,0 +1,49 @@
+"""
+Lightweight in-process metrics primitives.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence
+
+
+# Seconds; tuned for DB/HTTP latencies from sub-millisecond up to a few seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (Prometheus style: each bucket counts values <= its bound).
+
+    threadsafe=False drops the lock from observe(); only for histograms
+    with a single writer thread, e.g. ones fed from the event loop.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, threadsafe: bool = True):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+        if not threadsafe:
+            self.observe = self._observe_unlocked
+
+    def observe(self, value: float) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self._sum += value
+
+    def _observe_unlocked(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self._sum += value
+
+    def snapshot(self) -> Dict:
+        """Cumulative bucket counts keyed by upper bound, plus count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = {}
+        running = 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], counts):
+            running += n
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
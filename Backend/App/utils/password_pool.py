@@ -0,0 +1,186 @@
+"""
+Bounded process pool for password hashing.
+
+bcrypt costs a few hundred milliseconds of CPU per call by design. Run on
+Starlette's shared threadpool, a burst of logins takes every thread and
+the GIL with it, and unrelated sync routes queue behind them. Hashes run
+here instead, on PASSWORD_HASH_WORKERS separate processes. At most
+PASSWORD_HASH_MAX_QUEUE more calls may wait; beyond that callers get
+PasswordHashingBusy (the app answers 503 with Retry-After) instead of
+queueing without bound.
+
+A slot is held until its hash has actually finished: a caller that stops
+waiting (client disconnect, timeout) doesn't free it while the job still
+sits in the executor. If a worker dies (OOM kill) the executor is replaced
+and the call retried once, instead of every later login failing.
+
+PASSWORD_HASH_WORKERS=0 hashes in the calling thread (tests, tiny setups).
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+from fastapi.concurrency import run_in_threadpool
+
+from App.utils.metrics import Histogram
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Scheduling niceness added to the worker processes, so that when CPU is
+# short the request-serving process wins it and logins wait instead
+PASSWORD_HASH_NICE = int(os.getenv("PASSWORD_HASH_NICE", "10"))
+
+# bcrypt only looks at the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Every hashing worker is busy and the wait queue is full"""
+
+
+# ─── Run inside the worker processes (module-level so they pickle) ──────
+
+def _lower_priority(niceness: int) -> None:
+    if niceness > 0 and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def bcrypt_hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode()[:BCRYPT_MAX_BYTES], bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+
+def bcrypt_verify(password: str, hashed: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode()[:BCRYPT_MAX_BYTES], hashed.encode())
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+# ─── Pool ───────────────────────────────────────────────────────────────
+
+class PasswordHashingPool:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.latency = Histogram()  # seconds from admission to result, queueing included
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the server process has threads (and DB
+                # connections) that a forked child must not inherit
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_lower_priority,
+                    initargs=(PASSWORD_HASH_NICE,),
+                )
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next call starts a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _admit(self) -> float:
+        with self._lock:
+            if self._pending >= max(self.workers, 1) + self.max_queue:
+                self._rejected += 1
+                raise PasswordHashingBusy("Too many password checks in progress, retry shortly")
+            self._pending += 1
+        return time.perf_counter()
+
+    def _release(self, started: float, completed: bool = True) -> None:
+        if completed:
+            self.latency.observe(time.perf_counter() - started)
+        with self._lock:
+            self._pending -= 1
+            self._completed += completed
+
+    def _submit(self, fn: Callable, args: tuple) -> Future:
+        """
+        Admit fn(*args) and hand it to the workers. The slot is released by the
+        future's done-callback - when the job finishes, or is cancelled before
+        it started - never by a caller that merely stopped waiting.
+        """
+        started = self._admit()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(started, completed=False)
+            raise
+        future.add_done_callback(lambda f: self._release(started, completed=not f.cancelled()))
+        return future
+
+    def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the pool and wait for it (blocks the calling thread, not its CPU)"""
+        if self.workers <= 0:
+            started = self._admit()
+            try:
+                return fn(*args)
+            finally:
+                self._release(started)
+        try:
+            return self._submit(fn, args).result()
+        except BrokenProcessPool:
+            # A worker died mid-job and took the executor with it; _submit
+            # replaces it, and hashing is safe to repeat
+            return self._submit(fn, args).result()
+
+    async def run_async(self, fn: Callable, *args) -> Any:
+        """Await fn(*args) on the pool without holding a threadpool thread"""
+        if self.workers <= 0:
+            started = self._admit()
+            try:
+                # Not abandoned on cancellation: the slot stays taken until fn returns
+                return await run_in_threadpool(fn, *args)
+            finally:
+                self._release(started)
+        try:
+            # Cancelling the wrapper cancels the job if it hasn't started yet
+            return await asyncio.wrap_future(self._submit(fn, args))
+        except BrokenProcessPool:
+            return await asyncio.wrap_future(self._submit(fn, args))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending, completed, rejected = self._pending, self._completed, self._rejected
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_progress": min(pending, max(self.workers, 1)),
+            "queued": max(0, pending - max(self.workers, 1)),
+            "completed": completed,
+            "rejected": rejected,
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHashingPool()
@@ -0,0 +1,154 @@
+"""
+Per-route request metrics, exported in Prometheus text format on /metrics.
+
+RequestMetricsMiddleware times every HTTP request and files it under its
+route template ("/api/v1/products/{product_id}", not the concrete path, so
+the label set stays bounded): a latency histogram, a histogram of the time
+spent in database statements, and counts per status code. A gauge tracks
+requests in flight.
+
+The middleware only runs on the event loop thread, so the per-route
+counters are plain ints and lock-free histograms with a single writer.
+Statement counts and time come from the engine instrumentation in
+App.database (QueryStats), made current for the length of the request and
+filed once it is done.
+
+With QUERY_DEBUG=true the middleware also adds X-Query-Count and X-DB-Time
+(milliseconds, up to the start of the response) headers and logs requests
+that repeat a statement N_PLUS_ONE_THRESHOLD times or more.
+"""
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from App.database import QUERY_DEBUG, start_query_stats, stop_query_stats
+from App.utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Label for requests that matched no route (404s, CORS preflights, ...)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "db_time", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(threadsafe=False)
+        self.db_time = Histogram(threadsafe=False)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Registry of RouteMetrics keyed by (method, route template)"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status: int, elapsed: float, db_time: float) -> None:
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(elapsed)
+        metrics.db_time.observe(db_time)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self) -> List[str]:
+        """Prometheus text lines for every route seen so far"""
+        routes = sorted(self.routes.items())
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests served, by route template and status",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), metrics in routes:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}')
+        for name, attr, help_text in (
+            ("http_request_duration_seconds", "latency", "Request latency, by route template"),
+            ("http_request_db_seconds", "db_time", "Time spent in DB statements per request, by route template"),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (method, route), metrics in routes:
+                lines += render_histogram(name, getattr(metrics, attr), _labels(method, route))
+        return lines
+
+    def reset(self) -> None:
+        self.routes.clear()
+
+
+def _labels(method: str, route: str) -> str:
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}"'
+
+
+def render_histogram(name: str, histogram: Histogram, labels: str = "") -> List[str]:
+    """One Histogram as Prometheus _bucket/_sum/_count lines"""
+    snapshot = histogram.snapshot()
+    prefix = f"{labels}," if labels else ""
+    lines = [f'{name}_bucket{{{prefix}le="{bound}"}} {count}' for bound, count in snapshot["buckets"].items()]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {snapshot['sum']}")
+    lines.append(f"{name}_count{suffix} {snapshot['count']}")
+    return lines
+
+
+def render_gauge(name: str, value: float, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware (BaseHTTPMiddleware would add a task and a
+    memory stream per request) feeding `request_metrics`.
+
+        app.add_middleware(RequestMetricsMiddleware)
+    """
+
+    def __init__(self, app, registry: RequestMetrics = request_metrics, query_debug: bool = QUERY_DEBUG):
+        self.app = app
+        self.registry = registry
+        self.query_debug = query_debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats, token = start_query_stats(track_statements=self.query_debug)
+        status = 500  # unless a response starts, the request failed
+        self.registry.in_flight += 1
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.query_debug:
+                    message = {**message, "headers": [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"x-db-time", f"{stats.db_time * 1000:.3f}".encode()),
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.registry.in_flight -= 1
+            stop_query_stats(token)
+            route = scope.get("route")
+            route = route.path_format if route is not None else UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], route, status, elapsed, stats.db_time)
+            if self.query_debug:
+                for statement, executions in stats.repeated():
+                    logger.warning(
+                        "Possible N+1: %s %s ran the same statement %d times (%d queries in total): %s",
+                        scope["method"], route, executions, stats.count, " ".join(statement.split())[:300],
+                    )
@@ -0,0 +1,56 @@
+"""
+Fast JSON encoding for the list routes.
+
+FastAPI's default path validates every row into the response model, turns
+the models into plain dicts and then runs json.dumps over those. For list
+pages this does the same in one pass inside pydantic-core: a TypeAdapter
+for the whole list is built once per schema, validates straight from ORM
+attributes (or dicts) and writes JSON bytes directly. The bytes are
+identical to FastAPI's output, so the route's response_model still
+documents the shape.
+
+orjson is optional: when installed it also encodes every other route
+(DefaultJSONResponse is the app's default_response_class).
+"""
+import os
+from typing import Any, Dict, Generic, Iterable, List, Optional, Type, TypeVar
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+DefaultJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# Set to "false" to fall back to FastAPI's own response validation/encoding
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "true").lower() == "true"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ListSerializer(Generic[ModelT]):
+    """
+    Precompiled List[schema] encoder.
+
+        product_list_json = ListSerializer(ProductResponse)
+        return product_list_json.response(get_products(db))
+    """
+
+    def __init__(self, schema: Type[ModelT]):
+        self.schema = schema
+        self.adapter = TypeAdapter(List[schema])
+
+    def encode(self, rows: Iterable[Any]) -> bytes:
+        rows = list(rows)
+        if rows and not isinstance(rows[0], self.schema):
+            rows = self.adapter.validate_python(rows, from_attributes=True)
+        return self.adapter.dump_json(rows)
+
+    def response(self, rows: Iterable[Any], headers: Optional[Dict[str, str]] = None) -> Any:
+        """A ready JSON Response, or the rows themselves when FAST_JSON_RESPONSES is off"""
+        if not FAST_JSON_RESPONSES:
+            return rows
+        return Response(content=self.encode(rows), media_type="application/json", headers=headers)
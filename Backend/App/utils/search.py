@@ -0,0 +1,111 @@
+"""
+Text helpers for product search: tokenising queries, fuzzy term matching
+and ranking candidates the database returned.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and strip accents, matching the FTS5 unicode61 tokenizer"""
+    if not text:
+        return ""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+
+@lru_cache(maxsize=65536)
+def trigrams(word: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams: the word padded with two spaces in front and one behind"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: str, b: str) -> float:
+    """Share of trigrams two words have in common (0..1), like pg_trgm's similarity()"""
+    ta, tb = trigrams(a), trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def within_edit_distance(a: str, b: str, max_distance: int) -> bool:
+    """Levenshtein distance <= max_distance, giving up as soon as every path exceeds it"""
+    if abs(len(a) - len(b)) > max_distance:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return False
+        previous = current
+    return previous[-1] <= max_distance
+
+
+def max_typos(term: str) -> int:
+    """Edits tolerated for a query word: none for short words, then one per four characters"""
+    return 0 if len(term) < 4 else min(2, len(term) // 4)
+
+
+def literal_score(term: str, word: str) -> float:
+    """exact > prefix > substring; 0 when the word doesn't contain the query word"""
+    if word == term:
+        return 1.0
+    if word.startswith(term):
+        return 0.9
+    if term in word:
+        return 0.7
+    return 0.0
+
+
+class QueryScorer:
+    """
+    How well each word of one query matches a field's words: its best
+    literal_score, or 0.6 * trigram similarity when nothing matched literally
+    (below every literal match). Candidates share most of their words, so
+    each word is scored against the query once and remembered.
+    """
+
+    def __init__(self, terms: List[str]):
+        self.terms = terms
+        self._literal: Dict[str, Tuple[float, ...]] = {}
+        self._fuzzy: Dict[str, Tuple[float, ...]] = {}
+        self._texts: Dict[str, List[float]] = {}
+
+    def field(self, words: List[str]) -> List[float]:
+        """The score of each query word against `words`"""
+        if not words:
+            return [0.0] * len(self.terms)
+        literal, fuzzy = self._literal, self._fuzzy
+        best = list(map(max, zip(*[literal.get(word) or self._literal_scores(word) for word in words])))
+        if not all(best):
+            similar = map(max, zip(*[fuzzy.get(word) or self._fuzzy_scores(word) for word in words]))
+            best = [score or fallback for score, fallback in zip(best, similar)]
+        return best
+
+    def text(self, text: str) -> List[float]:
+        """field() of the words of `text`, remembered for texts many candidates share"""
+        scores = self._texts.get(text)
+        if scores is None:
+            scores = self._texts[text] = self.field(tokenize(text))
+        return scores
+
+    def _literal_scores(self, word: str) -> Tuple[float, ...]:
+        scores = self._literal[word] = tuple(literal_score(term, word) for term in self.terms)
+        return scores
+
+    def _fuzzy_scores(self, word: str) -> Tuple[float, ...]:
+        scores = self._fuzzy[word] = tuple(0.6 * similarity(term, word) for term in self.terms)
+        return scores
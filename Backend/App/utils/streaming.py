@@ -0,0 +1,145 @@
+"""
+Helpers for streamed request and response bodies.
+"""
+import csv
+import io
+import json
+import zlib
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, Iterator, List, Optional, Sequence
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[Optional[str]]:
+    """
+    Split a streamed byte body into text lines without buffering the whole body.
+    Line terminators are stripped; a trailing line without a newline is still yielded.
+    A leading byte-order mark is dropped (utf-8-sig); a line that isn't valid in
+    `encoding` comes out as None, so callers can report it and carry on.
+    """
+    pending = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield _decode(line.rstrip(b"\r"), encoding)
+    if pending:
+        yield _decode(pending.rstrip(b"\r"), encoding)
+
+
+def _decode(line: bytes, encoding: str) -> Optional[str]:
+    try:
+        return line.decode(encoding)
+    except UnicodeDecodeError:
+        return None
+
+
+async def aiter_csv_rows(
+    lines: AsyncIterator[Optional[str]], max_record_chars: int = 1 << 20
+) -> AsyncIterator[Optional[List[str]]]:
+    """
+    Parse streamed lines (from aiter_lines) with one csv.reader, so quoted
+    fields may span lines. A line is held back while it leaves a quoted field
+    open, so the reader never runs out of input in the middle of a record.
+    Yields None in place of a record that can't be read: an undecodable line,
+    a quoted field still open after max_record_chars or at the end of the body.
+    """
+    pending: Deque[str] = deque()
+    reader = csv.reader(iter(pending.popleft, None))
+    quoted = False
+    size = 0
+    async for line in lines:
+        if line is None:
+            pending.clear()
+            quoted, size = False, 0
+            yield None
+            continue
+        # The reader only keeps a newline inside a quoted field if the line has one
+        pending.append(line + "\n")
+        size += len(line)
+        quoted = _leaves_field_open(line, quoted)
+        if quoted:
+            if size > max_record_chars:
+                pending.clear()
+                quoted, size = False, 0
+                yield None
+            continue
+        size = 0
+        try:
+            record = next(reader)
+        except csv.Error:
+            pending.clear()
+            reader = csv.reader(iter(pending.popleft, None))
+            record = None
+        yield record
+    if pending:
+        yield None
+
+
+_START, _UNQUOTED, _QUOTED, _QUOTE_IN_QUOTED = range(4)
+
+
+def _leaves_field_open(line: str, quoted: bool) -> bool:
+    """Whether csv.reader (default dialect) is inside a quoted field at the end of `line`"""
+    if '"' not in line:
+        return quoted
+    state = _QUOTED if quoted else _START
+    for ch in line:
+        if state == _QUOTED:
+            if ch == '"':
+                state = _QUOTE_IN_QUOTED
+        elif state == _QUOTE_IN_QUOTED:
+            # "" is an escaped quote; anything else closes the field
+            state = _QUOTED if ch == '"' else _START if ch == "," else _UNQUOTED
+        elif ch == ",":
+            state = _START
+        elif state == _START and ch == '"':
+            state = _QUOTED
+        else:
+            state = _UNQUOTED  # quotes inside an unquoted field are literal
+    return state == _QUOTED
+
+
+def csv_chunks(rows: Iterable[Dict], fieldnames: Sequence[str], rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Render dict rows as CSV (header first), yielding one string per
+    ``rows_per_chunk`` rows so the response isn't flushed row by row.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(rows: Iterable[Dict], rows_per_chunk: int = 500) -> Iterator[str]:
+    """Render dict rows (JSON-native values only) as newline-delimited JSON, ``rows_per_chunk`` rows per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) >= rows_per_chunk:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[str], encoding: str = "utf-8", level: int = 6) -> Iterator[bytes]:
+    """Gzip a stream of text chunks on the fly; output is a single valid gzip member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
+
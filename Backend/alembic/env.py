@@ -0,0 +1,90 @@
+"""
+Alembic environment for the Inventory Management backend.
+
+The database URL comes from DATABASE_URL (the same setting App.database uses),
+and the models' metadata is the autogenerate target. Run from the Backend
+directory:
+
+    alembic upgrade head
+    alembic revision --autogenerate -m "describe change"
+
+Upgrading an existing deployment is ``alembic upgrade head``, run before the
+new version starts. Revisions skip objects that already exist, so this works
+for databases created by Base.metadata.create_all before migrations existed
+(no stamping needed), and for ones a newer app's create_all has already
+extended. Once alembic_version exists, init_db stops calling create_all.
+"""
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+from App.database import DATABASE_URL, Base
+import App.models  # noqa: F401  - registers every table on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+# Created with raw DDL per backend (App.models.product.PRODUCT_SEARCH_DDL), so
+# they are invisible to the metadata and must not be autogenerated away
+SEARCH_INDEX_OBJECTS = ("product_search", "ix_products_search_text_")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ in ("table", "index") and name and name.startswith(SEARCH_INDEX_OBJECTS):
+        return False
+    return True
+
+
+def _url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of running it (``alembic upgrade head --sql``)."""
+    url = _url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=_is_sqlite(url),
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live connection."""
+    url = _url()
+    connectable = create_engine(url, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER most things in place; batch mode recreates the table
+            render_as_batch=_is_sqlite(url),
+            include_name=include_name,
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
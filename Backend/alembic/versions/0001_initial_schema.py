@@ -0,0 +1,174 @@
+"""initial schema
+
+Tables as created by Base.metadata.create_all before migrations were added.
+
+Every revision skips tables, columns and indexes that already exist, so
+``alembic upgrade head`` is the whole upgrade for any database: an empty
+one, one created by create_all before migrations existed (no stamping
+needed), or one the new app already booted against and create_all extended.
+Run it before starting the new version - its models read columns that only
+the migrations add to existing tables.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases that predate migrations already have every table
+    if _has_table("categories"):
+        return
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"], unique=False)
+
+    op.create_table(
+        "suppliers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("contact_person", sa.String(length=100), nullable=True),
+        sa.Column("email", sa.String(length=100), nullable=True),
+        sa.Column("phone", sa.String(length=20), nullable=True),
+        sa.Column("address", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_index("ix_suppliers_id", "suppliers", ["id"], unique=False)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("full_name", sa.String(length=100), nullable=True),
+        sa.Column("role", sa.Enum("ADMIN", "MANAGER", "STAFF", name="userrole"), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"], unique=False)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("sku", sa.String(length=50), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=True),
+        sa.Column("reorder_level", sa.Integer(), nullable=True),
+        sa.Column("supplier_id", sa.Integer(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["supplier_id"], ["suppliers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("sku"),
+    )
+    op.create_index("ix_products_id", "products", ["id"], unique=False)
+
+    op.create_table(
+        "sales",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("invoice_number", sa.String(length=50), nullable=False),
+        sa.Column("customer_name", sa.String(length=100), nullable=True),
+        sa.Column("customer_email", sa.String(length=100), nullable=True),
+        sa.Column("customer_phone", sa.String(length=20), nullable=True),
+        sa.Column("total_amount", sa.Float(), nullable=False),
+        sa.Column("payment_method", sa.String(length=50), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("invoice_number"),
+    )
+    op.create_index("ix_sales_id", "sales", ["id"], unique=False)
+
+    op.create_table(
+        "inventory_transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "transaction_type",
+            sa.Enum("STOCK_IN", "STOCK_OUT", "ADJUSTMENT", "RETURN", name="transactiontype"),
+            nullable=False,
+        ),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=True),
+        sa.Column("total_price", sa.Float(), nullable=True),
+        sa.Column("reference_number", sa.String(length=100), nullable=True),
+        sa.Column("notes", sa.String(length=255), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_inventory_transactions_id", "inventory_transactions", ["id"], unique=False)
+
+    op.create_table(
+        "sale_items",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sale_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("unit_price", sa.Float(), nullable=False),
+        sa.Column("total_price", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["product_id"], ["products.id"]),
+        sa.ForeignKeyConstraint(["sale_id"], ["sales.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_sale_items_id", "sale_items", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sale_items_id", table_name="sale_items")
+    op.drop_table("sale_items")
+    op.drop_index("ix_inventory_transactions_id", table_name="inventory_transactions")
+    op.drop_table("inventory_transactions")
+    op.drop_index("ix_sales_id", table_name="sales")
+    op.drop_table("sales")
+    op.drop_index("ix_products_id", table_name="products")
+    op.drop_table("products")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_suppliers_id", table_name="suppliers")
+    op.drop_table("suppliers")
+    op.drop_index("ix_categories_id", table_name="categories")
+    op.drop_table("categories")
+    sa.Enum(name="transactiontype").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="userrole").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,64 @@
+"""keyset pagination indexes and invoice counters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match App.models.invoice_counter.INVOICE_BLOCK_SIZE
+INVOICE_BLOCK_SIZE = 100
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _has_index(table: str, name: str) -> bool:
+    # Base.metadata.create_all may have created it before this revision ran
+    return name in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_index("sales", "ix_sales_created_at_id"):
+        op.create_index("ix_sales_created_at_id", "sales", ["created_at", "id"], unique=False)
+    if not _has_index("inventory_transactions", "ix_inventory_transactions_created_at_id"):
+        op.create_index(
+            "ix_inventory_transactions_created_at_id",
+            "inventory_transactions",
+            ["created_at", "id"],
+            unique=False,
+        )
+
+    if not _has_table("invoice_counters"):
+        op.create_table(
+            "invoice_counters",
+            sa.Column("name", sa.String(length=50), nullable=False),
+            sa.Column("next_value", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("name"),
+        )
+    if op.get_bind().dialect.supports_sequences:
+        op.execute(sa.schema.CreateSequence(
+            sa.Sequence("invoice_number_seq", start=1, increment=INVOICE_BLOCK_SIZE), if_not_exists=True
+        ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.supports_sequences:
+        op.execute(sa.schema.DropSequence(sa.Sequence("invoice_number_seq")))
+    op.drop_table("invoice_counters")
+    op.drop_index("ix_inventory_transactions_created_at_id", table_name="inventory_transactions")
+    op.drop_index("ix_sales_created_at_id", table_name="sales")
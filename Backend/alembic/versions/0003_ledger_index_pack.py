@@ -0,0 +1,45 @@
+"""ledger index pack
+
+Foreign-key indexes for the ledger tables. sale_items.sale_id backs the
+selectin load of a sale's lines, sale_items.product_id the per-product sales
+lookups, and (product_id, created_at) a product's inventory history.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index(table: str, name: str) -> bool:
+    # Base.metadata.create_all may have created it before this revision ran
+    return name in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, name, columns in (
+        ("sale_items", "ix_sale_items_sale_id", ["sale_id"]),
+        ("sale_items", "ix_sale_items_product_id", ["product_id"]),
+        ("inventory_transactions", "ix_inventory_transactions_product_id_created_at", ["product_id", "created_at"]),
+    ):
+        if not _has_index(table, name):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_inventory_transactions_product_id_created_at", table_name="inventory_transactions")
+    op.drop_index("ix_sale_items_product_id", table_name="sale_items")
+    op.drop_index("ix_sale_items_sale_id", table_name="sale_items")
@@ -0,0 +1,64 @@
+"""daily sales rollups
+
+Creates the rollup tables empty. Backfill existing sales afterwards with
+``python -m App.scripts.rebuild_sales_rollups``.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    # Base.metadata.create_all may have created it before this revision ran
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_table("daily_product_sales"):
+        op.create_table(
+            "daily_product_sales",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("product_id", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("day", "product_id"),
+        )
+    if not _has_table("daily_category_sales"):
+        op.create_table(
+            "daily_category_sales",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("category_id", sa.Integer(), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("day", "category_id"),
+        )
+    if not _has_table("daily_payment_sales"):
+        op.create_table(
+            "daily_payment_sales",
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("payment_method", sa.String(length=50), nullable=False),
+            sa.Column("sale_count", sa.Integer(), nullable=False),
+            sa.Column("revenue", sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint("day", "payment_method"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_payment_sales")
+    op.drop_table("daily_category_sales")
+    op.drop_table("daily_product_sales")
@@ -0,0 +1,79 @@
+"""product low-stock flag
+
+Adds products.is_low_stock (quantity <= reorder_level, maintained by the
+CRUD layer) and low_stock_changed_at for the changes feed, indexes both and
+backfills the flag for existing rows. Only rows that are low at migration
+time get a change timestamp (NULL is "never changed"), so the feed starts
+with the current watch list rather than the whole catalogue.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match App.models.product.DEFAULT_REORDER_LEVEL
+DEFAULT_REORDER_LEVEL = 10
+
+
+def _has_column(table: str, name: str) -> bool:
+    # Base.metadata.create_all may have created it before this revision ran
+    return name in {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _has_index(table: str, name: str) -> bool:
+    return name in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A products table created with the flag has been maintaining it all along
+    if not _has_column("products", "is_low_stock"):
+        op.add_column("products", sa.Column("is_low_stock", sa.Boolean(), server_default=sa.false(), nullable=False))
+        op.add_column("products", sa.Column("low_stock_changed_at", sa.DateTime(), nullable=True))
+
+        products = sa.table(
+            "products",
+            sa.column("quantity", sa.Integer),
+            sa.column("reorder_level", sa.Integer),
+            sa.column("is_low_stock", sa.Boolean),
+            sa.column("low_stock_changed_at", sa.DateTime),
+        )
+        is_low = sa.func.coalesce(products.c.quantity, 0) <= sa.func.coalesce(
+            products.c.reorder_level, DEFAULT_REORDER_LEVEL
+        )
+        # Only products that are low now enter the changes feed; stamping every
+        # row would replay the whole catalogue to the first poll
+        op.execute(
+            products.update().values(
+                is_low_stock=is_low,
+                low_stock_changed_at=sa.case((is_low, sa.func.current_timestamp()), else_=sa.null()),
+            )
+        )
+
+    for name, columns in (
+        ("ix_products_is_low_stock_id", ["is_low_stock", "id"]),
+        ("ix_products_low_stock_changed_at_id", ["low_stock_changed_at", "id"]),
+    ):
+        if not _has_index("products", name):
+            op.create_index(name, "products", columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_low_stock_changed_at_id", table_name="products")
+    op.drop_index("ix_products_is_low_stock_id", table_name="products")
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.drop_column("low_stock_changed_at")
+        batch_op.drop_column("is_low_stock")
@@ -0,0 +1,113 @@
+"""product search
+
+Adds products.search_text ("name sku supplier category"), backfills it and
+builds the backend's full-text index over it: FTS5 plus sync triggers on
+SQLite, pg_trgm GIN on PostgreSQL, FULLTEXT on MySQL. Also indexes
+products.supplier_id and category_id, which renames use to refresh it.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5("
+        "search_text, content='products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS product_search_vocab USING fts5vocab(product_search, 'row')",
+        "CREATE TRIGGER IF NOT EXISTS products_search_ai AFTER INSERT ON products BEGIN "
+        "INSERT INTO product_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS products_search_ad AFTER DELETE ON products BEGIN "
+        "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+        "CREATE TRIGGER IF NOT EXISTS products_search_au AFTER UPDATE OF search_text ON products BEGIN "
+        "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+        "INSERT INTO product_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+        # Index the rows backfilled above
+        "INSERT INTO product_search(product_search) VALUES ('rebuild')",
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_products_search_text_trgm ON products USING gin (search_text gin_trgm_ops)",
+    ],
+    "mysql": [
+        "CREATE FULLTEXT INDEX ix_products_search_text_ft ON products (search_text)",
+    ],
+}
+
+DROP_SEARCH_DDL = {
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS products_search_au",
+        "DROP TRIGGER IF EXISTS products_search_ad",
+        "DROP TRIGGER IF EXISTS products_search_ai",
+        "DROP TABLE IF EXISTS product_search_vocab",
+        "DROP TABLE IF EXISTS product_search",
+    ],
+    "postgresql": ["DROP INDEX IF EXISTS ix_products_search_text_trgm"],
+    "mysql": ["DROP INDEX ix_products_search_text_ft ON products"],
+}
+
+
+def _has_column(table: str, name: str) -> bool:
+    # Base.metadata.create_all may have created it before this revision ran
+    return name in {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def _has_index(table: str, name: str) -> bool:
+    return name in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_column("products", "search_text"):
+        op.add_column("products", sa.Column("search_text", sa.String(length=320), nullable=True))
+    for name, column in (("ix_products_supplier_id", "supplier_id"), ("ix_products_category_id", "category_id")):
+        if not _has_index("products", name):
+            op.create_index(name, "products", [column], unique=False)
+
+    products = sa.table(
+        "products",
+        sa.column("name", sa.String),
+        sa.column("sku", sa.String),
+        sa.column("supplier_id", sa.Integer),
+        sa.column("category_id", sa.Integer),
+        sa.column("search_text", sa.String),
+    )
+    suppliers = sa.table("suppliers", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    categories = sa.table("categories", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    supplier_name = sa.select(suppliers.c.name).where(suppliers.c.id == products.c.supplier_id).scalar_subquery()
+    category_name = sa.select(categories.c.name).where(categories.c.id == products.c.category_id).scalar_subquery()
+    op.execute(
+        products.update().values(
+            search_text=sa.func.coalesce(products.c.name, "") + " " + sa.func.coalesce(products.c.sku, "") + " "
+            + sa.func.coalesce(supplier_name, "") + " " + sa.func.coalesce(category_name, "")
+        )
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "mysql" and _has_index("products", "ix_products_search_text_ft"):
+        return  # MySQL has no CREATE FULLTEXT INDEX IF NOT EXISTS
+    for statement in SEARCH_DDL.get(dialect, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in DROP_SEARCH_DDL.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+    op.drop_index("ix_products_category_id", table_name="products")
+    op.drop_index("ix_products_supplier_id", table_name="products")
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.drop_column("search_text")
@@ -0,0 +1,40 @@
+"""catalog version counters
+
+Creates the counters behind the category, supplier and product ETags.
+They start empty (version 0) and count up from the first write.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Base.metadata.create_all may have created it before this revision ran
+    if sa.inspect(op.get_bind()).has_table("catalog_versions"):
+        return
+    op.create_table(
+        "catalog_versions",
+        sa.Column("table_name", sa.String(length=50), nullable=False),
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name", "shard"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("catalog_versions")
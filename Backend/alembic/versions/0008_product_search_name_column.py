@@ -0,0 +1,87 @@
+"""product search name column
+
+Rebuilds SQLite's FTS5 product index with products.name as a column of its
+own next to search_text, so searches can tell name matches from supplier or
+category matches and fetch them first. Other backends are unchanged.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DROP_SEARCH_DDL = [
+    "DROP TRIGGER IF EXISTS products_search_au",
+    "DROP TRIGGER IF EXISTS products_search_ad",
+    "DROP TRIGGER IF EXISTS products_search_ai",
+    "DROP TABLE IF EXISTS product_search_vocab",
+    "DROP TABLE IF EXISTS product_search",
+]
+
+SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE product_search USING fts5("
+    "name, search_text, content='products', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE product_search_vocab USING fts5vocab(product_search, 'row')",
+    "CREATE TRIGGER products_search_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO product_search(rowid, name, search_text) VALUES (new.id, new.name, new.search_text); END",
+    "CREATE TRIGGER products_search_ad AFTER DELETE ON products BEGIN "
+    "INSERT INTO product_search(product_search, rowid, name, search_text) "
+    "VALUES ('delete', old.id, old.name, old.search_text); END",
+    "CREATE TRIGGER products_search_au AFTER UPDATE OF name, search_text ON products BEGIN "
+    "INSERT INTO product_search(product_search, rowid, name, search_text) "
+    "VALUES ('delete', old.id, old.name, old.search_text); "
+    "INSERT INTO product_search(rowid, name, search_text) VALUES (new.id, new.name, new.search_text); END",
+    "INSERT INTO product_search(product_search) VALUES ('rebuild')",
+]
+
+# 0006's single-column index
+PREVIOUS_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE product_search USING fts5("
+    "search_text, content='products', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE product_search_vocab USING fts5vocab(product_search, 'row')",
+    "CREATE TRIGGER products_search_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER products_search_ad AFTER DELETE ON products BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+    "CREATE TRIGGER products_search_au AFTER UPDATE OF search_text ON products BEGIN "
+    "INSERT INTO product_search(product_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+    "INSERT INTO product_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "INSERT INTO product_search(product_search) VALUES ('rebuild')",
+]
+
+
+def _has_name_column() -> bool:
+    # Base.metadata.create_all may have built the new index already
+    inspector = sa.inspect(op.get_bind())
+    return inspector.has_table("product_search") and "name" in {
+        column["name"] for column in inspector.get_columns("product_search")
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite" or _has_name_column():
+        return
+    for statement in DROP_SEARCH_DDL + SEARCH_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in DROP_SEARCH_DDL + PREVIOUS_SEARCH_DDL:
+        op.execute(statement)
@@ -0,0 +1,58 @@
+"""refresh token rotation and access token versions
+
+Adds users.token_version, which access tokens carry and which a role
+change or deletion bumps to refuse the tokens issued before, and the
+refresh_tokens table that records every issued refresh token so each can
+be spent once.
+
+Refresh tokens issued before this revision have no jti and are refused,
+so their users log in again once.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Base.metadata.create_all may have created either before this revision ran
+    inspector = sa.inspect(op.get_bind())
+    if "token_version" not in {column["name"] for column in inspector.get_columns("users")}:
+        op.add_column("users", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+    if not inspector.has_table("refresh_tokens"):
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("jti", sa.String(length=32), nullable=False),
+            sa.Column("family", sa.String(length=32), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("used_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+            sa.PrimaryKeyConstraint("jti"),
+        )
+        op.create_index("ix_refresh_tokens_family", "refresh_tokens", ["family"], unique=False)
+        op.create_index(
+            "ix_refresh_tokens_user_id_expires_at", "refresh_tokens", ["user_id", "expires_at"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_refresh_tokens_user_id_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_family", table_name="refresh_tokens")
+    op.drop_table("refresh_tokens")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,49 @@
+"""sale item category
+
+Adds sale_items.category_id, the product's category at the time of the
+sale. The category rollups are keyed by it, so rebuilding them no longer
+moves past sales to a product's current category.
+
+Existing lines are backfilled with their product's category as of this
+migration, which is the best record there is of where they were sold.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A sale_items table created with the column has been filling it all along
+    if "category_id" in {column["name"] for column in sa.inspect(op.get_bind()).get_columns("sale_items")}:
+        return
+    op.add_column("sale_items", sa.Column("category_id", sa.Integer(), nullable=True))
+
+    sale_items = sa.table("sale_items", sa.column("product_id", sa.Integer), sa.column("category_id", sa.Integer))
+    products = sa.table("products", sa.column("id", sa.Integer), sa.column("category_id", sa.Integer))
+    op.execute(
+        sale_items.update().values(
+            category_id=sa.select(products.c.category_id)
+            .where(products.c.id == sale_items.c.product_id)
+            .scalar_subquery()
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("sale_items") as batch_op:
+        batch_op.drop_column("category_id")
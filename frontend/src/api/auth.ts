@@ -18,7 +18,9 @@ export interface RegisterRequest {
 
 export interface AuthTokens {
   access_token: string;
+  refresh_token: string;
   token_type: string;
+  expires_in: number;
 }
 
 export interface UserProfile {
@@ -38,7 +40,12 @@ export const tokenStorage = {
   
   setToken: (token: string): void => localStorage.setItem("token", token),
   
-  clearToken: (): void => localStorage.removeItem("token"),
+  setRefreshToken: (token: string): void => localStorage.setItem("refresh_token", token),
+
+  clearToken: (): void => {
+    localStorage.removeItem("token");
+    localStorage.removeItem("refresh_token");
+  },
   
   // Decode token to get role without API call
   getPayload: (): { sub: string; username: string; role: string } | null => {
@@ -73,6 +80,7 @@ export const authApi = {
     });
 
     tokenStorage.setToken(response.data. access_token);
+    tokenStorage.setRefreshToken(response.data.refresh_token);
     return response.data;
   },
 
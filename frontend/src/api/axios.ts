@@ -13,12 +13,45 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
-// Redirect to login if 401 error
+// Access tokens are short-lived: on a 401, swap the refresh token for a new
+// pair once and retry. Concurrent 401s share the same refresh call.
+let refreshing: Promise<string> | null = null;
+
+const refreshAccessToken = (): Promise<string> => {
+  if (!refreshing) {
+    const refresh_token = localStorage.getItem("refresh_token");
+    refreshing = (refresh_token
+      ? axios.post(`${api.defaults.baseURL}/auth/refresh`, { refresh_token }).then((res) => {
+          localStorage.setItem("token", res.data.access_token);
+          localStorage.setItem("refresh_token", res.data.refresh_token);
+          return res.data.access_token as string;
+        })
+      : Promise.reject(new Error("No refresh token"))
+    ).finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+};
+
+// Redirect to login if 401 error (and the token can't be refreshed)
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config;
+    if (error.response?.status === 401 && original && !original._retried && !original.url?.startsWith("/auth/login")) {
+      original._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        original.headers.Authorization = `Bearer ${token}`;
+        return api(original);
+      } catch {
+        // fall through to the login redirect
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem("token");
+      localStorage.removeItem("refresh_token");
       window.location.href = "/login";
     }
     return Promise. reject(error);
@@ -10,6 +10,18 @@ export interface DashboardStats {
   recentTransactions: number;
 }
 
+export interface DashboardSummaryResponse {
+  total_products: number;
+  low_stock_count: number;
+  total_categories: number;
+  total_suppliers: number;
+  total_sales: number;
+  total_revenue: number;
+  total_inventory_value: number;
+  total_transactions: number;
+  generated_at: string;
+}
+
 export interface ProductSummary {
   id: number;
   name: string;
@@ -47,11 +59,21 @@ export interface CategorySummary {
 }
 
 export const dashboardApi = {
+  getSummary: async (): Promise<DashboardSummaryResponse> => {
+    const response = await api.get<DashboardSummaryResponse>("/dashboard/summary");
+    return response.data;
+  },
+
   getProducts: async (): Promise<ProductSummary[]> => {
     const response = await api. get<ProductSummary[]>("/products");
     return response.data;
   },
 
+  getLowStock: async (limit = 5): Promise<ProductSummary[]> => {
+    const response = await api.get<ProductSummary[]>("/products/low-stock", { params: { limit } });
+    return response.data;
+  },
+
   getSales: async (): Promise<SaleSummary[]> => {
     const response = await api.get<SaleSummary[]>("/sales");
     return response. data;
@@ -45,9 +45,10 @@ const getToken = (): string | null => {
   }
 };
 
-const setToken = (token: string): void => {
+const setToken = (token: string, refreshToken: string): void => {
   try {
     localStorage. setItem("token", token);
+    localStorage.setItem("refresh_token", refreshToken);
   } catch {
     console.error("Failed to save token");
   }
@@ -56,6 +57,7 @@ const setToken = (token: string): void => {
 const clearToken = (): void => {
   try {
     localStorage. removeItem("token");
+    localStorage.removeItem("refresh_token");
   } catch {
     console.error("Failed to clear token");
   }
@@ -106,7 +108,7 @@ export function AuthProvider({ children }: { children:  ReactNode }) {
       headers: { "Content-Type":  "multipart/form-data" },
     });
 
-    setToken(res.data.access_token);
+    setToken(res.data.access_token, res.data.refresh_token);
 
     const userRes = await api.get("/auth/me");
     setUser(userRes.data);
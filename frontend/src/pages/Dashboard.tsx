@@ -36,6 +36,7 @@ import {
   type SaleSummary,
   type TransactionSummary,
   type CategorySummary,
+  type DashboardSummaryResponse,
 } from "@/api/dashboard";
 
 // Stat Card Component
@@ -95,29 +96,32 @@ function StatCardSkeleton() {
 
 export default function Dashboard() {
   const [products, setProducts] = useState<ProductSummary[]>([]);
+  const [lowStockProducts, setLowStockProducts] = useState<ProductSummary[]>([]);
   const [sales, setSales] = useState<SaleSummary[]>([]);
   const [transactions, setTransactions] = useState<TransactionSummary[]>([]);
   const [categories, setCategories] = useState<CategorySummary[]>([]);
-  const [suppliersCount, setSuppliersCount] = useState(0);
+  const [summary, setSummary] = useState<DashboardSummaryResponse | null>(null);
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
 
   const fetchData = async () => {
     try {
-      const [productsData, salesData, transactionsData, categoriesData, suppliersData] =
+      const [summaryData, productsData, lowStockData, salesData, transactionsData, categoriesData] =
         await Promise. all([
+          dashboardApi.getSummary(),
           dashboardApi.getProducts(),
+          dashboardApi.getLowStock().catch(() => []),
           dashboardApi.getSales().catch(() => []),
           dashboardApi. getTransactions().catch(() => []),
           dashboardApi. getCategories(),
-          dashboardApi. getSuppliers(),
         ]);
 
+      setSummary(summaryData);
       setProducts(Array.isArray(productsData) ? productsData : []);
+      setLowStockProducts(Array.isArray(lowStockData) ? lowStockData : []);
       setSales(Array.isArray(salesData) ? salesData : []);
       setTransactions(Array.isArray(transactionsData) ? transactionsData : []);
       setCategories(Array.isArray(categoriesData) ? categoriesData : []);
-      setSuppliersCount(Array.isArray(suppliersData) ? suppliersData. length : 0);
     } catch (error) {
       console. error("Error fetching dashboard data:", error);
     } finally {
@@ -135,29 +139,21 @@ export default function Dashboard() {
     fetchData();
   };
 
-  // Computed statistics
+  // Headline numbers come from the server-side aggregate endpoint and the
+  // low-stock preview from the indexed watch list
   const stats = useMemo(() => {
-    const lowStockProducts = products.filter(
-      (p) => p.quantity <= (p.reorder_level || 10)
-    );
-    const totalRevenue = sales.reduce((sum, s) => sum + (s.total_amount || 0), 0);
-    const totalInventoryValue = products. reduce(
-      (sum, p) => sum + p.price * p. quantity,
-      0
-    );
-
     return {
-      totalProducts: products.length,
-      lowStockCount: lowStockProducts.length,
-      totalCategories: categories.length,
-      totalSuppliers: suppliersCount,
-      totalSales: sales.length,
-      totalRevenue,
-      totalInventoryValue,
-      recentTransactions: transactions.length,
+      totalProducts: summary?.total_products ?? 0,
+      lowStockCount: summary?.low_stock_count ?? 0,
+      totalCategories: summary?.total_categories ?? 0,
+      totalSuppliers: summary?.total_suppliers ?? 0,
+      totalSales: summary?.total_sales ?? 0,
+      totalRevenue: summary?.total_revenue ?? 0,
+      totalInventoryValue: summary?.total_inventory_value ?? 0,
+      recentTransactions: summary?.total_transactions ?? 0,
       lowStockProducts,
     };
-  }, [products, sales, transactions, categories, suppliersCount]);
+  }, [lowStockProducts, summary]);
 
   // Recent sales (last 5)
   const recentSales = useMemo(() => {